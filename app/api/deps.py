@@ -2,19 +2,19 @@ from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.db.session import get_db
+from app.core.security import FEED_TOKEN_SCOPE
+from app.db.session import get_async_db
 from app.db import models
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
 
-def get_current_user_optional(
-    db: Session = Depends(get_db),
+def get_current_user_id_optional(
     token: Optional[str] = Depends(oauth2_scheme)
-) -> Optional[models.User]:
-    """선택적 사용자 인증 - 로그인하지 않아도 접근 가능"""
+) -> Optional[int]:
+    """토큰의 사용자 ID (DB 조회 없음)"""
     if not token:
         return None
     
@@ -22,13 +22,22 @@ def get_current_user_optional(
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        user_id: int = payload.get("sub")
-        if user_id is None:
+        # 캘린더 피드 토큰은 API 인증에 사용 불가
+        if payload.get("scope") == FEED_TOKEN_SCOPE:
             return None
-    except JWTError:
+        return int(payload.get("sub"))
+    except (JWTError, TypeError, ValueError):
+        return None
+
+async def get_current_user_optional(
+    db: AsyncSession = Depends(get_async_db),
+    user_id: Optional[int] = Depends(get_current_user_id_optional)
+) -> Optional[models.User]:
+    """선택적 사용자 인증 - 로그인하지 않아도 접근 가능"""
+    if user_id is None:
         return None
     
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+    user = await db.get(models.User, user_id)
     return user
 
 def get_current_user(
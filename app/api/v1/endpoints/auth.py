@@ -1,10 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 from jose import jwt
 
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.db import models
 from app.core.config import settings
 from app.core.security import verify_password, get_password_hash, create_access_token
@@ -15,11 +16,11 @@ router = APIRouter()
 @router.post("/signup", response_model=UserResponse)
 async def signup(
     user_in: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """회원가입"""
     # 이메일 중복 체크
-    user = db.query(models.User).filter(models.User.email == user_in.email).first()
+    user = await db.scalar(select(models.User).where(models.User.email == user_in.email))
     if user:
         raise HTTPException(
             status_code=400,
@@ -27,7 +28,7 @@ async def signup(
         )
     
     # 사용자명 중복 체크
-    user = db.query(models.User).filter(models.User.username == user_in.username).first()
+    user = await db.scalar(select(models.User).where(models.User.username == user_in.username))
     if user:
         raise HTTPException(
             status_code=400,
@@ -42,22 +43,22 @@ async def signup(
         hashed_password=get_password_hash(user_in.password)
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     return db_user
 
 @router.post("/login", response_model=Token)
 async def login(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     form_data: OAuth2PasswordRequestForm = Depends()
 ):
     """로그인"""
     # 사용자 조회 (이메일 또는 사용자명)
-    user = db.query(models.User).filter(
+    user = await db.scalar(select(models.User).where(
         (models.User.email == form_data.username) | 
         (models.User.username == form_data.username)
-    ).first()
+    ))
     
     if not user or not verify_password(form_data.password, user.hashed_password):
         raise HTTPException(
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, false, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from typing import List, Optional
 from datetime import datetime, timedelta
+import base64
 import json
 
-from app.db.session import get_db
+from app.db.session import get_async_db, AsyncSessionLocal
 from app.db import models
 from app.schemas.calendar import (
     CalendarEventResponse,
@@ -13,142 +17,389 @@ from app.schemas.calendar import (
     CalendarFilters,
     EventTypeFilter,
     CalendarEventCreate,
-    CalendarEventUpdate
+    CalendarEventUpdate,
+    CalendarMonthSummary,
+    SyncJobResponse
 )
-from app.services.kis_api_refactored import kis_api_client_refactored as kis_api_client
+from app.services.calendar_summary import calendar_summary
+from app.services.calendar_versions import range_keys
+from app.services.calendar_feed import calendar_feed
+from app.services.calendar_sync import SyncJob, calendar_sync_manager
+from app.services.data_versions import data_version_tracker
+from app.services.upcoming_index import upcoming_index
+from app.services.calendar_index import calendar_index
+from app.core.security import create_feed_token, decode_feed_token
+from app.core.versioning import versions, is_not_modified, cache_headers, not_modified_response
 from app.services.dart_api import dart_api_client
-from app.api.deps import get_current_user_optional, get_current_user
+from app.api.deps import (
+    get_current_user_optional, get_current_user, get_current_active_user, get_current_user_id_optional
+)
 
 router = APIRouter()
 
-@router.get("/events", response_model=List[CalendarEventResponse])
-async def get_calendar_events(
-    start_date: datetime = Query(..., description="시작 날짜"),
-    end_date: datetime = Query(..., description="종료 날짜"),
-    event_types: Optional[List[EventTypeFilter]] = Query(None, description="이벤트 타입 필터"),
-    stock_codes: Optional[List[str]] = Query(None, description="종목 코드 필터"),
-    bookmarked_only: bool = Query(False, description="북마크된 이벤트만"),
-    db: Session = Depends(get_db),
-    current_user: Optional[models.User] = Depends(get_current_user_optional)
+# CalendarEventResponse에 필요한 컬럼 (ORM 객체 대신 Row로 조회)
+EVENT_RESPONSE_COLUMNS = (
+    models.CalendarEvent.id,
+    models.CalendarEvent.event_date,
+    models.CalendarEvent.event_type,
+    models.CalendarEvent.title,
+    models.CalendarEvent.description,
+    models.CalendarEvent.stock_code,
+    models.CalendarEvent.stock_name,
+    models.CalendarEvent.importance,
+    models.CalendarEvent.source,
+    models.CalendarEvent.meta_data,
+    models.CalendarEvent.user_id,
+    models.CalendarEvent.created_at,
+    models.CalendarEvent.updated_at,
+)
+
+def encode_cursor(event_date: datetime, event_id: int) -> str:
+    """(event_date, id) 키셋 커서 인코딩"""
+    payload = json.dumps([event_date.isoformat(), event_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str):
+    """키셋 커서 디코딩"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        event_date, event_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(event_date), int(event_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+
+def build_event_query(
+    start_date: datetime,
+    end_date: datetime,
+    user_id: Optional[int] = None,
+    event_types: Optional[List[EventTypeFilter]] = None,
+    stock_codes: Optional[List[str]] = None,
+    bookmarked_only: bool = False,
+    quarter: Optional[str] = None,
+    min_dividend_amount: Optional[float] = None,
+    rcept_no: Optional[str] = None
 ):
-    """캘린더 이벤트 조회"""
+    """캘린더 이벤트 조회 쿼리 (응답 필드만 조회 + 사용자 북마크 LEFT JOIN)"""
+    query = select(*EVENT_RESPONSE_COLUMNS)
+    
+    if user_id is not None:
+        query = query.add_columns(
+            models.Bookmark.id.isnot(None).label("is_bookmarked")
+        ).outerjoin(
+            models.Bookmark,
+            and_(
+                models.Bookmark.event_id == models.CalendarEvent.id,
+                models.Bookmark.user_id == user_id
+            )
+        )
+    else:
+        query = query.add_columns(false().label("is_bookmarked"))
     
-    # 기본 쿼리
-    query = db.query(models.CalendarEvent).filter(
+    query = query.where(
         models.CalendarEvent.event_date >= start_date,
         models.CalendarEvent.event_date <= end_date
     )
     
     # 이벤트 타입 필터
     if event_types:
-        query = query.filter(models.CalendarEvent.event_type.in_(event_types))
+        query = query.where(models.CalendarEvent.event_type.in_(event_types))
     
     # 종목 코드 필터
     if stock_codes:
-        query = query.filter(models.CalendarEvent.stock_code.in_(stock_codes))
+        query = query.where(models.CalendarEvent.stock_code.in_(stock_codes))
+    
+    # 메타데이터 필터 (추출 컬럼 인덱스 사용)
+    if quarter:
+        query = query.where(models.CalendarEvent.meta_quarter == quarter)
+    if min_dividend_amount is not None:
+        query = query.where(models.CalendarEvent.meta_dividend_amount >= min_dividend_amount)
+    if rcept_no:
+        query = query.where(models.CalendarEvent.meta_rcept_no == rcept_no)
     
     # 북마크 필터 (로그인한 경우)
-    if bookmarked_only and current_user:
-        bookmarked_event_ids = db.query(models.Bookmark.event_id).filter(
-            models.Bookmark.user_id == current_user.id
-        ).subquery()
-        query = query.filter(models.CalendarEvent.id.in_(bookmarked_event_ids))
+    if bookmarked_only and user_id is not None:
+        query = query.where(models.Bookmark.id.isnot(None))
     
     # 개인 이벤트 포함 (로그인한 경우)
-    if current_user:
-        query = query.filter(
+    if user_id is not None:
+        query = query.where(
             (models.CalendarEvent.user_id == None) | 
-            (models.CalendarEvent.user_id == current_user.id)
+            (models.CalendarEvent.user_id == user_id)
         )
     else:
-        query = query.filter(models.CalendarEvent.user_id == None)
+        query = query.where(models.CalendarEvent.user_id == None)
+    
+    # 키셋 페이지네이션을 위해 (event_date, id) 순으로 정렬
+    return query.order_by(models.CalendarEvent.event_date, models.CalendarEvent.id)
+
+def after_cursor(query, cursor_date: datetime, cursor_id: int):
+    """(event_date, id) 순서에서 커서 다음 이벤트부터 조회 (같은 날짜는 id로 구분)"""
+    return query.where(or_(
+        models.CalendarEvent.event_date > cursor_date,
+        and_(
+            models.CalendarEvent.event_date == cursor_date,
+            models.CalendarEvent.id > cursor_id
+        )
+    ))
+
+async def stream_events_ndjson(query, limit: Optional[int] = None):
+    """서버 사이드 커서로 이벤트를 한 줄씩 NDJSON으로 전송
+
+    limit이 있으면 1건 더 조회하여, 다음 페이지가 있을 때 마지막 줄에
+    {"next_cursor": ...} 레코드를 추가한다 (헤더는 본문 전송 전에 확정되므로).
+    """
+    if limit:
+        query = query.limit(limit + 1)
+    # 응답 전송 중에도 유지되어야 하므로 요청 의존성과 별도의 세션 사용
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(query.execution_options(yield_per=500))
+        sent = 0
+        last = None
+        async for row in result:
+            if limit and sent == limit:
+                yield json.dumps({"next_cursor": encode_cursor(last.event_date, last.id)}) + "\n"
+                break
+            event = CalendarEventResponse.model_validate(row, from_attributes=True)
+            yield event.model_dump_json() + "\n"
+            sent += 1
+            last = row
+
+@router.get("/events", response_model=List[CalendarEventResponse])
+async def get_calendar_events(
+    request: Request,
+    response: Response,
+    start_date: datetime = Query(..., description="시작 날짜"),
+    end_date: datetime = Query(..., description="종료 날짜"),
+    event_types: Optional[List[EventTypeFilter]] = Query(None, description="이벤트 타입 필터"),
+    stock_codes: Optional[List[str]] = Query(None, description="종목 코드 필터"),
+    bookmarked_only: bool = Query(False, description="북마크된 이벤트만"),
+    quarter: Optional[str] = Query(None, description="분기 필터 (예: 1Q25)"),
+    min_dividend_amount: Optional[float] = Query(None, description="최소 배당금"),
+    rcept_no: Optional[str] = Query(None, description="공시 접수번호"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="페이지 크기 (다음 페이지 커서는 X-Next-Cursor 헤더, 스트리밍 시 마지막 next_cursor 줄)"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값"),
+    stream: bool = Query(False, description="NDJSON 스트리밍 응답"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: Optional[int] = Depends(get_current_user_id_optional)
+):
+    """캘린더 이벤트 조회"""
+    
+    # 다른 프로세스의 변경을 반영한 뒤 조회 범위의 파티션 버전이 같으면 304
+    await data_version_tracker.sync(db)
+    keys = range_keys(start_date, end_date, current_user_id)
+    etag = versions.etag(keys, current_user_id, request.url.query)
+    last_modified = versions.last_modified(keys)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    response.headers.update(cache_headers(etag, last_modified))
+    
+    cursor_key = decode_cursor(cursor) if cursor else None
+    
+    # 메모리 인덱스 사용 시 메타데이터 필터가 없는 조회는 인덱스에서 처리
+    use_index = (
+        calendar_index.enabled and not stream
+        and quarter is None and min_dividend_amount is None and rcept_no is None
+    )
+    if use_index:
+        if not calendar_index.loaded:
+            await calendar_index.load(db)
+        
+        bookmarked = set()
+        if current_user_id is not None:
+            result = await db.scalars(
+                select(models.Bookmark.event_id).where(models.Bookmark.user_id == current_user_id)
+            )
+            bookmarked = set(result.all())
+        
+        rows = [
+            {**record, "is_bookmarked": record["id"] in bookmarked}
+            for record in calendar_index.query(
+                start_date, end_date, current_user_id, event_types, stock_codes
+            )
+            if not (bookmarked_only and current_user_id is not None)
+            or record["id"] in bookmarked
+        ]
+        if cursor_key:
+            rows = [row for row in rows if (row["event_date"], row["id"]) > cursor_key]
+        if limit and len(rows) > limit:
+            rows = rows[:limit]
+            response.headers["X-Next-Cursor"] = encode_cursor(rows[-1]["event_date"], rows[-1]["id"])
+        return rows
+    
+    query = build_event_query(
+        start_date,
+        end_date,
+        user_id=current_user_id,
+        event_types=event_types,
+        stock_codes=stock_codes,
+        bookmarked_only=bookmarked_only,
+        quarter=quarter,
+        min_dividend_amount=min_dividend_amount,
+        rcept_no=rcept_no
+    )
     
-    events = query.order_by(models.CalendarEvent.event_date).all()
+    # 키셋 커서 이후부터 조회
+    if cursor_key:
+        query = after_cursor(query, *cursor_key)
     
-    # 북마크 상태 추가
-    if current_user:
-        bookmarked_ids = set(
-            db.query(models.Bookmark.event_id)
-            .filter(models.Bookmark.user_id == current_user.id)
-            .scalar_all()
+    if stream:
+        return StreamingResponse(
+            stream_events_ndjson(query, limit),
+            media_type="application/x-ndjson",
+            headers=cache_headers(etag, last_modified)
         )
-        for event in events:
-            event.is_bookmarked = event.id in bookmarked_ids
     
-    return events
+    if limit:
+        # 다음 페이지 존재 여부 확인을 위해 1건 더 조회
+        rows = (await db.execute(query.limit(limit + 1))).all()
+        if len(rows) > limit:
+            rows = rows[:limit]
+            response.headers["X-Next-Cursor"] = encode_cursor(rows[-1].event_date, rows[-1].id)
+        return rows
+    
+    result = await db.execute(query)
+    return result.all()
 
-@router.post("/events/sync")
+@router.get("/summary", response_model=CalendarMonthSummary)
+async def get_calendar_summary(
+    year: int = Query(..., ge=1900, le=2100, description="조회 연도"),
+    month: int = Query(..., ge=1, le=12, description="조회 월"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Optional[models.User] = Depends(get_current_user_optional)
+):
+    """월간 달력용 일별 이벤트 수 (타입/중요도별)"""
+    
+    # 최초 조회 또는 일괄/외부 변경 이후에만 DB 집계
+    await data_version_tracker.sync(db)
+    if not calendar_summary.loaded:
+        await calendar_summary.load(db)
+    
+    return calendar_summary.get_month(
+        year, month, current_user.id if current_user else None
+    )
+
+@router.get("/upcoming", response_model=UpcomingEventResponse)
+async def get_upcoming_events(
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: Optional[int] = Depends(get_current_user_id_optional)
+):
+    """다가오는 이벤트 (오늘/내일/이번 주/다음 주)"""
+    
+    # 날짜가 바뀌었거나 일괄/외부 변경 이후에만 DB에서 재구성
+    await data_version_tracker.sync(db)
+    if not upcoming_index.loaded:
+        await upcoming_index.load(db)
+    
+    watchlist = None
+    if current_user_id is not None:
+        watchlist = await upcoming_index.get_watchlist(db, current_user_id)
+    
+    return upcoming_index.get_upcoming(current_user_id, watchlist)
+
+def feed_token_response(request: Request, user: models.User) -> dict:
+    token = create_feed_token(user.id, user.feed_token_version)
+    return {
+        "token": token,
+        "feed_url": str(request.url_for("get_calendar_feed", token=token))
+    }
+
+@router.get("/feed-token")
+async def get_calendar_feed_token(
+    request: Request,
+    current_user: models.User = Depends(get_current_active_user)
+):
+    """외부 캘린더 앱(Google, Outlook 등) 구독용 피드 URL 발급"""
+    return feed_token_response(request, current_user)
+
+@router.post("/feed-token/rotate")
+async def rotate_calendar_feed_token(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_active_user)
+):
+    """피드 URL 재발급 (이전에 발급한 피드 URL은 모두 폐기)"""
+    current_user.feed_token_version = (current_user.feed_token_version or 0) + 1
+    await db.commit()
+    calendar_feed.evict(current_user.id)
+    return feed_token_response(request, current_user)
+
+@router.get("/feed/{token}.ics")
+async def get_calendar_feed(
+    token: str,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """iCalendar 구독 피드 (시장 일정 + 개인/북마크/관심종목 일정)"""
+    decoded = decode_feed_token(token)
+    if decoded is None:
+        raise HTTPException(status_code=404, detail="피드를 찾을 수 없습니다.")
+    
+    # 탈퇴/비활성 사용자 또는 재발급으로 폐기된 토큰은 거부
+    user_id, token_version = decoded
+    user = await db.get(models.User, user_id)
+    if not user or not user.is_active or user.feed_token_version != token_version:
+        raise HTTPException(status_code=404, detail="피드를 찾을 수 없습니다.")
+    
+    await data_version_tracker.sync(db)
+    etag = calendar_feed.feed_etag(user_id)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    
+    # 버전이 바뀐 경우에만 DB 조회 후 재조립
+    body = calendar_feed.get_cached(user_id, etag)
+    if body is None:
+        body = await calendar_feed.build(db, user_id, etag)
+    
+    return Response(
+        content=body,
+        media_type="text/calendar",
+        headers=cache_headers(etag)
+    )
+
+def sync_job_response(job: SyncJob, merged: bool = False) -> SyncJobResponse:
+    return SyncJobResponse(
+        job_id=job.id,
+        year=job.year,
+        month=job.month,
+        status=job.status.value,
+        progress=job.progress,
+        total=job.total,
+        processed=job.processed,
+        created=job.created,
+        merged=merged,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at
+    )
+
+@router.post("/events/sync", response_model=SyncJobResponse, status_code=202)
 async def sync_calendar_events(
-    year: int = Query(..., description="동기화할 연도"),
-    month: int = Query(..., description="동기화할 월"),
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    year: int = Query(..., ge=1900, le=2100, description="동기화할 연도"),
+    month: int = Query(..., ge=1, le=12, description="동기화할 월")
 ):
-    """외부 API에서 캘린더 이벤트 동기화"""
+    """외부 API에서 캘린더 이벤트 동기화 (백그라운드 작업으로 실행)"""
     
-    try:
-        # 휴장일 동기화
-        holidays = await kis_api_client.get_holidays(str(year))
-        
-        for holiday_date in holidays:
-            # 해당 월의 휴장일만 처리
-            date_obj = datetime.strptime(holiday_date, "%Y-%m-%d")
-            if date_obj.month == month:
-                # 중복 체크
-                existing = db.query(models.CalendarEvent).filter(
-                    models.CalendarEvent.event_date == date_obj,
-                    models.CalendarEvent.event_type == models.EventType.HOLIDAY
-                ).first()
-                
-                if not existing:
-                    event = models.CalendarEvent(
-                        event_date=date_obj,
-                        event_type=models.EventType.HOLIDAY,
-                        title="증시 휴장일",
-                        description="한국 증시 휴장일입니다.",
-                        importance="high",
-                        source="KRX"
-                    )
-                    db.add(event)
-        
-        # 실적 발표 일정 동기화
-        earnings = await kis_api_client.get_earnings_calendar(f"{year}-{month:02d}")
-        
-        for earning in earnings:
-            date_obj = datetime.strptime(earning['date'], "%Y-%m-%d")
-            
-            # 중복 체크
-            existing = db.query(models.CalendarEvent).filter(
-                models.CalendarEvent.event_date == date_obj,
-                models.CalendarEvent.stock_code == earning.get('stock_code'),
-                models.CalendarEvent.event_type == models.EventType.EARNINGS
-            ).first()
-            
-            if not existing:
-                event = models.CalendarEvent(
-                    event_date=date_obj,
-                    event_type=models.EventType.EARNINGS,
-                    title=f"{earning['company_name']} {earning['event_type']}",
-                    description=earning.get('description', ''),
-                    stock_code=earning.get('stock_code'),
-                    stock_name=earning['company_name'],
-                    importance="high",
-                    source="KIS",
-                    meta_data=json.dumps(earning)
-                )
-                db.add(event)
-        
-        db.commit()
-        
-        return {"message": f"{year}년 {month}월 이벤트 동기화 완료"}
-        
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=500, detail=f"동기화 중 오류 발생: {str(e)}")
+    job, merged = await calendar_sync_manager.submit(year, month)
+    response.headers["Location"] = str(request.url_for("get_sync_job", job_id=job.id))
+    return sync_job_response(job, merged)
+
+@router.get("/sync-jobs/{job_id}", response_model=SyncJobResponse)
+async def get_sync_job(job_id: str):
+    """캘린더 동기화 작업 진행 상황 조회"""
+    
+    job = await calendar_sync_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="동기화 작업을 찾을 수 없습니다.")
+    
+    return sync_job_response(job)
 
 @router.post("/events", response_model=CalendarEventResponse)
 async def create_personal_event(
     event: CalendarEventCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user)
 ):
     """개인 캘린더 이벤트 생성"""
@@ -159,8 +410,8 @@ async def create_personal_event(
         event_type=models.EventType.PERSONAL
     )
     db.add(db_event)
-    db.commit()
-    db.refresh(db_event)
+    await db.commit()
+    await db.refresh(db_event)
     
     return db_event
 
@@ -168,15 +419,15 @@ async def create_personal_event(
 async def update_personal_event(
     event_id: int,
     event_update: CalendarEventUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user)
 ):
     """개인 캘린더 이벤트 수정"""
     
-    db_event = db.query(models.CalendarEvent).filter(
+    db_event = await db.scalar(select(models.CalendarEvent).where(
         models.CalendarEvent.id == event_id,
         models.CalendarEvent.user_id == current_user.id
-    ).first()
+    ))
     
     if not db_event:
         raise HTTPException(status_code=404, detail="이벤트를 찾을 수 없습니다.")
@@ -184,28 +435,33 @@ async def update_personal_event(
     for field, value in event_update.dict(exclude_unset=True).items():
         setattr(db_event, field, value)
     
-    db.commit()
-    db.refresh(db_event)
+    await db.commit()
+    await db.refresh(db_event)
     
     return db_event
 
 @router.delete("/events/{event_id}")
 async def delete_personal_event(
     event_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user)
 ):
     """개인 캘린더 이벤트 삭제"""
     
-    db_event = db.query(models.CalendarEvent).filter(
-        models.CalendarEvent.id == event_id,
-        models.CalendarEvent.user_id == current_user.id
-    ).first()
+    # 북마크 cascade 삭제를 위해 함께 로드 (비동기 세션은 지연 로딩 불가)
+    db_event = await db.scalar(
+        select(models.CalendarEvent)
+        .where(
+            models.CalendarEvent.id == event_id,
+            models.CalendarEvent.user_id == current_user.id
+        )
+        .options(selectinload(models.CalendarEvent.bookmarks))
+    )
     
     if not db_event:
         raise HTTPException(status_code=404, detail="이벤트를 찾을 수 없습니다.")
     
-    db.delete(db_event)
-    db.commit()
+    await db.delete(db_event)
+    await db.commit()
     
     return {"message": "이벤트가 삭제되었습니다."} 
\ No newline at end of file
@@ -1,18 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Form
+from fastapi import APIRouter, Depends, HTTPException, Query, Form, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from datetime import datetime
+from typing import List, Optional, Tuple
+from collections import Counter
+from datetime import date, datetime, timezone
 import asyncio
+import json
+import time
 
-from app.db.session import get_db
+from app.core.config import settings
+from app.core.versioning import versions, is_not_modified, cache_headers, not_modified_response
+from app.db.session import get_db, get_async_db
 from app.db import models
 from app.services.kis_api_refactored import kis_api_client_refactored as kis_api_client
 from app.services.perplexity_api import perplexity_client
 from app.services.dart_api import dart_api_client
+from app.services.price_store import date_to_int, format_trade_date
+from app.services.price_writer import price_writer
+from app.services.history_cache import history_cache
+from app.services import resampler
+from app.services.resampler import RESAMPLE_PERIODS
+from app.services.indicators import INDICATORS, indicator_engine, to_json_values
+from app.services.trading_calendar import trading_calendar
+from app.services.static_calendar import static_calendar
+from app.services.stock_search import stock_search_index
+from app.services.base_api import DataMapper, fan_out
+from app.services.sector_analytics import sector_analytics
+from app.services.market_snapshot import (
+    Quote, market_snapshot, get_sector_stocks, get_top_stocks as get_top_stocks_list
+)
 from app.api.deps import get_current_user_optional
 from app.schemas.stocks import (
     StockPriceResponse,
+    StockPricesRequest,
+    StockPricesResponse,
     StockHistoryResponse,
+    TechnicalIndicatorResponse,
     MarketIndexResponse,
     InvestorTrendResponse,
     ProgramTradeResponse,
@@ -27,7 +50,6 @@ router = APIRouter()
 @router.get("/price/{stock_code}", response_model=StockPriceResponse)
 async def get_stock_price(
     stock_code: str,
-    db: Session = Depends(get_db),
     current_user: Optional[models.User] = Depends(get_current_user_optional)
 ):
     """주식 현재가 조회"""
@@ -38,24 +60,14 @@ async def get_stock_price(
         if not price_data:
             raise HTTPException(status_code=404, detail="종목 정보를 찾을 수 없습니다.")
         
-        # 주식 정보 업데이트 또는 생성
-        stock = db.query(models.Stock).filter(
-            models.Stock.stock_code == stock_code
-        ).first()
-        
-        if stock:
-            stock.current_price = float(price_data.get('stck_prpr', 0))
-            stock.price_updated_at = datetime.now()
-        else:
-            stock = models.Stock(
-                stock_code=stock_code,
-                stock_name=price_data.get('prdt_name', ''),
-                current_price=float(price_data.get('stck_prpr', 0)),
-                price_updated_at=datetime.now()
-            )
-            db.add(stock)
-        
-        db.commit()
+        # 주식 정보 업데이트 또는 생성 (지연 저장 버퍼에 기록)
+        price_writer.record(
+            stock_code,
+            price_data.get('prdt_name', ''),
+            float(price_data.get('stck_prpr', 0))
+        )
+        # 새 종목은 저장을 기다리지 않고 검색 인덱스에 바로 반영
+        stock_search_index.add(stock_code, price_data.get('prdt_name', ''))
         
         return StockPriceResponse(
             stock_code=stock_code,
@@ -75,6 +87,87 @@ async def get_stock_price(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"주식 정보 조회 중 오류: {str(e)}")
 
+async def fetch_batch_quotes(stock_codes: List[str]) -> StockPricesResponse:
+    """다중 종목 시세 (스냅샷에 최신 시세가 있으면 재사용, 나머지만 KIS 다중 조회)"""
+    codes = list(dict.fromkeys(code.strip() for code in stock_codes if code.strip()))
+    if not codes:
+        raise HTTPException(status_code=400, detail="종목코드를 입력해주세요.")
+    if len(codes) > settings.BATCH_QUOTE_MAX_CODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"한 번에 최대 {settings.BATCH_QUOTE_MAX_CODES}개 종목까지 조회할 수 있습니다."
+        )
+    
+    now = time.time()
+    quotes = {}
+    for code in codes:
+        quote = market_snapshot.get(code)
+        if quote and quote.age(now) <= settings.MARKET_SNAPSHOT_MAX_AGE:
+            quotes[code] = quote
+    
+    # 스냅샷에 없는 종목은 묶음 단위로 동시에 조회
+    names = {}
+    misses = [code for code in codes if code not in quotes]
+    if misses:
+        chunk_size = settings.BATCH_QUOTE_CHUNK_SIZE
+        fetched = await fan_out(
+            [misses[i:i + chunk_size] for i in range(0, len(misses), chunk_size)],
+            kis_api_client.get_multiple_stock_prices,
+            max_concurrent=settings.FAN_OUT_MAX_CONCURRENT,
+            timeout=settings.FAN_OUT_ITEM_TIMEOUT
+        )
+        fetched_at = time.time()
+        updated = {}
+        for result in fetched:
+            for code, price_data in (result.value or {}).items():
+                if not price_data:
+                    continue
+                updated[code] = Quote.from_kis(price_data, fetched_at)
+                names[code] = price_data.get('prdt_name', '')
+                price_writer.record(code, names[code], DataMapper.safe_float(price_data.get('stck_prpr')))
+                stock_search_index.add(code, names[code])
+        market_snapshot.update(updated)
+        quotes.update(updated)
+    
+    now = time.time()
+    found = [code for code in codes if code in quotes]
+    rows = [quotes[code] for code in found]
+    return StockPricesResponse(
+        stock_code=found,
+        stock_name=[
+            names.get(code) or getattr(stock_search_index.get(code), "stock_name", "")
+            for code in found
+        ],
+        current_price=[DataMapper.safe_float(quote.current_price) for quote in rows],
+        change_price=[DataMapper.safe_float(quote.change_value) for quote in rows],
+        change_rate=[DataMapper.safe_float(quote.change_rate) for quote in rows],
+        volume=[DataMapper.safe_int(quote.volume) for quote in rows],
+        age=[round(quote.age(now), 1) for quote in rows],
+        missing=[code for code in codes if code not in quotes]
+    )
+
+@router.get("/prices", response_model=StockPricesResponse)
+async def get_stock_prices(
+    codes: str = Query(..., description="종목코드 목록 (쉼표 구분)")
+):
+    """다중 종목 현재가 조회 (컬럼형 응답)"""
+    try:
+        return await fetch_batch_quotes(codes.split(","))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"다중 종목 시세 조회 중 오류: {str(e)}")
+
+@router.post("/prices", response_model=StockPricesResponse)
+async def post_stock_prices(request: StockPricesRequest):
+    """다중 종목 현재가 조회 (종목코드가 많아 URL이 길어질 때)"""
+    try:
+        return await fetch_batch_quotes(request.stock_codes)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"다중 종목 시세 조회 중 오류: {str(e)}")
+
 @router.get("/history/{stock_code}", response_model=List[StockHistoryResponse])
 async def get_stock_history(
     stock_code: str,
@@ -83,8 +176,49 @@ async def get_stock_history(
     period_type: str = Query("D", description="기간 타입: D(일), W(주), M(월), Y(년)"),
     db: Session = Depends(get_db)
 ):
-    """주식 기간별 시세 조회"""
+    """주식 기간별 시세 조회
+
+    일봉은 로컬 캐시에서 응답하며 적재되지 않은 거래일 구간만 KIS에서 조회한다.
+    주봉/월봉/연봉은 캐시된 일봉을 변환하여 만든다 (numpy가 없으면 KIS 조회).
+    """
     try:
+        if period_type in RESAMPLE_PERIODS and resampler.is_enabled():
+            # 첫 기간이 잘리지 않도록 기간 시작일부터 일봉 조회
+            bars = await history_cache.get_daily_bars(
+                db, stock_code,
+                resampler.period_start(start_date.date(), period_type),
+                end_date.date()
+            )
+            return [
+                StockHistoryResponse(
+                    date=format_trade_date(bar["trade_date"]),
+                    open_price=bar["open_price"],
+                    high_price=bar["high_price"],
+                    low_price=bar["low_price"],
+                    close_price=bar["close_price"],
+                    volume=bar["volume"],
+                    change_rate=bar["change_rate"]
+                )
+                for bar in reversed(resampler.resample_daily_bars(bars, period_type))
+            ]
+        
+        if period_type == "D":
+            bars = await history_cache.get_daily_bars(
+                db, stock_code, start_date.date(), end_date.date()
+            )
+            return [
+                StockHistoryResponse(
+                    date=format_trade_date(bar.trade_date),
+                    open_price=bar.open_price,
+                    high_price=bar.high_price,
+                    low_price=bar.low_price,
+                    close_price=bar.close_price,
+                    volume=bar.volume,
+                    change_rate=bar.change_rate_bp / 100
+                )
+                for bar in reversed(bars)
+            ]
+        
         history_data = await kis_api_client.get_stock_history(
             stock_code,
             start_date.strftime("%Y-%m-%d"),
@@ -112,6 +246,76 @@ async def get_stock_history(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"기간별 시세 조회 중 오류: {str(e)}")
 
+@router.get("/indicators/{stock_code}", response_model=TechnicalIndicatorResponse)
+async def get_technical_indicators(
+    stock_code: str,
+    indicators: str = Query(
+        "sma,ema,rsi,macd,bollinger,volatility",
+        description="지표 목록 (쉼표 구분): sma, ema, rsi, macd, bollinger, volatility"
+    ),
+    sma_window: int = Query(20, ge=2, le=250, description="단순 이동평균 기간"),
+    ema_window: int = Query(20, ge=2, le=250, description="지수 이동평균 기간"),
+    rsi_period: int = Query(14, ge=2, le=100, description="RSI 기간"),
+    macd_fast: int = Query(12, ge=2, le=100),
+    macd_slow: int = Query(26, ge=3, le=200),
+    macd_signal: int = Query(9, ge=2, le=100),
+    bollinger_window: int = Query(20, ge=2, le=250),
+    bollinger_k: float = Query(2.0, gt=0, le=5),
+    volatility_window: int = Query(20, ge=2, le=250, description="변동성 계산 기간 (거래일)"),
+    limit: int = Query(120, ge=1, le=1000, description="반환할 최근 일봉 수"),
+    db: Session = Depends(get_db)
+):
+    """기술적 지표 조회 (로컬 일봉 캐시 기준, 새 일봉만 증분 계산)"""
+    if not indicator_engine.enabled:
+        raise HTTPException(status_code=503, detail="기술적 지표 계산에 필요한 numpy가 설치되어 있지 않습니다.")
+    
+    params = {
+        "sma": {"window": sma_window},
+        "ema": {"window": ema_window},
+        "rsi": {"period": rsi_period},
+        "macd": {"fast": macd_fast, "slow": macd_slow, "signal": macd_signal},
+        "bollinger": {"window": bollinger_window, "k": bollinger_k},
+        "volatility": {"window": volatility_window},
+    }
+    names = [name.strip().lower() for name in indicators.split(",") if name.strip()]
+    unknown = [name for name in names if name not in INDICATORS]
+    if unknown or not names:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 지표입니다: {', '.join(unknown)}")
+    if macd_fast >= macd_slow:
+        raise HTTPException(status_code=400, detail="MACD 단기 기간은 장기 기간보다 짧아야 합니다.")
+    
+    try:
+        # 시작일을 연초로 고정하여 날마다 캐시가 무효화되지 않도록 함
+        today = date.today()
+        bars = await history_cache.get_daily_bars(
+            db, stock_code, date(today.year - settings.INDICATOR_HISTORY_YEARS, 1, 1), today
+        )
+        if not bars:
+            raise HTTPException(status_code=404, detail="시세 데이터가 없습니다.")
+        
+        # 캐시가 없을 때의 전체 계산은 이벤트 루프를 막지 않도록 워커 스레드에서 실행
+        last_closed = date_to_int(trading_calendar.last_closed_day())
+        dates, series = await asyncio.to_thread(
+            indicator_engine.compute_bars,
+            stock_code,
+            [INDICATORS[name](**params[name]) for name in dict.fromkeys(names)],
+            bars,
+            last_closed
+        )
+        
+        return TechnicalIndicatorResponse(
+            stock_code=stock_code,
+            last_bar_date=format_trade_date(dates[-1]),
+            provisional=dates[-1] > last_closed,
+            dates=[format_trade_date(value) for value in dates[-limit:]],
+            series={name: to_json_values(values[-limit:]) for name, values in series.items()}
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"기술적 지표 조회 중 오류: {str(e)}")
+
 @router.get("/market-index", response_model=List[MarketIndexResponse])
 async def get_market_indices():
     """주요 시장 지수 조회"""
@@ -223,38 +427,29 @@ async def get_program_trade():
 
 @router.get("/search", response_model=List[StockSearchResponse])
 async def search_stocks(
-    keyword: str = Query(..., description="검색 키워드"),
-    db: Session = Depends(get_db)
+    keyword: str = Query(..., description="검색 키워드 (종목코드, 종목명, 초성)"),
+    limit: int = Query(20, ge=1, le=100, description="최대 결과 수"),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """종목 검색"""
+    """종목 검색 (메모리 인덱스: 코드/종목명 접두어, 부분 문자열, 초성)"""
     try:
-        # KIS API에서 검색 (현재는 mock 데이터)
-        search_results = await kis_api_client.search_stock(keyword)
-        
-        # DB에서도 검색
-        db_results = db.query(models.Stock).filter(
-            models.Stock.stock_name.contains(keyword)
-        ).limit(10).all()
-        
-        # 결과 병합
-        result_dict = {}
-        
-        for item in search_results:
-            result_dict[item['stock_code']] = StockSearchResponse(
-                stock_code=item['stock_code'],
-                stock_name=item['stock_name'],
-                market=item.get('market', 'KOSPI')
+        await stock_search_index.ensure_loaded(db)
+        entries = stock_search_index.search(keyword, limit)
+        
+        if not entries:
+            # 인덱스에 없는 종목만 KIS API에서 검색 후 인덱스에 추가
+            for item in await kis_api_client.search_stock(keyword):
+                stock_search_index.add(item['stock_code'], item['stock_name'], item.get('market'))
+            entries = stock_search_index.search(keyword, limit)
+        
+        return [
+            StockSearchResponse(
+                stock_code=entry.stock_code,
+                stock_name=entry.stock_name,
+                market=entry.market or 'KOSPI'
             )
-        
-        for stock in db_results:
-            if stock.stock_code not in result_dict:
-                result_dict[stock.stock_code] = StockSearchResponse(
-                    stock_code=stock.stock_code,
-                    stock_name=stock.stock_name,
-                    market=stock.market_type or 'KOSPI'
-                )
-        
-        return list(result_dict.values())
+            for entry in entries
+        ]
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"종목 검색 중 오류: {str(e)}")
@@ -402,62 +597,30 @@ async def get_options_info():
         raise HTTPException(status_code=500, detail=f"선물옵션 조회 중 오류: {str(e)}")
 
 @router.get("/top-stocks")
-async def get_top_stocks():
-    """인기 종목 현재가 (상위 20개) - 실제 데이터"""
-    
-    # korea_stocks_data에서 주요 종목 가져오기
-    try:
-        from korea_stocks_data import KOSPI_STOCKS, KOSDAQ_STOCKS
-        
-        # 상위 20개 종목 선택 (KOSPI 15개 + KOSDAQ 5개)
-        top_kospi = KOSPI_STOCKS[:15]
-        top_kosdaq = KOSDAQ_STOCKS[:5]
-        top_stocks = top_kospi + top_kosdaq
-        
-    except ImportError:
-        # 기본 종목 리스트 (fallback)
-        top_stocks = [
-            {"code": "005930", "name": "삼성전자", "sector": "전자", "market": "KOSPI"},
-            {"code": "000660", "name": "SK하이닉스", "sector": "반도체", "market": "KOSPI"},
-            {"code": "035720", "name": "카카오", "sector": "인터넷", "market": "KOSPI"},
-            {"code": "051910", "name": "LG화학", "sector": "화학", "market": "KOSPI"},
-            {"code": "006400", "name": "삼성SDI", "sector": "배터리", "market": "KOSPI"},
-            {"code": "207940", "name": "삼성바이오로직스", "sector": "바이오", "market": "KOSPI"},
-            {"code": "068270", "name": "셀트리온", "sector": "바이오", "market": "KOSPI"},
-            {"code": "066570", "name": "LG전자", "sector": "전자", "market": "KOSPI"},
-            {"code": "005380", "name": "현대차", "sector": "자동차", "market": "KOSPI"},
-            {"code": "035420", "name": "NAVER", "sector": "인터넷", "market": "KOSPI"},
-            {"code": "373220", "name": "LG에너지솔루션", "sector": "배터리", "market": "KOSPI"},
-            {"code": "012330", "name": "현대모비스", "sector": "자동차부품", "market": "KOSPI"},
-            {"code": "000270", "name": "기아", "sector": "자동차", "market": "KOSPI"},
-            {"code": "105560", "name": "KB금융", "sector": "금융", "market": "KOSPI"},
-            {"code": "055550", "name": "신한지주", "sector": "금융", "market": "KOSPI"},
-            {"code": "196170", "name": "알테오젠", "sector": "바이오", "market": "KOSDAQ"},
-            {"code": "067630", "name": "HLB생명과학", "sector": "바이오", "market": "KOSDAQ"},
-            {"code": "112040", "name": "위메이드", "sector": "게임", "market": "KOSDAQ"},
-            {"code": "263750", "name": "펄어비스", "sector": "게임", "market": "KOSDAQ"},
-            {"code": "122870", "name": "와이지엔터테인먼트", "sector": "엔터", "market": "KOSDAQ"}
-        ]
-    
+async def get_top_stocks(response: Response):
+    """인기 종목 현재가 (상위 20개) - 시장 스냅샷에서 조회"""
     try:
-        results = []
+        # 최초 갱신 전이면 기다리지 않고 있는 시세만 응답 (X-Snapshot-Partial)
+        market_snapshot.ensure_fresh()
         
+        now = time.time()
+        top_stocks = get_top_stocks_list()
+        results = []
         for stock in top_stocks:
-            try:
-                price_data = await kis_api_client.get_stock_price(stock["code"])
-                if price_data:
-                    results.append({
-                        "stock_code": stock["code"],
-                        "stock_name": stock["name"],
-                        "current_price": price_data.get('stck_prpr', '0'),
-                        "change_value": price_data.get('prdy_vrss', '0'),
-                        "change_rate": price_data.get('prdy_ctrt', '0'),
-                        "volume": price_data.get('acml_vol', '0')
-                    })
-            except:
-                # 개별 종목 오류는 스킵
-                continue
-        
+            quote = market_snapshot.get(stock["code"])
+            if quote:
+                results.append({
+                    "stock_code": stock["code"],
+                    "stock_name": stock["name"],
+                    "current_price": quote.current_price,
+                    "change_value": quote.change_value,
+                    "change_rate": quote.change_rate,
+                    "volume": quote.volume,
+                    "snapshot_age": round(quote.age(now), 1)
+                })
+        
+        response.headers["X-Snapshot-Age"] = str(market_snapshot.age)
+        response.headers["X-Snapshot-Partial"] = str(len(results) < len(top_stocks)).lower()
         return results
         
     except Exception as e:
@@ -493,56 +656,66 @@ async def get_global_markets():
                 {"symbol": "BAC", "name": "뱅크오브아메리카", "sector": "금융", "exchange": "NYSE"}
             ]
         
-        us_results = []
-        for stock in us_stocks:
-            try:
-                data = await kis_api_client.get_overseas_stock_price(stock["symbol"], "NAS")
-                if data:
-                    us_results.append({
-                        "symbol": stock["symbol"],
-                        "name": stock["name"],
-                        "price": data.get('last', '0'),
-                        "change_rate": data.get('rate', '0')
-                    })
-            except:
-                continue
-        
-        results["us_stocks"] = us_results
-        
-        # 주요 가상화폐
-        crypto_symbols = ["BTC", "ETH", "XRP", "ADA", "DOT"]
-        crypto_results = []
-        
-        for symbol in crypto_symbols:
-            try:
-                data = await kis_api_client.get_cryptocurrency_price(symbol)
-                if data:
-                    crypto_results.append({
-                        "symbol": symbol,
-                        "price": data.get('trade_price', 0),
-                        "change_rate": data.get('change_rate', 0) * 100
-                    })
-            except:
-                continue
-        
-        results["cryptocurrencies"] = crypto_results
-        
-        # 주요 환율
-        currencies = ["USD", "EUR", "JPY", "CNY"]
-        exchange_results = []
-        
-        for currency in currencies:
-            try:
-                data = await kis_api_client.get_exchange_rate(currency)
-                if data:
-                    exchange_results.append({
-                        "currency": currency,
-                        "rate": data.get('rate', 0)
-                    })
-            except:
-                continue
+        # 해외 주식/가상화폐/환율을 동시 실행 수 제한 하에 병렬 조회 (실패 항목은 제외)
+        semaphore = asyncio.Semaphore(settings.FAN_OUT_MAX_CONCURRENT)
+        timeout = settings.FAN_OUT_ITEM_TIMEOUT
+        crypto_symbols = ["BTC", "ETH", "XRP", "ADA", "DOT"]  # 주요 가상화폐
+        currencies = ["USD", "EUR", "JPY", "CNY"]  # 주요 환율
+        
+        us_fetched, crypto_fetched, exchange_fetched = await asyncio.gather(
+            fan_out(
+                us_stocks,
+                lambda stock: kis_api_client.get_overseas_stock_price(stock["symbol"], "NAS"),
+                timeout=timeout, semaphore=semaphore
+            ),
+            fan_out(
+                crypto_symbols, kis_api_client.get_cryptocurrency_price,
+                timeout=timeout, semaphore=semaphore
+            ),
+            fan_out(
+                currencies, kis_api_client.get_exchange_rate,
+                timeout=timeout, semaphore=semaphore
+            )
+        )
+        
+        results["us_stocks"] = [
+            {
+                "symbol": r.item["symbol"],
+                "name": r.item["name"],
+                "price": r.value.get('last', '0'),
+                "change_rate": r.value.get('rate', '0')
+            }
+            for r in us_fetched if r.value
+        ]
+        
+        results["cryptocurrencies"] = [
+            {
+                "symbol": r.item,
+                "price": r.value.get('trade_price', 0),
+                "change_rate": r.value.get('change_rate', 0) * 100
+            }
+            for r in crypto_fetched if r.value
+        ]
         
-        results["exchange_rates"] = exchange_results
+        results["exchange_rates"] = [
+            {
+                "currency": r.item,
+                "rate": r.value.get('rate', 0)
+            }
+            for r in exchange_fetched if r.value
+        ]
+        
+        # 일부 항목이 실패/시간 초과된 그룹
+        partial_sources = [
+            name for name, fetched in (
+                ("us_stocks", us_fetched),
+                ("cryptocurrencies", crypto_fetched),
+                ("exchange_rates", exchange_fetched)
+            )
+            if not all(r.ok for r in fetched)
+        ]
+        results["partial"] = bool(partial_sources)
+        results["partial_sources"] = partial_sources
         
         return results
         
@@ -726,21 +899,29 @@ async def get_market_indices():
             "KOSPI200": "1028"    # 코스피200 지수
         }
         
-        for index_name, index_code in index_codes.items():
-            try:
-                index_data = await kis_api_client.get_market_index(index_code)
-                if index_data:
-                    indices[index_name] = {
-                        "name": index_name,
-                        "code": index_code,
-                        "current_value": index_data.get('bstp_nmix_prpr', 0),
-                        "change_value": index_data.get('bstp_nmix_prdy_vrss', 0),
-                        "change_rate": index_data.get('prdy_vrss_sign', 0),
-                        "volume": index_data.get('acml_vol', 0),
-                        "market_cap": index_data.get('bstp_nmix_total_askp', 0)
-                    }
-            except Exception as e:
-                print(f"{index_name} 지수 조회 실패: {e}")
+        # 지수별 병렬 조회 (실패/시간 초과 지수는 기본값)
+        fetched = await fan_out(
+            index_codes.items(),
+            lambda item: kis_api_client.get_market_index(item[1]),
+            max_concurrent=settings.FAN_OUT_MAX_CONCURRENT,
+            timeout=settings.FAN_OUT_ITEM_TIMEOUT
+        )
+        
+        for result in fetched:
+            index_name, index_code = result.item
+            if result.value:
+                index_data = result.value
+                indices[index_name] = {
+                    "name": index_name,
+                    "code": index_code,
+                    "current_value": index_data.get('bstp_nmix_prpr', 0),
+                    "change_value": index_data.get('bstp_nmix_prdy_vrss', 0),
+                    "change_rate": index_data.get('prdy_vrss_sign', 0),
+                    "volume": index_data.get('acml_vol', 0),
+                    "market_cap": index_data.get('bstp_nmix_total_askp', 0)
+                }
+            elif not result.ok:
+                print(f"{index_name} 지수 조회 실패: {result.error}")
                 # 기본 값 설정 (API 실패 시)
                 indices[index_name] = {
                     "name": index_name,
@@ -764,30 +945,36 @@ async def get_market_indices():
 
 @router.get("/sectors")
 async def get_sector_performance():
-    """섹터별 성과 조회"""
+    """섹터별 성과 조회 - 시장 스냅샷에서 조회
+
+    numpy가 있으면 전체 종목의 섹터별 가중/단순 수익률, 상승/하락 종목 수, 상위 변동 종목을 계산한다.
+    """
     try:
-        from korea_stocks_data import get_stocks_by_sector
+        market_snapshot.ensure_fresh()
         
-        sectors = ["전자", "반도체", "자동차", "화학", "바이오", "금융", "게임", "인터넷"]
-        sector_performance = {}
+        if sector_analytics.enabled:
+            return {
+                "success": True,
+                **sector_analytics.compute(market_snapshot),
+                "partial": not market_snapshot.loaded,
+                "snapshot_age": market_snapshot.age,
+                "timestamp": datetime.now().isoformat()
+            }
         
-        for sector in sectors:
-            sector_stocks = get_stocks_by_sector(sector)[:5]  # 각 섹터 상위 5개
+        sector_performance = {}
+        for sector, sector_stocks in get_sector_stocks().items():
             sector_data = []
             
             for stock in sector_stocks:
-                try:
-                    price_data = await kis_api_client.get_stock_price(stock["code"])
-                    if price_data:
-                        sector_data.append({
-                            "code": stock["code"],
-                            "name": stock["name"],
-                            "market": stock["market"],
-                            "current_price": price_data.get('stck_prpr', '0'),
-                            "change_rate": price_data.get('prdy_ctrt', '0')
-                        })
-                except:
-                    continue
+                quote = market_snapshot.get(stock["code"])
+                if quote:
+                    sector_data.append({
+                        "code": stock["code"],
+                        "name": stock["name"],
+                        "market": stock["market"],
+                        "current_price": quote.current_price,
+                        "change_rate": quote.change_rate
+                    })
             
             if sector_data:
                 # 섹터 평균 수익률 계산
@@ -801,150 +988,202 @@ async def get_sector_performance():
         return {
             "success": True,
             "sectors": sector_performance,
+            "partial": not market_snapshot.loaded,
+            "snapshot_age": market_snapshot.age,
             "timestamp": datetime.now().isoformat()
         }
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"섹터 성과 조회 중 오류: {str(e)}")
 
+# 정적 종목 목록 응답 (최초 요청 시 한 번만 직렬화)
+_static_stock_list = {}
+
 @router.get("/korean-stocks/all")
-async def get_all_korean_stocks():
+async def get_all_korean_stocks(request: Request):
     """전체 한국 주식 목록 조회"""
     try:
-        from korea_stocks_data import get_all_korean_stocks
-        all_stocks = get_all_korean_stocks()
+        if not _static_stock_list:
+            from korea_stocks_data import get_all_korean_stocks
+            all_stocks = get_all_korean_stocks()
+            
+            body = json.dumps({
+                "success": True,
+                "total_count": len(all_stocks),
+                "kospi_count": len([s for s in all_stocks if s["market"] == "KOSPI"]),
+                "kosdaq_count": len([s for s in all_stocks if s["market"] == "KOSDAQ"]),
+                "stocks": all_stocks,
+                "timestamp": datetime.now().isoformat()
+            }, ensure_ascii=False).encode("utf-8")
+            _static_stock_list.update(
+                body=body,
+                etag=versions.etag(["korean-stocks"], len(body)),
+                last_modified=versions.last_modified(["korean-stocks"])
+            )
         
-        return {
-            "success": True,
-            "total_count": len(all_stocks),
-            "kospi_count": len([s for s in all_stocks if s["market"] == "KOSPI"]),
-            "kosdaq_count": len([s for s in all_stocks if s["market"] == "KOSDAQ"]),
-            "stocks": all_stocks,
-            "timestamp": datetime.now().isoformat()
-        }
+        etag = _static_stock_list["etag"]
+        last_modified = _static_stock_list["last_modified"]
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
+        
+        return Response(
+            content=_static_stock_list["body"],
+            media_type="application/json",
+            headers=cache_headers(etag, last_modified)
+        )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"전체 주식 목록 조회 중 오류: {str(e)}")
 
+async def fetch_disclosure_events() -> List[dict]:
+    """실시간 DART 공시정보 -> 캘린더 이벤트"""
+    events = []
+    recent_disclosures = await dart_api_client.get_recent_disclosures(
+        corp_cls="Y",  # 유가증권
+        days=30,
+        important_only=True
+    )
+    
+    for disclosure in recent_disclosures[:10]:  # 최근 10개만
+        try:
+            # 접수일을 날짜로 변환
+            rcept_dt = disclosure.get('rcept_dt', '')
+            if len(rcept_dt) == 8:  # YYYYMMDD 형식
+                event_date = f"{rcept_dt[:4]}-{rcept_dt[4:6]}-{rcept_dt[6:8]}"
+                
+                events.append({
+                    "id": f"disclosure_{disclosure.get('rcept_no')}",
+                    "title": f"📄 {disclosure.get('corp_name')} 공시",
+                    "start": event_date,
+                    "backgroundColor": "#3b82f6",
+                    "borderColor": "#3b82f6",
+                    "extendedProps": {
+                        "eventType": "disclosure",
+                        "stockCode": disclosure.get('stock_code'),
+                        "stockName": disclosure.get('corp_name'),
+                        "description": f"{disclosure.get('corp_name')} {disclosure.get('report_nm')}",
+                        "importance": "medium",
+                        "details": f"보고서: {disclosure.get('report_nm')}\\n제출인: {disclosure.get('flr_nm')}\\n접수번호: {disclosure.get('rcept_no')}",
+                        "rcept_no": disclosure.get('rcept_no'),
+                        "report_nm": disclosure.get('report_nm')
+                    }
+                })
+        except Exception as e:
+            print(f"공시 이벤트 변환 실패: {e}")
+            continue
+    
+    return events
+
+def build_price_alert_event(stock: dict, quote: Quote) -> Optional[dict]:
+    """주가 변동이 큰 종목(5% 이상)의 급등락 이벤트"""
+    current_price = quote.current_price
+    change_rate = float(quote.change_rate)
+    if abs(change_rate) < 5.0:
+        return None
+    
+    today = datetime.now().strftime("%Y-%m-%d")
+    return {
+        "id": f"price_alert_{stock['code']}",
+        "title": f"🚨 {stock['name']} 급등락 ({change_rate:+.1f}%)",
+        "start": today,
+        "backgroundColor": "#dc2626" if change_rate < 0 else "#16a34a",
+        "borderColor": "#dc2626" if change_rate < 0 else "#16a34a",
+        "extendedProps": {
+            "eventType": "price_alert",
+            "stockCode": stock["code"],
+            "stockName": stock["name"],
+            "description": f"{stock['name']} 주가가 {change_rate:+.1f}% 변동했습니다.",
+            "importance": "high",
+            "details": f"현재가: {current_price}원\\n변동률: {change_rate:+.1f}%\\n시장: {stock['market']}",
+            "currentPrice": current_price,
+            "changeRate": change_rate
+        }
+    }
+
+async def fetch_price_alert_events(deadline: float) -> Tuple[List[dict], bool]:
+    """주요 종목 급등락 이벤트 (시장 스냅샷 기준) -> (이벤트, 일부 누락 여부)
+
+    스냅샷이 비어 있으면 기한 내에서만 최초 갱신을 기다린다.
+    """
+    from korea_stocks_data import KOSPI_STOCKS
+    major_stocks = KOSPI_STOCKS[:5]  # 상위 5개 종목
+    
+    await market_snapshot.wait_loaded(deadline)
+    
+    events = []
+    missing = False
+    for stock in major_stocks:
+        quote = market_snapshot.get(stock["code"])
+        if quote is None:
+            missing = True
+            continue
+        event = build_price_alert_event(stock, quote)
+        if event:
+            events.append(event)
+    
+    return events, missing
+
 @router.get("/calendar/all-events")
 async def get_all_calendar_events(
+    request: Request,
+    response: Response,
     start_date: str = Query(..., description="시작 날짜 (YYYY-MM-DD)"),
     end_date: str = Query(..., description="종료 날짜 (YYYY-MM-DD)")
 ):
-    """포괄적인 캘린더 이벤트 조회 (기본 이벤트 + 실시간 공시 + 실시간 데이터)"""
+    """포괄적인 캘린더 이벤트 조회 (기본 이벤트 + 실시간 공시 + 실시간 데이터)
+
+    실시간 소스는 동시에 조회하고 소스별 기한이 지나면 준비된 결과만 반환한다.
+    기한 초과/오류로 빠진 소스는 partial_sources에 표시된다.
+    """
+    # 기본 이벤트 파일 버전 + 실시간 데이터 갱신 주기 단위로 ETag 생성
+    window = int(time.time() // settings.LIVE_ETAG_WINDOW_SECONDS)
+    etag = versions.etag(
+        [], *static_calendar.version, start_date, end_date, window
+    )
+    last_modified = datetime.fromtimestamp(
+        window * settings.LIVE_ETAG_WINDOW_SECONDS, tz=timezone.utc
+    )
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    
     try:
-        all_events = []
+        partial_sources = []
+        
+        # 1. 실시간 소스 동시 조회 시작 (소스별 기한)
+        disclosure_task = asyncio.create_task(asyncio.wait_for(
+            fetch_disclosure_events(), timeout=settings.ALL_EVENTS_DART_DEADLINE
+        ))
+        price_task = asyncio.create_task(
+            fetch_price_alert_events(settings.ALL_EVENTS_PRICE_DEADLINE)
+        )
         
-        # 1. 기본 캘린더 이벤트 로드
-        try:
-            import os
-            import json
-            
-            # 프로젝트 루트 디렉토리에서 파일 찾기
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(current_dir))))
-            calendar_file_path = os.path.join(project_root, 'calendar_events.json')
-            
-            # 파일이 없으면 현재 작업 디렉토리에서 찾기
-            if not os.path.exists(calendar_file_path):
-                calendar_file_path = 'calendar_events.json'
-            
-            # 절대 경로로 재시도
-            if not os.path.exists(calendar_file_path):
-                calendar_file_path = '/Users/yeong-gwang/Desktop/work/서울경제신문/경제용/미팅/주식캘린더/calendar_events.json'
-            
-            if os.path.exists(calendar_file_path):
-                with open(calendar_file_path, 'r', encoding='utf-8') as f:
-                    basic_events = json.load(f)
-                    all_events.extend(basic_events)
-                    print(f"✅ 기본 캘린더 이벤트 {len(basic_events)}개 로드 완료")
-            else:
-                print("⚠️ 캘린더 이벤트 파일을 찾을 수 없습니다.")
-                
-        except Exception as e:
-            print(f"⚠️ 캘린더 이벤트 로드 중 오류: {e}")
+        # 2. 기본 캘린더 이벤트 (메모리 색인에서 기간 조회)
+        basic_events = static_calendar.get_events(start_date, end_date)
         
-        # 2. 실시간 DART 공시정보 추가
-        try:
-            recent_disclosures = await dart_api_client.get_recent_disclosures(
-                corp_cls="Y",  # 유가증권
-                days=30,
-                important_only=True
-            )
-            
-            for disclosure in recent_disclosures[:10]:  # 최근 10개만
-                try:
-                    # 접수일을 날짜로 변환
-                    rcept_dt = disclosure.get('rcept_dt', '')
-                    if len(rcept_dt) == 8:  # YYYYMMDD 형식
-                        event_date = f"{rcept_dt[:4]}-{rcept_dt[4:6]}-{rcept_dt[6:8]}"
-                        
-                        all_events.append({
-                            "id": f"disclosure_{disclosure.get('rcept_no')}",
-                            "title": f"📄 {disclosure.get('corp_name')} 공시",
-                            "start": event_date,
-                            "backgroundColor": "#3b82f6",
-                            "borderColor": "#3b82f6",
-                            "extendedProps": {
-                                "eventType": "disclosure",
-                                "stockCode": disclosure.get('stock_code'),
-                                "stockName": disclosure.get('corp_name'),
-                                "description": f"{disclosure.get('corp_name')} {disclosure.get('report_nm')}",
-                                "importance": "medium",
-                                "details": f"보고서: {disclosure.get('report_nm')}\\n제출인: {disclosure.get('flr_nm')}\\n접수번호: {disclosure.get('rcept_no')}",
-                                "rcept_no": disclosure.get('rcept_no'),
-                                "report_nm": disclosure.get('report_nm')
-                            }
-                        })
-                except Exception as e:
-                    print(f"공시 이벤트 변환 실패: {e}")
-                    continue
-                    
-        except Exception as e:
-            print(f"DART 공시정보 조회 실패: {e}")
+        # 3. 실시간 결과 수집
+        live_events = []
+        disclosure_result, price_result = await asyncio.gather(
+            disclosure_task, price_task, return_exceptions=True
+        )
         
-        # 3. 주요 종목 실시간 데이터로 이벤트 업데이트
-        try:
-            from korea_stocks_data import KOSPI_STOCKS
-            major_stocks = KOSPI_STOCKS[:5]  # 상위 5개 종목
-            
-            for stock in major_stocks:
-                try:
-                    price_data = await kis_api_client.get_stock_price(stock["code"])
-                    if price_data:
-                        current_price = price_data.get('stck_prpr', '0')
-                        change_rate = float(price_data.get('prdy_ctrt', '0'))
-                        
-                        # 주가 변동이 큰 경우 이벤트 추가 (5% 이상)
-                        if abs(change_rate) >= 5.0:
-                            today = datetime.now().strftime("%Y-%m-%d")
-                            all_events.append({
-                                "id": f"price_alert_{stock['code']}",
-                                "title": f"🚨 {stock['name']} 급등락 ({change_rate:+.1f}%)",
-                                "start": today,
-                                "backgroundColor": "#dc2626" if change_rate < 0 else "#16a34a",
-                                "borderColor": "#dc2626" if change_rate < 0 else "#16a34a",
-                                "extendedProps": {
-                                    "eventType": "price_alert",
-                                    "stockCode": stock["code"],
-                                    "stockName": stock["name"],
-                                    "description": f"{stock['name']} 주가가 {change_rate:+.1f}% 변동했습니다.",
-                                    "importance": "high",
-                                    "details": f"현재가: {current_price}원\\n변동률: {change_rate:+.1f}%\\n시장: {stock['market']}",
-                                    "currentPrice": current_price,
-                                    "changeRate": change_rate
-                                }
-                            })
-                except Exception as e:
-                    print(f"주가 데이터 조회 실패 ({stock['code']}): {e}")
-                    continue
-                    
-        except Exception as e:
-            print(f"실시간 주가 데이터 조회 실패: {e}")
+        if isinstance(disclosure_result, BaseException):
+            print(f"DART 공시정보 조회 실패: {disclosure_result!r}")
+            partial_sources.append("dart")
+        else:
+            live_events.extend(disclosure_result)
         
-        # 4. 날짜 필터링
-        filtered_events = []
-        for event in all_events:
+        if isinstance(price_result, BaseException):
+            print(f"실시간 주가 데이터 조회 실패: {price_result!r}")
+            partial_sources.append("price_alert")
+        else:
+            price_events, price_partial = price_result
+            live_events.extend(price_events)
+            if price_partial:
+                partial_sources.append("price_alert")
+        
+        # 4. 날짜 필터링 (기본 이벤트는 이미 기간 조회됨)
+        filtered_events = list(basic_events)
+        for event in live_events:
             event_date = event.get('start', '')
             if start_date <= event_date <= end_date:
                 filtered_events.append(event)
@@ -952,21 +1191,31 @@ async def get_all_calendar_events(
         # 5. 날짜순 정렬
         filtered_events.sort(key=lambda x: x.get('start', ''))
         
+        # 6. 이벤트 타입별 개수 (한 번 순회)
+        type_counts = Counter(
+            e.get('extendedProps', {}).get('eventType') for e in filtered_events
+        )
+        
+        # 일부 소스가 빠진 응답은 재사용되지 않도록 ETag를 붙이지 않음
+        if not partial_sources:
+            response.headers.update(cache_headers(etag, last_modified))
+        
         return {
             "success": True,
             "total_events": len(filtered_events),
             "events": filtered_events,
             "event_types": {
-                "earnings": len([e for e in filtered_events if e.get('extendedProps', {}).get('eventType') == 'earnings']),
-                "dividend": len([e for e in filtered_events if e.get('extendedProps', {}).get('eventType') == 'dividend']),
-                "economic": len([e for e in filtered_events if e.get('extendedProps', {}).get('eventType') == 'economic']),
-                "disclosure": len([e for e in filtered_events if e.get('extendedProps', {}).get('eventType') == 'disclosure']),
-                "crypto": len([e for e in filtered_events if e.get('extendedProps', {}).get('eventType') == 'crypto']),
-                "holiday": len([e for e in filtered_events if e.get('extendedProps', {}).get('eventType') == 'holiday']),
-                "price_alert": len([e for e in filtered_events if e.get('extendedProps', {}).get('eventType') == 'price_alert'])
+                event_type: type_counts.get(event_type, 0)
+                for event_type in (
+                    "earnings", "dividend", "economic", "disclosure",
+                    "crypto", "holiday", "price_alert"
+                )
             },
+            "partial": bool(partial_sources),
+            "partial_sources": partial_sources,
+            "snapshot_age": market_snapshot.age,
             "timestamp": datetime.now().isoformat()
         }
         
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"캘린더 이벤트 조회 중 오류: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"캘린더 이벤트 조회 중 오류: {str(e)}")
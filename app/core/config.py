@@ -17,6 +17,14 @@ class Settings(BaseSettings):
     
     # 데이터베이스 설정
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./invest_calendar.db")
+    DB_PROFILE: str = os.getenv("DB_PROFILE", "default")  # default: 기본값, production: WAL/pragma 튜닝
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 65536
+    SQLITE_MMAP_SIZE: int = 268435456  # 256MB
     
     # Redis 설정
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379")
@@ -48,6 +56,57 @@ class Settings(BaseSettings):
     # 데이터 파이프라인 설정
     ENABLE_DATA_PIPELINE: bool = False
     
+    # 현재가 지연 저장 설정 (/stocks/price 조회 시 stocks 테이블 일괄 갱신)
+    PRICE_WRITE_BEHIND_INTERVAL_MS: int = 500
+    PRICE_WRITE_BEHIND_MAX_BATCH: int = 200
+    
+    # 시장 스냅샷 설정 (인기 종목/섹터/급등락 이벤트용 시세 캐시)
+    MARKET_SNAPSHOT_INTERVAL: float = 60.0  # 파이프라인 갱신 주기 (초)
+    MARKET_SNAPSHOT_MAX_AGE: float = 300.0  # 이보다 오래되면 조회 시 백그라운드 갱신
+    MARKET_SNAPSHOT_MAX_CONCURRENT: int = 5
+    
+    # 시계열 저장소 설정
+    PRICE_TICK_RETENTION_DAYS: int = 30
+    # KIS 기간별 시세 1회 응답 최대 건수 (빈 구간을 이 단위로 나눠 조회)
+    HISTORY_FETCH_MAX_BARS: int = 100
+    # 기술적 지표 계산에 사용하는 일봉 기간 (N년 전 1월 1일부터)
+    INDICATOR_HISTORY_YEARS: int = 2
+    
+    # 기본 캘린더 이벤트 파일 (비어 있으면 프로젝트 루트의 calendar_events.json)
+    CALENDAR_EVENTS_FILE: str = os.getenv("CALENDAR_EVENTS_FILE", "")
+    # 시작 시 기본 캘린더 이벤트를 calendar_events 테이블로 적재할지 여부
+    IMPORT_CALENDAR_EVENTS_ON_STARTUP: bool = os.getenv("IMPORT_CALENDAR_EVENTS_ON_STARTUP", "false").lower() == "true"
+    
+    # 조건부 GET 설정 (실시간 데이터가 섞인 응답의 ETag 유지 시간)
+    LIVE_ETAG_WINDOW_SECONDS: int = 60
+    
+    # /stocks/calendar/all-events 실시간 소스별 응답 기한 (초)
+    ALL_EVENTS_DART_DEADLINE: float = 3.0
+    ALL_EVENTS_PRICE_DEADLINE: float = 2.0
+    
+    # 외부 API 병렬 조회 설정 (/stocks/global-markets, /stocks/market-indices)
+    FAN_OUT_MAX_CONCURRENT: int = 8
+    FAN_OUT_ITEM_TIMEOUT: float = 3.0  # 항목별 응답 기한 (초)
+    
+    # /stocks/prices 다중 종목 시세 (요청당 최대 종목 수, 스냅샷에 없는 종목의 KIS 다중 조회 단위)
+    BATCH_QUOTE_MAX_CODES: int = 300
+    BATCH_QUOTE_CHUNK_SIZE: int = 20
+    
+    # 캘린더 구독 피드 설정 (오늘 기준 포함 기간)
+    CALENDAR_FEED_PAST_DAYS: int = 30
+    CALENDAR_FEED_FUTURE_DAYS: int = 365
+    CALENDAR_FEED_TOKEN_EXPIRE_DAYS: int = 365  # 0이면 만료 없음 (재발급으로만 폐기)
+    CALENDAR_FEED_CACHE_MAX_FEEDS: int = 1000  # 사용자별 피드 본문 캐시 최대 수
+    CALENDAR_FEED_CACHE_MAX_EVENTS: int = 50000  # 이벤트별 VEVENT 블록 캐시 최대 수
+    
+    # 캘린더 이벤트 메모리 인덱스 사용 여부 (numpy 필요)
+    CALENDAR_MEMORY_INDEX: bool = os.getenv("CALENDAR_MEMORY_INDEX", "false").lower() == "true"
+    
+    # 캘린더 동기화 작업 설정
+    CALENDAR_SYNC_MAX_CONCURRENT: int = 2
+    CALENDAR_SYNC_BATCH_SIZE: int = 200
+    CALENDAR_SYNC_STALE_SECONDS: int = 900  # 이 시간 동안 진행 기록이 없는 작업은 중단된 것으로 처리
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
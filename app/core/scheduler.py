@@ -1,11 +1,15 @@
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
 import asyncio
 
-from app.db.session import SessionLocal
+from app.core.config import settings
+from app.db.session import SessionLocal, AsyncSessionLocal
 from app.db import models
+from app.services.price_store import price_store
+from app.services.trading_calendar import trading_calendar
+from app.services.upcoming_index import upcoming_index
 from app.services.kis_api_refactored import kis_api_client_refactored as kis_api_client
 from app.services.dart_api import dart_api_client
 
@@ -128,6 +132,40 @@ async def update_stock_prices():
     finally:
         db.close()
 
+async def rollup_price_ticks():
+    """장 마감 후 당일 틱을 일봉으로 집계하고 오래된 틱 정리"""
+    logger.info("틱 일봉 집계 시작")
+    
+    db = SessionLocal()
+    try:
+        now = datetime.now()
+        trading_calendar.ensure_loaded(db)
+        rolled = 0
+        if trading_calendar.is_trading_day(now.date()):
+            rolled = price_store.rollup_ticks(db, now.date())
+        else:
+            # 휴장일에는 장외 시세로 일봉을 만들지 않음
+            logger.info(f"{now.date()} 휴장일, 틱 일봉 집계 생략")
+        pruned = price_store.prune_ticks(
+            db, now - timedelta(days=settings.PRICE_TICK_RETENTION_DAYS)
+        )
+        db.commit()
+        logger.info(f"틱 일봉 집계 완료: {rolled}개 종목, {pruned}개 틱 정리")
+        
+    except Exception as e:
+        logger.error(f"틱 일봉 집계 중 오류: {str(e)}")
+        db.rollback()
+    finally:
+        db.close()
+
+async def rebuild_upcoming_index():
+    """날짜 변경 시 다가오는 이벤트 인덱스 재구성"""
+    try:
+        async with AsyncSessionLocal() as db:
+            await upcoming_index.load(db)
+    except Exception as e:
+        logger.error(f"다가오는 이벤트 인덱스 재구성 중 오류: {str(e)}")
+
 def start_scheduler():
     """스케줄러 시작"""
     # 매일 오전 6시에 이벤트 동기화
@@ -153,6 +191,22 @@ def start_scheduler():
         replace_existing=True
     )
     
+    # 장 마감(15:30) 후 틱 -> 일봉 집계
+    scheduler.add_job(
+        rollup_price_ticks,
+        CronTrigger(hour=15, minute=40),
+        id="rollup_price_ticks",
+        replace_existing=True
+    )
+    
+    # 자정에 다가오는 이벤트 구간 재계산
+    scheduler.add_job(
+        rebuild_upcoming_index,
+        CronTrigger(hour=0, minute=0),
+        id="rebuild_upcoming_index",
+        replace_existing=True
+    )
+    
     scheduler.start()
     logger.info("스케줄러가 시작되었습니다")
 
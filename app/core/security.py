@@ -1,12 +1,14 @@
 from datetime import datetime, timedelta
-from typing import Optional
-from jose import jwt
+from typing import Optional, Tuple
+from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+FEED_TOKEN_SCOPE = "feed"
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """액세스 토큰 생성"""
     to_encode = data.copy()
@@ -18,6 +20,28 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+def create_feed_token(user_id: int, version: int = 0) -> str:
+    """캘린더 구독(iCalendar) 피드 토큰 생성
+
+    외부 캘린더 앱이 URL에 담아 계속 폴링하므로 만료 기간을 길게 두고,
+    사용자의 토큰 버전을 담아 재발급 시 이전 토큰을 폐기할 수 있게 한다.
+    API 인증에는 사용할 수 없도록 scope를 구분한다.
+    """
+    payload = {"sub": str(user_id), "scope": FEED_TOKEN_SCOPE, "ver": version}
+    if settings.CALENDAR_FEED_TOKEN_EXPIRE_DAYS > 0:
+        payload["exp"] = datetime.utcnow() + timedelta(days=settings.CALENDAR_FEED_TOKEN_EXPIRE_DAYS)
+    return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+def decode_feed_token(token: str) -> Optional[Tuple[int, int]]:
+    """피드 토큰 -> (사용자 ID, 토큰 버전) (유효하지 않거나 만료되면 None)"""
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        if payload.get("scope") != FEED_TOKEN_SCOPE:
+            return None
+        return int(payload.get("sub")), int(payload.get("ver", 0))
+    except (JWTError, TypeError, ValueError):
+        return None
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """비밀번호 검증"""
     return pwd_context.verify(plain_password, hashed_password)
@@ -0,0 +1,89 @@
+"""
+데이터셋 버전 관리 및 조건부 GET
+파티션/데이터셋별 단조 증가 카운터로 강한 ETag와 Last-Modified를 만들고
+If-None-Match/If-Modified-Since 요청에 304로 응답
+"""
+from typing import Dict, Iterable, Optional
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+import hashlib
+import uuid
+
+from fastapi import Request, Response
+
+class VersionRegistry:
+    """키별 버전 카운터와 마지막 변경 시각"""
+
+    def __init__(self):
+        # 재시작 시 카운터가 초기화되어도 이전 ETag와 겹치지 않도록 프로세스별 salt 사용
+        self.salt = uuid.uuid4().hex
+        self.started_at = datetime.now(timezone.utc).replace(microsecond=0)
+        self._versions: Dict[str, int] = {}
+        self._modified: Dict[str, datetime] = {}
+
+    def bump(self, key: str) -> int:
+        """키 버전 증가"""
+        version = self._versions.get(key, 0) + 1
+        self._versions[key] = version
+        self._modified[key] = datetime.now(timezone.utc).replace(microsecond=0)
+        return version
+
+    def get(self, key: str) -> int:
+        return self._versions.get(key, 0)
+
+    def last_modified(self, keys: Iterable[str]) -> datetime:
+        """키 중 가장 최근 변경 시각 (변경 이력이 없으면 프로세스 시작 시각)"""
+        return max(
+            (self._modified[key] for key in keys if key in self._modified),
+            default=self.started_at
+        )
+
+    def etag(self, keys: Iterable[str], *parts) -> str:
+        """키 버전과 요청 구분값으로 강한 ETag 생성"""
+        digest = hashlib.sha1(self.salt.encode())
+        for key in keys:
+            digest.update(f"|{key}={self.get(key)}".encode())
+        for part in parts:
+            digest.update(f"|{part}".encode())
+        return f'"{digest.hexdigest()[:32]}"'
+
+def is_not_modified(
+    request: Request,
+    etag: str,
+    last_modified: Optional[datetime] = None
+) -> bool:
+    """조건부 GET 헤더 검사 (If-None-Match 우선)"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        candidates = [
+            tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+        ]
+        return etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified <= since
+
+    return False
+
+def cache_headers(etag: str, last_modified: Optional[datetime] = None) -> Dict[str, str]:
+    """응답 검증 헤더"""
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    return headers
+
+def not_modified_response(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    """304 응답 (본문 없음)"""
+    return Response(status_code=304, headers=cache_headers(etag, last_modified))
+
+# 전역 버전 레지스트리 인스턴스
+versions = VersionRegistry()
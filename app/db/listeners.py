@@ -0,0 +1,99 @@
+"""
+모델 변경 알림
+커밋된 ORM 변경(추가/수정/삭제)을 구독자에게 전달하여 메모리 집계/캐시를 증분 갱신
+"""
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+import logging
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+Snapshot = Dict[str, Any]
+
+class ModelChange(NamedTuple):
+    """커밋된 변경 1건 (추가: old=None, 삭제: new=None)"""
+    model: type
+    old: Optional[Snapshot]
+    new: Optional[Snapshot]
+
+ChangeCallback = Callable[[ModelChange], None]
+ResetCallback = Callable[[], None]
+
+_PENDING_KEY = "_model_changes"
+
+_change_subscribers: Dict[type, List[ChangeCallback]] = {}
+_reset_subscribers: Dict[type, List[ResetCallback]] = {}
+
+def subscribe(
+    model: type,
+    on_change: ChangeCallback,
+    on_reset: Optional[ResetCallback] = None
+) -> None:
+    """모델 변경 구독 (on_reset은 ORM을 거치지 않은 일괄 변경 시 호출)"""
+    _change_subscribers.setdefault(model, []).append(on_change)
+    if on_reset:
+        _reset_subscribers.setdefault(model, []).append(on_reset)
+
+def notify_reset(model: type) -> None:
+    """일괄 INSERT/UPDATE 등 ORM 밖의 변경 후 구독자에게 전체 재구성 요청"""
+    for callback in _reset_subscribers.get(model, []):
+        try:
+            callback()
+        except Exception as e:
+            logger.error(f"변경 구독자 재구성 실패 ({model.__name__}): {e}")
+
+def _column_snapshot(obj) -> Snapshot:
+    """현재 컬럼 값"""
+    mapper = inspect(obj).mapper
+    return {attr.key: getattr(obj, attr.key) for attr in mapper.column_attrs}
+
+def _previous_snapshot(obj) -> Snapshot:
+    """flush 이전 컬럼 값 (속성 히스토리 기준)"""
+    state = inspect(obj)
+    snapshot = {}
+    for attr in state.mapper.column_attrs:
+        history = state.attrs[attr.key].history
+        if history.deleted:
+            snapshot[attr.key] = history.deleted[0]
+        elif history.unchanged:
+            snapshot[attr.key] = history.unchanged[0]
+        else:
+            snapshot[attr.key] = getattr(obj, attr.key)
+    return snapshot
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session: Session, flush_context) -> None:
+    """flush된 구독 대상 객체의 변경 전/후 값을 커밋 시점까지 보관"""
+    if not _change_subscribers:
+        return
+
+    pending: List[ModelChange] = session.info.setdefault(_PENDING_KEY, [])
+
+    for obj in session.new:
+        if type(obj) in _change_subscribers:
+            pending.append(ModelChange(type(obj), None, _column_snapshot(obj)))
+
+    for obj in session.dirty:
+        if type(obj) in _change_subscribers and session.is_modified(obj, include_collections=False):
+            pending.append(ModelChange(type(obj), _previous_snapshot(obj), _column_snapshot(obj)))
+
+    for obj in session.deleted:
+        if type(obj) in _change_subscribers:
+            pending.append(ModelChange(type(obj), _previous_snapshot(obj), None))
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_changes(session: Session) -> None:
+    """커밋 완료 후 구독자에게 변경 전달"""
+    for change in session.info.pop(_PENDING_KEY, []):
+        for callback in _change_subscribers.get(change.model, []):
+            try:
+                callback(change)
+            except Exception as e:
+                logger.error(f"변경 구독자 처리 실패 ({change.model.__name__}): {e}")
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    """롤백된 변경은 전달하지 않음"""
+    session.info.pop(_PENDING_KEY, None)
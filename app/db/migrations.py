@@ -0,0 +1,221 @@
+"""
+데이터베이스 마이그레이션
+create_all로 생성되지 않는 기존 테이블의 인덱스/컬럼 변경을 순서대로 적용
+"""
+from typing import Callable, Iterable, List, Tuple
+import json
+import logging
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.db import models
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS: List[Tuple[str, Callable[[Connection], None]]] = []
+
+def migration(migration_id: str):
+    """마이그레이션 등록 데코레이터 (등록 순서대로 적용)"""
+    def decorator(func: Callable[[Connection], None]) -> Callable[[Connection], None]:
+        MIGRATIONS.append((migration_id, func))
+        return func
+    return decorator
+
+def _create_indexes(conn: Connection, table, names: Iterable[str]) -> None:
+    """테이블에 선언된 인덱스 중 지정한 이름의 인덱스를 없을 때만 생성"""
+    names = set(names)
+    for index in table.indexes:
+        if index.name in names:
+            index.create(bind=conn, checkfirst=True)
+
+@migration("0001_calendar_access_path_indexes")
+def add_access_path_indexes(conn: Connection) -> None:
+    """캘린더/북마크/관심종목 조회용 복합 및 부분 인덱스 추가"""
+    # 유니크 인덱스 생성 전 중복 북마크 정리 (가장 먼저 생성된 것만 유지)
+    conn.execute(text(
+        "DELETE FROM bookmarks WHERE id NOT IN ("
+        "SELECT MIN(id) FROM bookmarks GROUP BY user_id, event_id)"
+    ))
+
+    _create_indexes(conn, models.CalendarEvent.__table__, (
+        "ix_calendar_events_public_type_date",
+        "ix_calendar_events_public_date",
+        "ix_calendar_events_user_date",
+        "ix_calendar_events_stock_date",
+    ))
+    _create_indexes(conn, models.Bookmark.__table__, (
+        "ux_bookmarks_user_event",
+        "ix_bookmarks_event_id",
+    ))
+    _create_indexes(conn, models.Watchlist.__table__, (
+        "ix_watchlist_user_stock",
+        "ix_watchlist_stock_code",
+    ))
+
+# 백필 시 한 번에 읽는 행 수
+BACKFILL_BATCH_SIZE = 1000
+
+@migration("0002_calendar_event_json_meta_data")
+def convert_meta_data_to_json(conn: Connection) -> None:
+    """meta_data를 JSON 컬럼으로 전환하고 필터용 컬럼 추가 및 백필"""
+    table = models.CalendarEvent.__table__
+    existing = {column["name"] for column in inspect(conn).get_columns(table.name)}
+
+    for name in ("meta_quarter", "meta_dividend_amount", "meta_rcept_no"):
+        if name not in existing:
+            column_type = table.c[name].type.compile(dialect=conn.dialect)
+            conn.execute(text(f"ALTER TABLE calendar_events ADD COLUMN {name} {column_type}"))
+
+    # 기존 텍스트 JSON을 id 순으로 나눠 읽어 필터용 컬럼 백필
+    # (형 변환 전에 JSON으로 읽을 수 없는 값을 먼저 제거해야 ALTER가 실패하지 않음)
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            text(
+                "SELECT id, meta_data FROM calendar_events "
+                "WHERE meta_data IS NOT NULL AND id > :last_id ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BACKFILL_BATCH_SIZE}
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        invalid, backfill = [], []
+        for event_id, raw in rows:
+            try:
+                data = json.loads(raw) if isinstance(raw, str) else raw
+            except json.JSONDecodeError:
+                data = None
+
+            if not isinstance(data, dict):
+                # JSON 컬럼으로 읽을 수 없는 값은 제거
+                invalid.append({"id": event_id})
+                continue
+
+            event = models.CalendarEvent()
+            event.meta_data = data
+            backfill.append({
+                "id": event_id,
+                "quarter": event.meta_quarter,
+                "dividend_amount": event.meta_dividend_amount,
+                "rcept_no": event.meta_rcept_no
+            })
+
+        if invalid:
+            conn.execute(text("UPDATE calendar_events SET meta_data = NULL WHERE id = :id"), invalid)
+        if backfill:
+            conn.execute(
+                text(
+                    "UPDATE calendar_events SET meta_quarter = :quarter, "
+                    "meta_dividend_amount = :dividend_amount, meta_rcept_no = :rcept_no "
+                    "WHERE id = :id"
+                ),
+                backfill
+            )
+
+    if conn.dialect.name == "postgresql":
+        conn.execute(text(
+            "ALTER TABLE calendar_events "
+            "ALTER COLUMN meta_data TYPE JSONB USING meta_data::jsonb"
+        ))
+
+    _create_indexes(conn, table, (
+        "ix_calendar_events_meta_quarter",
+        "ix_calendar_events_meta_dividend_amount",
+        "ix_calendar_events_meta_rcept_no",
+    ))
+
+@migration("0003_calendar_event_external_id")
+def add_external_id(conn: Connection) -> None:
+    """외부 데이터 upsert용 external_id 컬럼 및 가상화폐 이벤트 타입 추가"""
+    table = models.CalendarEvent.__table__
+    existing = {column["name"] for column in inspect(conn).get_columns(table.name)}
+
+    if "external_id" not in existing:
+        column_type = table.c.external_id.type.compile(dialect=conn.dialect)
+        conn.execute(text(f"ALTER TABLE calendar_events ADD COLUMN external_id {column_type}"))
+
+    if conn.dialect.name == "postgresql":
+        # PostgreSQL은 네이티브 ENUM 타입에 값을 추가해야 함
+        conn.execute(text("ALTER TYPE eventtype ADD VALUE IF NOT EXISTS 'CRYPTO'"))
+
+    _create_indexes(conn, table, ("ux_calendar_events_external_id",))
+
+# 다른 프로세스/raw SQL 변경 감지를 위해 버전을 관리하는 테이블
+VERSIONED_TABLES = ("calendar_events", "bookmarks", "watchlist")
+
+@migration("0004_data_version_triggers")
+def add_data_version_triggers(conn: Connection) -> None:
+    """행 변경 시 같은 트랜잭션에서 data_versions 카운터를 올리는 트리거 추가"""
+    models.DataVersion.__table__.create(bind=conn, checkfirst=True)
+    for name in VERSIONED_TABLES:
+        conn.execute(text(
+            "INSERT INTO data_versions (table_name, version, updated_at) "
+            "SELECT :name, 0, CURRENT_TIMESTAMP "
+            "WHERE NOT EXISTS (SELECT 1 FROM data_versions WHERE table_name = :name)"
+        ), {"name": name})
+
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        for name in VERSIONED_TABLES:
+            for operation in ("INSERT", "UPDATE", "DELETE"):
+                conn.execute(text(
+                    f"CREATE TRIGGER IF NOT EXISTS trg_{name}_version_{operation.lower()} "
+                    f"AFTER {operation} ON {name} BEGIN "
+                    "UPDATE data_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP "
+                    f"WHERE table_name = '{name}'; END"
+                ))
+    elif dialect == "postgresql":
+        conn.execute(text(
+            "CREATE OR REPLACE FUNCTION bump_data_version() RETURNS trigger AS $$ "
+            "BEGIN "
+            "UPDATE data_versions SET version = version + 1, updated_at = now() "
+            "WHERE table_name = TG_TABLE_NAME; "
+            "RETURN NULL; "
+            "END; $$ LANGUAGE plpgsql"
+        ))
+        for name in VERSIONED_TABLES:
+            conn.execute(text(f"DROP TRIGGER IF EXISTS trg_{name}_version ON {name}"))
+            conn.execute(text(
+                f"CREATE TRIGGER trg_{name}_version "
+                f"AFTER INSERT OR UPDATE OR DELETE ON {name} "
+                "FOR EACH ROW EXECUTE FUNCTION bump_data_version()"
+            ))
+    else:
+        logger.warning(f"{dialect}: 데이터 버전 트리거를 지원하지 않아 외부 변경을 감지하지 않음")
+
+@migration("0005_user_feed_token_version")
+def add_feed_token_version(conn: Connection) -> None:
+    """캘린더 피드 토큰 폐기용 사용자별 토큰 버전 컬럼 추가"""
+    existing = {column["name"] for column in inspect(conn).get_columns("users")}
+    if "feed_token_version" not in existing:
+        conn.execute(text(
+            "ALTER TABLE users ADD COLUMN feed_token_version INTEGER NOT NULL DEFAULT 0"
+        ))
+
+def run_migrations(bind: Engine) -> None:
+    """적용되지 않은 마이그레이션 실행"""
+    with bind.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "id VARCHAR(100) PRIMARY KEY, "
+            "applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+        ))
+        applied = {
+            row[0] for row in conn.execute(text("SELECT id FROM schema_migrations"))
+        }
+
+    for migration_id, func in MIGRATIONS:
+        if migration_id in applied:
+            continue
+
+        # 마이그레이션별 트랜잭션
+        with bind.begin() as conn:
+            func(conn)
+            conn.execute(
+                text("INSERT INTO schema_migrations (id) VALUES (:id)"),
+                {"id": migration_id}
+            )
+        logger.info(f"마이그레이션 적용: {migration_id}")
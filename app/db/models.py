@@ -1,8 +1,10 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, Text, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Boolean, Float, Text, ForeignKey, Index, JSON, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from datetime import datetime
 import enum
+import re
 
 Base = declarative_base()
 
@@ -16,6 +18,17 @@ class EventType(str, enum.Enum):
     SPLIT = "split"  # 액면분할
     ECONOMIC = "economic"  # 경제지표
     PERSONAL = "personal"  # 개인일정
+    CRYPTO = "crypto"  # 가상화폐
+
+def parse_amount(value) -> float:
+    """금액 문자열(예: "1,500원")을 숫자로 변환"""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    digits = re.sub(r"[^0-9.]", "", str(value))
+    try:
+        return float(digits) if digits else None
+    except ValueError:
+        return None
 
 class User(Base):
     __tablename__ = "users"
@@ -27,6 +40,7 @@ class User(Base):
     full_name = Column(String(255))
     is_active = Column(Boolean, default=True)
     is_superuser = Column(Boolean, default=False)
+    feed_token_version = Column(Integer, nullable=False, default=0, server_default="0")  # 재발급 시 증가 (이전 피드 토큰 폐기)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -47,7 +61,13 @@ class CalendarEvent(Base):
     stock_name = Column(String(100))
     importance = Column(String(20), default="medium")  # high, medium, low
     source = Column(String(50))  # KIS, DART, KRX, etc.
-    meta_data = Column(Text)  # JSON 형식의 추가 데이터
+    external_id = Column(String(100))  # 외부 데이터의 고유 ID (예: calendar_events.json의 id)
+    meta_data = Column(JSON().with_variant(JSONB(), "postgresql"))  # 추가 데이터
+    
+    # meta_data에서 추출한 필터용 컬럼 (meta_data 설정 시 자동 갱신)
+    meta_quarter = Column(String(10), index=True)
+    meta_dividend_amount = Column(Float, index=True)
+    meta_rcept_no = Column(String(20), index=True)
     
     # User specific events
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
@@ -58,6 +78,49 @@ class CalendarEvent(Base):
     
     # Relationships
     bookmarks = relationship("Bookmark", back_populates="event", cascade="all, delete-orphan")
+    
+    @validates("meta_data")
+    def _sync_meta_columns(self, key, value):
+        """meta_data의 필터 대상 필드를 전용 컬럼에 반영"""
+        data = value if isinstance(value, dict) else {}
+        quarter = data.get("quarter")
+        rcept_no = data.get("rcept_no")
+        self.meta_quarter = str(quarter) if quarter else None
+        self.meta_dividend_amount = parse_amount(data.get("dividend_amount", data.get("amount")))
+        self.meta_rcept_no = str(rcept_no) if rcept_no else None
+        return value
+    
+    __table_args__ = (
+        # 외부 데이터 일괄 upsert 키
+        Index("ux_calendar_events_external_id", "external_id", unique=True),
+        # 기간 + 타입 조회 (공개 이벤트 전용 부분 인덱스)
+        Index(
+            "ix_calendar_events_public_type_date",
+            "event_type", "event_date",
+            sqlite_where=user_id.is_(None),
+            postgresql_where=user_id.is_(None)
+        ),
+        Index(
+            "ix_calendar_events_public_date",
+            "event_date",
+            sqlite_where=user_id.is_(None),
+            postgresql_where=user_id.is_(None)
+        ),
+        # 개인 이벤트 조회
+        Index(
+            "ix_calendar_events_user_date",
+            "user_id", "event_date",
+            sqlite_where=user_id.isnot(None),
+            postgresql_where=user_id.isnot(None)
+        ),
+        # 종목별 이벤트 조회
+        Index(
+            "ix_calendar_events_stock_date",
+            "stock_code", "event_date",
+            sqlite_where=stock_code.isnot(None),
+            postgresql_where=stock_code.isnot(None)
+        ),
+    )
 
 class Bookmark(Base):
     __tablename__ = "bookmarks"
@@ -71,6 +134,11 @@ class Bookmark(Base):
     # Relationships
     user = relationship("User", back_populates="bookmarks")
     event = relationship("CalendarEvent", back_populates="bookmarks")
+    
+    __table_args__ = (
+        Index("ux_bookmarks_user_event", "user_id", "event_id", unique=True),
+        Index("ix_bookmarks_event_id", "event_id"),
+    )
 
 class Watchlist(Base):
     __tablename__ = "watchlist"
@@ -86,6 +154,39 @@ class Watchlist(Base):
     
     # Relationships
     user = relationship("User", back_populates="watchlist")
+    
+    __table_args__ = (
+        Index("ix_watchlist_user_stock", "user_id", "stock_code"),
+        Index("ix_watchlist_stock_code", "stock_code"),
+    )
+
+class CalendarSyncJob(Base):
+    """캘린더 동기화 작업 (워커 간 중복 실행 방지 및 진행 상황 공유)"""
+    __tablename__ = "calendar_sync_jobs"
+    
+    id = Column(String(32), primary_key=True)
+    year = Column(Integer, nullable=False)
+    month = Column(Integer, nullable=False)
+    status = Column(String(20), nullable=False, default="pending")  # pending, running, completed, failed
+    total = Column(Integer, nullable=False, default=0)
+    processed = Column(Integer, nullable=False, default=0)
+    created = Column(Integer, nullable=False, default=0)
+    error = Column(Text)
+    created_at = Column(DateTime, default=datetime.now)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    heartbeat_at = Column(DateTime)  # 실행 중인 프로세스가 주기적으로 갱신
+    
+    __table_args__ = (
+        # 같은 (연도, 월)에는 진행 중인 작업이 하나만 존재
+        Index(
+            "ux_calendar_sync_jobs_active",
+            "year", "month",
+            unique=True,
+            sqlite_where=status.in_(["pending", "running"]),
+            postgresql_where=status.in_(["pending", "running"])
+        ),
+    )
 
 class Stock(Base):
     __tablename__ = "stocks"
@@ -98,4 +199,49 @@ class Stock(Base):
     current_price = Column(Float)
     price_updated_at = Column(DateTime)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow) 
\ No newline at end of file
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class StockDailyPrice(Base):
+    """일별 시세 (OHLCV) 시계열"""
+    __tablename__ = "stock_daily_prices"
+    
+    stock_code = Column(String(20), primary_key=True)
+    trade_date = Column(Integer, primary_key=True)  # YYYYMMDD
+    open_price = Column(Integer, nullable=False)
+    high_price = Column(Integer, nullable=False)
+    low_price = Column(Integer, nullable=False)
+    close_price = Column(Integer, nullable=False)
+    volume = Column(BigInteger, nullable=False, default=0)
+    change_rate_bp = Column(Integer, nullable=False, default=0)  # 전일 대비 등락률 (0.01% 단위)
+    
+    __table_args__ = {"sqlite_with_rowid": False}
+
+class StockPriceTick(Base):
+    """장중 체결가 시계열"""
+    __tablename__ = "stock_price_ticks"
+    
+    stock_code = Column(String(20), primary_key=True)
+    ts = Column(BigInteger, primary_key=True)  # Unix timestamp (초)
+    price = Column(Integer, nullable=False)
+    volume = Column(BigInteger, nullable=False, default=0)  # 누적 거래량
+    
+    __table_args__ = {"sqlite_with_rowid": False}
+
+class StockHistoryCoverage(Base):
+    """기간별 시세 캐시에 적재가 끝난 날짜 구간 (종목 + 주기별)"""
+    __tablename__ = "stock_history_coverage"
+    
+    stock_code = Column(String(20), primary_key=True)
+    period = Column(String(1), primary_key=True)  # D, W, M, Y
+    start_date = Column(Integer, primary_key=True)  # YYYYMMDD
+    end_date = Column(Integer, nullable=False)  # YYYYMMDD (포함)
+    
+    __table_args__ = {"sqlite_with_rowid": False}
+
+class DataVersion(Base):
+    """테이블별 변경 카운터 (DB 트리거가 행 변경마다 증가)"""
+    __tablename__ = "data_versions"
+    
+    table_name = Column(String(100), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
@@ -1,18 +1,106 @@
-from sqlalchemy import create_engine
+from typing import Any, Dict
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
 
+# 비동기 드라이버 매핑 (로컬: aiosqlite, 운영: asyncpg)
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgres": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+}
+
+def get_async_database_url(database_url: str) -> str:
+    """동기 DATABASE_URL을 비동기 드라이버 URL로 변환"""
+    scheme, sep, rest = database_url.partition("://")
+    dialect = scheme.split("+", 1)[0]
+    if dialect in ASYNC_DRIVERS:
+        return f"{ASYNC_DRIVERS[dialect]}{sep}{rest}"
+    return database_url
+
+IS_SQLITE = settings.DATABASE_URL.startswith("sqlite")
+IS_SQLITE_MEMORY = IS_SQLITE and (
+    ":memory:" in settings.DATABASE_URL or settings.DATABASE_URL.rstrip("/") == "sqlite:"
+)
+USE_PRODUCTION_PROFILE = settings.DB_PROFILE == "production"
+
+def get_engine_options(is_async: bool = False) -> Dict[str, Any]:
+    """DB_PROFILE에 따른 커넥션 풀 설정"""
+    if not USE_PRODUCTION_PROFILE or IS_SQLITE_MEMORY:
+        return {}
+    
+    options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": not IS_SQLITE
+    }
+    
+    # aiosqlite는 기본이 NullPool이므로 커넥션(및 pragma)을 재사용하도록 풀 지정
+    if is_async and IS_SQLITE:
+        options["poolclass"] = AsyncAdaptedQueuePool
+    
+    return options
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """커넥션 생성 시 SQLite pragma 적용 (production 프로필)
+
+    WAL 모드에서는 파이프라인 쓰기 중에도 캘린더 읽기가 차단되지 않고,
+    busy_timeout으로 쓰기 경합 시 즉시 "database is locked" 대신 대기한다.
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        # 음수 값은 KiB 단위
+        cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cursor.close()
+
 # 데이터베이스 엔진 생성
-if settings.DATABASE_URL.startswith("sqlite"):
+if IS_SQLITE:
     engine = create_engine(
         settings.DATABASE_URL,
-        connect_args={"check_same_thread": False}
+        connect_args={"check_same_thread": False},
+        **get_engine_options()
     )
 else:
-    engine = create_engine(settings.DATABASE_URL)
+    engine = create_engine(settings.DATABASE_URL, **get_engine_options())
+
+# 비동기 엔진 생성 (요청 핸들러용)
+async_engine = create_async_engine(
+    get_async_database_url(settings.DATABASE_URL),
+    **get_engine_options(is_async=True)
+)
+
+if IS_SQLITE and USE_PRODUCTION_PROFILE:
+    event.listen(engine, "connect", apply_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", apply_sqlite_pragmas)
 
 # 세션 팩토리 생성
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+def dialect_insert(db: Session, table):
+    """DB 방언별 INSERT ... ON CONFLICT 구문 반환 (지원하지 않는 방언은 None)"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        return None
+    return insert(table)
 
 # 의존성 주입을 위한 함수
 def get_db() -> Session:
@@ -20,4 +108,8 @@ def get_db() -> Session:
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+async def get_async_db() -> AsyncSession:
+    async with AsyncSessionLocal() as db:
+        yield db
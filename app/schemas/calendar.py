@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any, Union
-from datetime import datetime
+from datetime import date, datetime
 from enum import Enum
 
 
@@ -14,6 +14,7 @@ class EventTypeFilter(str, Enum):
     SPLIT = "split"  # 액면분할
     ECONOMIC = "economic"  # 경제지표
     PERSONAL = "personal"  # 개인일정
+    CRYPTO = "crypto"  # 가상화폐
 
 
 class CalendarEventBase(BaseModel):
@@ -74,6 +75,39 @@ class UpcomingEventResponse(BaseModel):
     next_week: List[UpcomingEvent] = []
 
 
+class CalendarDaySummary(BaseModel):
+    """일별 이벤트 집계 스키마"""
+    date: date
+    total: int
+    event_types: Dict[str, int] = {}
+    importance: Dict[str, int] = {}
+
+
+class CalendarMonthSummary(BaseModel):
+    """월간 일별 집계 응답 스키마"""
+    year: int
+    month: int
+    total_events: int
+    days: List[CalendarDaySummary] = []
+
+
+class SyncJobResponse(BaseModel):
+    """캘린더 동기화 작업 상태 스키마"""
+    job_id: str
+    year: int
+    month: int
+    status: str  # pending, running, completed, failed
+    progress: float = 0.0  # 0.0 ~ 1.0
+    total: int = 0
+    processed: int = 0
+    created: int = 0
+    merged: bool = False  # 진행 중인 같은 월 작업에 병합된 요청인지
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
 class CalendarFilters(BaseModel):
     """캘린더 필터 스키마"""
     event_types: Optional[List[EventTypeFilter]] = None
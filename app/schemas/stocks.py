@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 
@@ -15,6 +15,24 @@ class StockPriceResponse(BaseModel):
     opening_price: float
     previous_close: float
 
+class StockPricesRequest(BaseModel):
+    """다중 종목 시세 요청"""
+    stock_codes: List[str] = Field(..., alias="stockCodes")
+    
+    class Config:
+        populate_by_name = True
+
+class StockPricesResponse(BaseModel):
+    """다중 종목 시세 응답 (컬럼형: 같은 위치의 값이 한 종목)"""
+    stock_code: List[str]
+    stock_name: List[str]
+    current_price: List[float]
+    change_price: List[float]
+    change_rate: List[float]
+    volume: List[int]
+    age: List[float]  # 시세 조회 후 경과 시간 (초)
+    missing: List[str] = []  # 조회 실패한 종목코드
+
 class StockHistoryResponse(BaseModel):
     """주식 기간별 시세 응답"""
     date: str
@@ -25,6 +43,14 @@ class StockHistoryResponse(BaseModel):
     volume: int
     change_rate: float
 
+class TechnicalIndicatorResponse(BaseModel):
+    """기술적 지표 응답 (날짜 배열 + 지표별 값 배열)"""
+    stock_code: str
+    last_bar_date: Optional[str] = None
+    provisional: bool = False  # 마지막 일봉이 장중 임시 값인지
+    dates: List[str]
+    series: Dict[str, List[Optional[float]]]
+
 class MarketIndexResponse(BaseModel):
     """시장 지수 응답"""
     index_code: str
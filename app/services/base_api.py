@@ -3,7 +3,7 @@ Base API Client - 공통 API 기능 제공
 """
 import aiohttp
 import asyncio
-from typing import Dict, Any, Optional, TypeVar, Callable
+from typing import Dict, Any, Optional, TypeVar, Callable, Awaitable, Iterable, List, NamedTuple
 from functools import wraps
 import logging
 from datetime import datetime, timedelta
@@ -216,6 +216,45 @@ class BaseAPIClient(ABC):
         tasks = [process_request(req) for req in requests]
         return await asyncio.gather(*tasks)
 
+class FanOutResult(NamedTuple):
+    """fan_out 항목별 결과 (실패/시간 초과 시 error 설정)"""
+    item: Any
+    value: Any
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+async def fan_out(
+    items: Iterable[Any],
+    fetch: Callable[[Any], Awaitable[T]],
+    max_concurrent: int = 5,
+    timeout: Optional[float] = None,
+    semaphore: Optional[asyncio.Semaphore] = None
+) -> List[FanOutResult]:
+    """항목별 조회를 동시 실행 수를 제한하여 병렬 실행 (입력 순서 유지)
+
+    timeout은 항목별 호출 시간(대기열 시간 제외) 제한이며, 실패/시간 초과 항목은
+    error가 설정된 결과로 반환되어 나머지 결과는 그대로 사용할 수 있다.
+    여러 그룹이 같은 semaphore를 공유하면 전체 동시 실행 수를 함께 제한한다.
+    클라이언트의 RateLimiter는 각 호출 내부에서 그대로 적용된다.
+    """
+    semaphore = semaphore or asyncio.Semaphore(max_concurrent)
+
+    async def run(item) -> FanOutResult:
+        async with semaphore:
+            try:
+                return FanOutResult(item, await asyncio.wait_for(fetch(item), timeout))
+            except asyncio.TimeoutError:
+                logger.warning(f"fan_out 시간 초과: {item}")
+                return FanOutResult(item, None, "timeout")
+            except Exception as e:
+                logger.warning(f"fan_out 조회 실패: {item} - {str(e)}")
+                return FanOutResult(item, None, str(e) or type(e).__name__)
+
+    return await asyncio.gather(*(run(item) for item in items))
+
 class DataMapper:
     """API 응답 데이터 변환 도우미"""
     
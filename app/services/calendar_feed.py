@@ -0,0 +1,212 @@
+"""
+iCalendar(RFC 5545) 구독 피드
+VEVENT 블록은 이벤트별로, 완성된 피드는 사용자별로 캐시하고 변경된 이벤트만 다시 렌더링
+"""
+from typing import List, Optional, Tuple
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta
+import logging
+
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.versioning import versions
+from app.db import models
+from app.db.listeners import ModelChange, subscribe
+from app.services.calendar_versions import range_keys, watchlist_key
+
+logger = logging.getLogger(__name__)
+
+FEED_COLUMNS = (
+    models.CalendarEvent.id,
+    models.CalendarEvent.event_date,
+    models.CalendarEvent.event_type,
+    models.CalendarEvent.title,
+    models.CalendarEvent.description,
+    models.CalendarEvent.stock_code,
+    models.CalendarEvent.stock_name,
+    models.CalendarEvent.importance,
+    models.CalendarEvent.updated_at,
+)
+
+# 중요도 -> PRIORITY (1: 높음, 5: 보통, 9: 낮음)
+PRIORITY = {"high": 1, "medium": 5, "low": 9}
+
+def escape_text(value: str) -> str:
+    """TEXT 값 이스케이프"""
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+def fold_line(line: str) -> str:
+    """75 옥텟 단위 줄 접기 (UTF-8 문자 중간에서 자르지 않음)"""
+    if len(line.encode("utf-8")) <= 75:
+        return line + "\r\n"
+
+    parts = []
+    current = ""
+    size = 0
+    limit = 75
+    for char in line:
+        char_size = len(char.encode("utf-8"))
+        if size + char_size > limit:
+            parts.append(current)
+            current = ""
+            size = 0
+            limit = 74  # 이어지는 줄은 앞의 공백 1옥텟 포함
+        current += char
+        size += char_size
+    parts.append(current)
+    return "\r\n ".join(parts) + "\r\n"
+
+def _format_utc(value: datetime) -> str:
+    return value.strftime("%Y%m%dT%H%M%SZ")
+
+def render_vevent(row) -> str:
+    """이벤트 1건 -> VEVENT 블록"""
+    event_type = getattr(row.event_type, "value", row.event_type)
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:event-{row.id}@investcalendar",
+        f"DTSTAMP:{_format_utc(row.updated_at)}",
+        f"LAST-MODIFIED:{_format_utc(row.updated_at)}",
+    ]
+
+    # 시각이 없는 일정은 종일 이벤트로, 나머지는 현지 시각(floating)으로 표기
+    if row.event_date.time() == time.min:
+        start = row.event_date.date()
+        lines.append(f"DTSTART;VALUE=DATE:{start:%Y%m%d}")
+        lines.append(f"DTEND;VALUE=DATE:{start + timedelta(days=1):%Y%m%d}")
+    else:
+        lines.append(f"DTSTART:{row.event_date:%Y%m%dT%H%M%S}")
+
+    title = row.title
+    if row.stock_name and row.stock_name not in title:
+        title = f"[{row.stock_name}] {title}"
+    lines.append(f"SUMMARY:{escape_text(title)}")
+    if row.description:
+        lines.append(f"DESCRIPTION:{escape_text(row.description)}")
+    lines.append(f"CATEGORIES:{escape_text(event_type)}")
+    lines.append(f"PRIORITY:{PRIORITY.get(row.importance or 'medium', 5)}")
+    lines.append("END:VEVENT")
+
+    return "".join(fold_line(line) for line in lines)
+
+class CalendarFeedCache:
+    """사용자별 iCalendar 피드 캐시"""
+
+    def __init__(self, max_feeds: int = 1000, max_events: int = 50000):
+        self.max_feeds = max_feeds
+        self.max_events = max_events
+        # event_id -> (updated_at, VEVENT 블록) (LRU)
+        self._vevents: "OrderedDict[int, Tuple[datetime, str]]" = OrderedDict()
+        # user_id -> (ETag, 피드 본문) (LRU)
+        self._feeds: "OrderedDict[int, Tuple[str, bytes]]" = OrderedDict()
+
+    def feed_window(self, today: Optional[date] = None) -> Tuple[datetime, datetime]:
+        """피드에 포함할 기간"""
+        today = today or date.today()
+        start = datetime.combine(today - timedelta(days=settings.CALENDAR_FEED_PAST_DAYS), time.min)
+        end = datetime.combine(today + timedelta(days=settings.CALENDAR_FEED_FUTURE_DAYS), time.max)
+        return start, end
+
+    def feed_etag(self, user_id: int) -> str:
+        """피드 구성에 영향을 주는 파티션 버전으로 만든 ETag"""
+        start, end = self.feed_window()
+        keys = range_keys(start, end, user_id) + [watchlist_key(user_id)]
+        return versions.etag(keys, "ics", user_id, start.date())
+
+    def get_cached(self, user_id: int, etag: str) -> Optional[bytes]:
+        """버전이 같으면 캐시된 피드 반환"""
+        cached = self._feeds.get(user_id)
+        if cached and cached[0] == etag:
+            self._feeds.move_to_end(user_id)
+            return cached[1]
+        return None
+
+    def evict(self, user_id: int) -> None:
+        """사용자 피드 본문 캐시 제거 (토큰 재발급 등)"""
+        self._feeds.pop(user_id, None)
+
+    async def build(self, db: AsyncSession, user_id: int, etag: str) -> bytes:
+        """피드 조립 (변경된 이벤트의 VEVENT만 다시 렌더링)"""
+        start, end = self.feed_window()
+        event = models.CalendarEvent
+
+        bookmarked_ids = select(models.Bookmark.event_id).where(
+            models.Bookmark.user_id == user_id
+        )
+        watched_codes = select(models.Watchlist.stock_code).where(
+            models.Watchlist.user_id == user_id
+        )
+        query = (
+            select(*FEED_COLUMNS)
+            .where(
+                event.event_date >= start,
+                event.event_date <= end,
+                or_(
+                    # 시장 전체 일정 (휴장일, 경제지표 등)
+                    (event.user_id == None) & (event.stock_code == None),
+                    # 개인 일정
+                    event.user_id == user_id,
+                    # 북마크한 일정
+                    event.id.in_(bookmarked_ids),
+                    # 관심종목 일정
+                    (event.user_id == None) & event.stock_code.in_(watched_codes)
+                )
+            )
+            .order_by(event.event_date, event.id)
+        )
+        rows = (await db.execute(query)).all()
+
+        blocks: List[str] = []
+        rendered = 0
+        for row in rows:
+            cached = self._vevents.get(row.id)
+            if cached is None or cached[0] != row.updated_at:
+                cached = (row.updated_at, render_vevent(row))
+                self._vevents[row.id] = cached
+                rendered += 1
+            self._vevents.move_to_end(row.id)
+            blocks.append(cached[1])
+        while len(self._vevents) > self.max_events:
+            self._vevents.popitem(last=False)
+
+        body = "".join([
+            "BEGIN:VCALENDAR\r\n",
+            "VERSION:2.0\r\n",
+            "PRODID:-//InvestCalendar//Investment Calendar//KO\r\n",
+            "CALSCALE:GREGORIAN\r\n",
+            "METHOD:PUBLISH\r\n",
+            fold_line(f"X-WR-CALNAME:{escape_text(settings.APP_NAME)}"),
+            *blocks,
+            "END:VCALENDAR\r\n",
+        ]).encode("utf-8")
+
+        self._feeds[user_id] = (etag, body)
+        self._feeds.move_to_end(user_id)
+        while len(self._feeds) > self.max_feeds:
+            self._feeds.popitem(last=False)
+        logger.debug(f"캘린더 피드 생성 (user={user_id}, 이벤트 {len(rows)}개, 렌더링 {rendered}개)")
+        return body
+
+    def on_event_change(self, change: ModelChange) -> None:
+        """삭제/수정된 이벤트의 VEVENT 블록 제거"""
+        if change.old:
+            self._vevents.pop(change.old["id"], None)
+
+    def reset(self) -> None:
+        self._vevents.clear()
+        self._feeds.clear()
+
+# 전역 캘린더 피드 캐시 인스턴스
+calendar_feed = CalendarFeedCache(
+    max_feeds=settings.CALENDAR_FEED_CACHE_MAX_FEEDS,
+    max_events=settings.CALENDAR_FEED_CACHE_MAX_EVENTS
+)
+subscribe(models.CalendarEvent, calendar_feed.on_event_change, calendar_feed.reset)
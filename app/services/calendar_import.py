@@ -0,0 +1,236 @@
+"""
+기본 캘린더 이벤트 일괄 적재
+calendar_events.json(FullCalendar 형식)을 스트리밍으로 읽어 calendar_events 테이블에
+external_id(생성기의 고유 id) 기준으로 배치 upsert
+
+사용법:
+    python -m app.services.calendar_import [--file calendar_events.json] [--batch-size 500]
+"""
+from typing import Any, Dict, Iterator, List, Optional
+from datetime import datetime
+import argparse
+import json
+import logging
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from app.db import models
+from app.db.listeners import notify_reset
+from app.db.session import SessionLocal, dialect_insert
+from app.services.static_calendar import find_calendar_events_file
+
+logger = logging.getLogger(__name__)
+
+SOURCE = "calendar_generator"
+
+# upsert 시 갱신하는 컬럼 (값이 바뀐 행만 갱신)
+UPSERT_COLUMNS = (
+    "event_date", "event_type", "title", "description", "stock_code", "stock_name",
+    "importance", "source", "meta_data", "meta_quarter", "meta_dividend_amount", "meta_rcept_no",
+)
+
+# extendedProps 중 전용 컬럼으로 옮기지 않는 값은 meta_data에 보관
+COLUMN_PROPS = {"eventType", "stockCode", "stockName", "description", "importance"}
+
+# JSON 배열 원소 사이의 공백/구분자
+SEPARATORS = " \t\r\n,"
+
+def iter_json_array(path: str, chunk_size: int = 65536) -> Iterator[Any]:
+    """최상위 JSON 배열의 원소를 파일 전체를 읽지 않고 하나씩 반환"""
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = ""
+        position = 0
+        eof = False
+        started = False
+
+        while True:
+            # 공백/구분자 건너뛰기
+            while position < len(buffer) and buffer[position] in SEPARATORS:
+                position += 1
+
+            if position == len(buffer):
+                if eof:
+                    if started:
+                        raise ValueError("JSON 배열이 닫히지 않았습니다.")
+                    return
+                buffer = f.read(chunk_size)
+                position = 0
+                eof = not buffer
+                continue
+
+            if not started:
+                if buffer[position] != "[":
+                    raise ValueError("최상위 값이 JSON 배열이 아닙니다.")
+                started = True
+                position += 1
+                continue
+
+            if buffer[position] == "]":
+                return
+
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+                # 숫자는 청크 경계에서 잘려도 디코딩되므로 뒤에 구분자가 올 때만 완료로 판단
+                complete = eof or (end < len(buffer) and buffer[end] in SEPARATORS + "]")
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                complete = False
+
+            if not complete:
+                # 원소가 청크 경계에 걸친 경우 이어 읽어서 재시도
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer = buffer[position:] + chunk
+                position = 0
+                continue
+
+            position = end
+            yield value
+
+def map_fullcalendar_event(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """FullCalendar 이벤트 -> calendar_events 행 (지원하지 않는 타입은 None)"""
+    props = item.get("extendedProps", {})
+    try:
+        event_type = models.EventType(props.get("eventType"))
+        event_date = datetime.fromisoformat(item["start"])
+    except (KeyError, ValueError, TypeError):
+        return None
+
+    meta_data = {key: value for key, value in props.items() if key not in COLUMN_PROPS}
+    for key in ("backgroundColor", "borderColor"):
+        if item.get(key):
+            meta_data[key] = item[key]
+
+    # meta_data 필터 컬럼(meta_*)은 모델 validator로 계산
+    event = models.CalendarEvent(meta_data=meta_data or None)
+    return {
+        "external_id": str(item["id"]),
+        "event_date": event_date,
+        "event_type": event_type,
+        "title": item.get("title", ""),
+        "description": props.get("description"),
+        "stock_code": props.get("stockCode"),
+        "stock_name": props.get("stockName"),
+        "importance": props.get("importance", "medium"),
+        "source": SOURCE,
+        "meta_data": event.meta_data,
+        "meta_quarter": event.meta_quarter,
+        "meta_dividend_amount": event.meta_dividend_amount,
+        "meta_rcept_no": event.meta_rcept_no,
+    }
+
+def _upsert_batch(db: Session, rows: List[Dict[str, Any]]) -> int:
+    """배치 upsert -> 실제로 추가/변경된 행 수 (값이 같은 행은 제외)"""
+    table = models.CalendarEvent.__table__
+    stmt = dialect_insert(db, table)
+    now = datetime.utcnow()
+
+    if stmt is None:
+        # ON CONFLICT 미지원 DB는 조회 후 갱신/추가
+        existing = {
+            event.external_id: event
+            for event in db.scalars(select(models.CalendarEvent).where(
+                models.CalendarEvent.external_id.in_([row["external_id"] for row in rows])
+            ))
+        }
+        changed = 0
+        for row in rows:
+            event = existing.get(row["external_id"])
+            if event is None:
+                db.add(models.CalendarEvent(**row))
+                changed += 1
+            elif any(getattr(event, column) != value for column, value in row.items()):
+                for column, value in row.items():
+                    setattr(event, column, value)
+                changed += 1
+        return changed
+
+    stmt = stmt.values([{**row, "created_at": now, "updated_at": now} for row in rows])
+    result = db.execute(stmt.on_conflict_do_update(
+        index_elements=["external_id"],
+        set_={
+            **{column: stmt.excluded[column] for column in UPSERT_COLUMNS},
+            "updated_at": now
+        },
+        where=or_(*(
+            table.c[column].is_distinct_from(stmt.excluded[column])
+            for column in UPSERT_COLUMNS
+        ))
+    ))
+    # 조건(WHERE)에 걸려 갱신되지 않은 행은 rowcount에 포함되지 않음
+    return result.rowcount
+
+def import_calendar_events(path: Optional[str] = None, batch_size: int = 500) -> Dict[str, int]:
+    """JSON 이벤트 파일을 DB로 일괄 upsert"""
+    path = path or find_calendar_events_file()
+    if not path:
+        raise FileNotFoundError("캘린더 이벤트 파일을 찾을 수 없습니다.")
+
+    # upserted: 실제로 추가/변경된 행, unchanged: 기존 값과 같은 행, duplicates: 배치 안에서 합쳐진 중복 id
+    stats = {"read": 0, "upserted": 0, "unchanged": 0, "duplicates": 0, "skipped": 0}
+    db = SessionLocal()
+    try:
+        # 같은 배치 안의 중복 id는 마지막 값만 사용
+        batch: Dict[str, Dict[str, Any]] = {}
+        for item in iter_json_array(path):
+            stats["read"] += 1
+            row = map_fullcalendar_event(item) if isinstance(item, dict) and item.get("id") else None
+            if row is None:
+                stats["skipped"] += 1
+                continue
+
+            if row["external_id"] in batch:
+                stats["duplicates"] += 1
+            batch[row["external_id"]] = row
+            if len(batch) >= batch_size:
+                changed = _upsert_batch(db, list(batch.values()))
+                stats["upserted"] += changed
+                stats["unchanged"] += len(batch) - changed
+                batch = {}
+
+        if batch:
+            changed = _upsert_batch(db, list(batch.values()))
+            stats["upserted"] += changed
+            stats["unchanged"] += len(batch) - changed
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    # ORM을 거치지 않은 일괄 변경이므로 메모리 집계/인덱스 재구성 (변경이 있을 때만)
+    if stats["upserted"]:
+        notify_reset(models.CalendarEvent)
+    logger.info(
+        f"캘린더 이벤트 적재 완료 ({path}): 읽음 {stats['read']}개, "
+        f"추가/변경 {stats['upserted']}개, 변경 없음 {stats['unchanged']}개, "
+        f"중복 id {stats['duplicates']}개, 건너뜀 {stats['skipped']}개"
+    )
+    return stats
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="calendar_events.json을 DB로 일괄 적재")
+    parser.add_argument("--file", help="이벤트 JSON 파일 경로 (기본: 설정/프로젝트 루트)")
+    parser.add_argument("--batch-size", type=int, default=500, help="배치 크기")
+    args = parser.parse_args()
+
+    from app.db.session import engine
+    from app.db.migrations import run_migrations
+
+    logging.basicConfig(level=logging.INFO)
+    models.Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+
+    stats = import_calendar_events(args.file, args.batch_size)
+    print(
+        f"읽음 {stats['read']}개, 추가/변경 {stats['upserted']}개, 변경 없음 {stats['unchanged']}개, "
+        f"중복 id {stats['duplicates']}개, 건너뜀 {stats['skipped']}개"
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+캘린더 이벤트 메모리 인덱스 (선택 기능)
+날짜 서수/타입/중요도/종목/사용자를 NumPy 컬럼으로 정렬 보관하고
+기간 + 타입 + 종목 조회를 이진 탐색과 마스크 연산으로 처리
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from datetime import datetime
+import logging
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db import models
+from app.db.listeners import ModelChange, subscribe
+
+logger = logging.getLogger(__name__)
+
+# 응답(CalendarEventResponse)에 필요한 컬럼
+INDEX_COLUMNS = (
+    models.CalendarEvent.id,
+    models.CalendarEvent.event_date,
+    models.CalendarEvent.event_type,
+    models.CalendarEvent.title,
+    models.CalendarEvent.description,
+    models.CalendarEvent.stock_code,
+    models.CalendarEvent.stock_name,
+    models.CalendarEvent.importance,
+    models.CalendarEvent.source,
+    models.CalendarEvent.meta_data,
+    models.CalendarEvent.user_id,
+    models.CalendarEvent.created_at,
+    models.CalendarEvent.updated_at,
+)
+RECORD_FIELDS = tuple(column.key for column in INDEX_COLUMNS)
+
+TYPE_CODES = {event_type.value: code for code, event_type in enumerate(models.EventType)}
+IMPORTANCE_CODES = {"high": 0, "medium": 1, "low": 2}
+
+NO_STOCK = -1
+PUBLIC_USER = -1
+
+Record = Dict[str, Any]
+
+def _type_value(event_type) -> str:
+    return getattr(event_type, "value", event_type)
+
+def _sort_key(record: Record) -> Tuple[datetime, int]:
+    return (record["event_date"], record["id"])
+
+class CalendarEventIndex:
+    """정렬된 컬럼 배열 + 최근 변경 버퍼로 구성된 이벤트 인덱스
+
+    새 이벤트는 버퍼에 추가하고, 삭제/수정된 이벤트는 기존 배열에서 삭제 표시만 한다.
+    버퍼가 merge_threshold를 넘으면 배열을 다시 정렬하여 합친다.
+    """
+
+    def __init__(self, merge_threshold: int = 1024):
+        self.merge_threshold = merge_threshold
+        self._loaded = False
+        self._version = 0
+        self._records: Dict[int, Record] = {}
+        self._pending: Dict[int, Record] = {}
+        self._positions: Dict[int, int] = {}
+        self._strings: Dict[str, int] = {}
+        self._build([])
+
+    @property
+    def enabled(self) -> bool:
+        return np is not None and settings.CALENDAR_MEMORY_INDEX
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def _intern(self, value: Optional[str]) -> int:
+        """종목 코드 문자열 -> 정수 ID"""
+        if value is None:
+            return NO_STOCK
+        code = self._strings.get(value)
+        if code is None:
+            code = len(self._strings)
+            self._strings[value] = code
+        return code
+
+    def _build(self, records: Iterable[Record]) -> None:
+        """정렬된 컬럼 배열 구성"""
+        ordered = sorted(records, key=_sort_key)
+        size = len(ordered)
+        if np is None:
+            self._order = ordered
+            return
+
+        self._ids = np.fromiter((r["id"] for r in ordered), dtype=np.int64, count=size)
+        self._days = np.fromiter(
+            (r["event_date"].toordinal() for r in ordered), dtype=np.int32, count=size
+        )
+        self._types = np.fromiter(
+            (TYPE_CODES.get(_type_value(r["event_type"]), 255) for r in ordered),
+            dtype=np.uint8, count=size
+        )
+        self._importance = np.fromiter(
+            (IMPORTANCE_CODES.get(r["importance"], 1) for r in ordered),
+            dtype=np.uint8, count=size
+        )
+        self._stocks = np.fromiter(
+            (self._intern(r["stock_code"]) for r in ordered), dtype=np.int32, count=size
+        )
+        self._users = np.fromiter(
+            (PUBLIC_USER if r["user_id"] is None else r["user_id"] for r in ordered),
+            dtype=np.int32, count=size
+        )
+        self._alive = np.ones(size, dtype=bool)
+        self._order = ordered
+        self._positions = {record["id"]: i for i, record in enumerate(ordered)}
+        self._pending = {}
+
+    async def load(self, db: AsyncSession) -> None:
+        """DB 전체 이벤트로 인덱스 구성"""
+        # 조회 중 들어온 변경은 결과에 반영되었는지 알 수 없으므로 다시 조회
+        for _ in range(3):
+            version = self._version
+            rows = (await db.execute(select(*INDEX_COLUMNS))).all()
+            if version == self._version:
+                break
+
+        records = {row.id: dict(row._mapping) for row in rows}
+        self._strings = {}
+        self._build(records.values())
+        self._records = records
+        self._loaded = True
+        logger.info(f"캘린더 이벤트 메모리 인덱스 구성 완료 ({len(records)}개)")
+
+    def reset(self) -> None:
+        """다음 조회 시 다시 구성"""
+        self._loaded = False
+        self._version += 1
+
+    def query(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        user_id: Optional[int] = None,
+        event_types: Optional[Iterable[str]] = None,
+        stock_codes: Optional[Iterable[str]] = None
+    ) -> List[Record]:
+        """기간 + 타입 + 종목 조회 (event_date, id 오름차순)"""
+        type_values = {_type_value(t) for t in event_types} if event_types else None
+        code_values = set(stock_codes) if stock_codes else None
+
+        # 1. 날짜 서수 이진 탐색으로 구간 결정
+        lo = int(np.searchsorted(self._days, start_date.toordinal(), side="left"))
+        hi = int(np.searchsorted(self._days, end_date.toordinal(), side="right"))
+
+        # 2. 구간 내 마스크 연산
+        mask = self._alive[lo:hi].copy()
+        users = self._users[lo:hi]
+        if user_id is None:
+            mask &= users == PUBLIC_USER
+        else:
+            mask &= (users == PUBLIC_USER) | (users == user_id)
+        if type_values is not None:
+            codes = [TYPE_CODES[t] for t in type_values if t in TYPE_CODES]
+            mask &= np.isin(self._types[lo:hi], codes)
+        if code_values is not None:
+            codes = [self._strings[c] for c in code_values if c in self._strings]
+            mask &= np.isin(self._stocks[lo:hi], codes)
+
+        # 3. 날짜 경계의 시각 비교는 레코드로 확인
+        results = [
+            record for record in (self._order[lo + i] for i in np.flatnonzero(mask))
+            if start_date <= record["event_date"] <= end_date
+        ]
+
+        # 4. 배열 재구성 전 추가된 이벤트
+        if self._pending:
+            for record in self._pending.values():
+                if not start_date <= record["event_date"] <= end_date:
+                    continue
+                if record["user_id"] is not None and record["user_id"] != user_id:
+                    continue
+                if type_values is not None and _type_value(record["event_type"]) not in type_values:
+                    continue
+                if code_values is not None and record["stock_code"] not in code_values:
+                    continue
+                results.append(record)
+            results.sort(key=_sort_key)
+
+        return results
+
+    def on_change(self, change: ModelChange) -> None:
+        """이벤트 추가/수정/삭제 반영"""
+        self._version += 1
+        if not self._loaded:
+            return
+
+        if change.old:
+            event_id = change.old["id"]
+            self._records.pop(event_id, None)
+            self._pending.pop(event_id, None)
+            position = self._positions.pop(event_id, None)
+            if position is not None:
+                self._alive[position] = False
+
+        if change.new:
+            record = {field: change.new[field] for field in RECORD_FIELDS}
+            self._records[record["id"]] = record
+            self._pending[record["id"]] = record
+            if len(self._pending) > self.merge_threshold:
+                self._build(self._records.values())
+
+# 전역 캘린더 이벤트 인덱스 인스턴스
+calendar_index = CalendarEventIndex()
+subscribe(models.CalendarEvent, calendar_index.on_change, calendar_index.reset)
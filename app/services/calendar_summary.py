@@ -0,0 +1,127 @@
+"""
+캘린더 일별 집계
+(날짜, 이벤트 타입, 중요도)별 이벤트 수를 메모리에 유지하고 이벤트 변경 시 증분 갱신
+"""
+from typing import Any, Dict, Optional
+from collections import Counter
+from calendar import monthrange
+from datetime import date, datetime
+import logging
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import models
+from app.db.listeners import ModelChange, subscribe
+
+logger = logging.getLogger(__name__)
+
+def _type_value(event_type) -> str:
+    """EventType enum/문자열 -> 문자열 값"""
+    return getattr(event_type, "value", event_type)
+
+def _day_of(event_date) -> date:
+    return event_date.date() if isinstance(event_date, datetime) else event_date
+
+class CalendarSummary:
+    """(날짜, 이벤트 타입, 중요도) -> 이벤트 수 집계
+
+    공개 이벤트는 user_id None, 개인 이벤트는 사용자별로 분리하여 보관한다.
+    """
+
+    def __init__(self):
+        # user_id -> date -> Counter[(event_type, importance)]
+        self._counts: Dict[Optional[int], Dict[date, Counter]] = {}
+        self._loaded = False
+        self._version = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    async def load(self, db: AsyncSession) -> None:
+        """DB에서 전체 집계 재구성"""
+        event = models.CalendarEvent
+        day = func.date(event.event_date)
+        query = (
+            select(event.user_id, day, event.event_type, event.importance, func.count())
+            .group_by(event.user_id, day, event.event_type, event.importance)
+        )
+
+        # 조회 중 들어온 변경은 결과에 반영되었는지 알 수 없으므로 다시 조회
+        for _ in range(3):
+            version = self._version
+            rows = (await db.execute(query)).all()
+            if version == self._version:
+                break
+
+        counts: Dict[Optional[int], Dict[date, Counter]] = {}
+        for user_id, day_value, event_type, importance, count in rows:
+            if isinstance(day_value, str):
+                day_value = date.fromisoformat(day_value)
+            key = (_type_value(event_type), importance or "medium")
+            counts.setdefault(user_id, {}).setdefault(day_value, Counter())[key] += count
+
+        self._counts = counts
+        self._loaded = True
+        logger.info(f"캘린더 일별 집계 로드 완료 ({sum(len(days) for days in counts.values())}일)")
+
+    def reset(self) -> None:
+        """다음 조회 시 DB에서 다시 집계"""
+        self._loaded = False
+        self._version += 1
+
+    def _apply(self, snapshot: Dict[str, Any], delta: int) -> None:
+        days = self._counts.setdefault(snapshot.get("user_id"), {})
+        day = _day_of(snapshot["event_date"])
+        key = (_type_value(snapshot["event_type"]), snapshot.get("importance") or "medium")
+
+        counter = days.setdefault(day, Counter())
+        counter[key] += delta
+        if counter[key] <= 0:
+            del counter[key]
+            if not counter:
+                del days[day]
+
+    def on_change(self, change: ModelChange) -> None:
+        """이벤트 추가/수정/삭제 반영"""
+        self._version += 1
+        if not self._loaded:
+            return
+        if change.old:
+            self._apply(change.old, -1)
+        if change.new:
+            self._apply(change.new, 1)
+
+    def get_month(self, year: int, month: int, user_id: Optional[int] = None) -> Dict[str, Any]:
+        """월간 일별 집계 (로그인한 경우 개인 이벤트 포함)"""
+        partitions = [self._counts.get(None, {})]
+        if user_id is not None:
+            partitions.append(self._counts.get(user_id, {}))
+
+        days = []
+        total = 0
+        for day_num in range(1, monthrange(year, month)[1] + 1):
+            day = date(year, month, day_num)
+            event_types: Counter = Counter()
+            importance: Counter = Counter()
+            for partition in partitions:
+                for (event_type, level), count in partition.get(day, {}).items():
+                    event_types[event_type] += count
+                    importance[level] += count
+
+            day_total = sum(event_types.values())
+            if day_total:
+                total += day_total
+                days.append({
+                    "date": day,
+                    "total": day_total,
+                    "event_types": dict(event_types),
+                    "importance": dict(importance)
+                })
+
+        return {"year": year, "month": month, "total_events": total, "days": days}
+
+# 전역 캘린더 집계 인스턴스
+calendar_summary = CalendarSummary()
+subscribe(models.CalendarEvent, calendar_summary.on_change, calendar_summary.reset)
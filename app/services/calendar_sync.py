@@ -0,0 +1,313 @@
+"""
+캘린더 동기화 작업 관리
+외부 API 일정 동기화를 요청 처리와 분리하여 백그라운드 작업으로 실행하고 진행 상황을 제공
+작업 상태는 calendar_sync_jobs 테이블에 기록하여 여러 워커가 같은 월을 중복 실행하지 않고
+어느 워커에서든 진행 상황을 조회할 수 있음
+"""
+import asyncio
+from typing import Any, Dict, List, Optional, Set, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from enum import Enum
+import logging
+import uuid
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db import models
+from app.db.session import AsyncSessionLocal
+from app.services.kis_api_refactored import kis_api_client_refactored as kis_api_client
+
+logger = logging.getLogger(__name__)
+
+class SyncJobStatus(str, Enum):
+    """동기화 작업 상태"""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+@dataclass
+class SyncJob:
+    """동기화 작업 정보"""
+    id: str
+    year: int
+    month: int
+    status: SyncJobStatus = SyncJobStatus.PENDING
+    total: int = 0  # 처리할 외부 일정 수
+    processed: int = 0
+    created: int = 0  # 새로 저장된 이벤트 수
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @property
+    def progress(self) -> float:
+        if self.status == SyncJobStatus.COMPLETED:
+            return 1.0
+        return round(self.processed / self.total, 4) if self.total else 0.0
+
+    @classmethod
+    def from_row(cls, row: models.CalendarSyncJob) -> "SyncJob":
+        return cls(
+            id=row.id,
+            year=row.year,
+            month=row.month,
+            status=SyncJobStatus(row.status),
+            total=row.total,
+            processed=row.processed,
+            created=row.created,
+            error=row.error,
+            created_at=row.created_at,
+            started_at=row.started_at,
+            finished_at=row.finished_at
+        )
+
+    def values(self) -> Dict[str, Any]:
+        """calendar_sync_jobs 컬럼 값"""
+        return {
+            "year": self.year,
+            "month": self.month,
+            "status": self.status.value,
+            "total": self.total,
+            "processed": self.processed,
+            "created": self.created,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "heartbeat_at": datetime.now(),
+        }
+
+ACTIVE_STATUSES = (SyncJobStatus.PENDING.value, SyncJobStatus.RUNNING.value)
+
+class CalendarSyncManager:
+    """동시 실행 수가 제한된 동기화 작업 실행기
+
+    같은 (연도, 월)에 대한 요청이 진행 중이면(다른 워커의 작업 포함) 새 작업을 만들지 않고
+    기존 작업을 반환한다.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 2,
+        batch_size: int = 200,
+        max_history: int = 200,
+        stale_after: float = 900
+    ):
+        self.max_concurrent = max_concurrent
+        self.batch_size = batch_size
+        self.max_history = max_history
+        self.stale_after = stale_after
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._jobs: "OrderedDict[str, SyncJob]" = OrderedDict()
+        self._active: Dict[Tuple[int, int], SyncJob] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, year: int, month: int) -> Tuple[SyncJob, bool]:
+        """작업 등록 (진행 중인 같은 월 작업이 있으면 병합) -> (작업, 병합 여부)"""
+        active = self._active.get((year, month))
+        if active:
+            return active, True
+
+        job = SyncJob(id=uuid.uuid4().hex, year=year, month=month)
+        existing = await self._claim(job)
+        if existing:
+            return existing, True
+
+        self._jobs[job.id] = job
+        self._active[(year, month)] = job
+        self._prune_history()
+
+        task = asyncio.create_task(self._run(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job, False
+
+    async def _claim(self, job: SyncJob) -> Optional[SyncJob]:
+        """작업 행 추가 (같은 월의 진행 중 작업이 DB에 있으면 그 작업 반환)"""
+        table = models.CalendarSyncJob
+        async with AsyncSessionLocal() as db:
+            for _ in range(2):
+                # 진행 기록이 끊긴 작업(종료된 프로세스의 작업)은 실패 처리
+                await db.execute(
+                    update(table)
+                    .where(
+                        table.year == job.year,
+                        table.month == job.month,
+                        table.status.in_(ACTIVE_STATUSES),
+                        table.heartbeat_at < datetime.now() - timedelta(seconds=self.stale_after)
+                    )
+                    .values(
+                        status=SyncJobStatus.FAILED.value,
+                        error="작업이 중단되었습니다.",
+                        finished_at=datetime.now()
+                    )
+                )
+                db.add(table(id=job.id, **job.values()))
+                try:
+                    await db.commit()
+                    return None
+                except IntegrityError:
+                    await db.rollback()
+
+                row = await db.scalar(select(table).where(
+                    table.year == job.year,
+                    table.month == job.month,
+                    table.status.in_(ACTIVE_STATUSES)
+                ))
+                if row is not None:
+                    return SyncJob.from_row(row)
+                # 조회 전에 기존 작업이 끝났으면 다시 등록
+        raise RuntimeError(f"{job.year}년 {job.month}월 동기화 작업을 등록하지 못했습니다.")
+
+    async def get(self, job_id: str) -> Optional[SyncJob]:
+        """작업 조회 (다른 워커가 실행 중인 작업은 DB에서 조회)"""
+        job = self._jobs.get(job_id)
+        if job:
+            return job
+        async with AsyncSessionLocal() as db:
+            row = await db.get(models.CalendarSyncJob, job_id)
+        return SyncJob.from_row(row) if row else None
+
+    async def shutdown(self):
+        """실행 중인 작업 취소"""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _save(self, job: SyncJob, db: Optional[AsyncSession] = None) -> None:
+        """작업 상태 기록 (db를 주면 호출자의 커밋에 포함)"""
+        stmt = (
+            update(models.CalendarSyncJob)
+            .where(models.CalendarSyncJob.id == job.id)
+            .values(**job.values())
+        )
+        if db is not None:
+            await db.execute(stmt)
+            return
+        async with AsyncSessionLocal() as session:
+            await session.execute(stmt)
+            await session.commit()
+
+    def _prune_history(self):
+        """완료된 오래된 작업 정보 정리"""
+        while len(self._jobs) > self.max_history:
+            job_id, job = next(iter(self._jobs.items()))
+            if job.status in (SyncJobStatus.PENDING, SyncJobStatus.RUNNING):
+                break
+            del self._jobs[job_id]
+
+    async def _run(self, job: SyncJob):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        try:
+            async with self._semaphore:
+                job.status = SyncJobStatus.RUNNING
+                job.started_at = datetime.now()
+                await self._save(job)
+                await self._sync(job)
+                job.status = SyncJobStatus.COMPLETED
+                logger.info(f"{job.year}년 {job.month}월 이벤트 동기화 완료 ({job.created}개 추가)")
+        except asyncio.CancelledError:
+            job.status = SyncJobStatus.FAILED
+            job.error = "작업이 취소되었습니다."
+            raise
+        except Exception as e:
+            job.status = SyncJobStatus.FAILED
+            job.error = str(e)
+            logger.error(f"{job.year}년 {job.month}월 이벤트 동기화 실패: {e}")
+        finally:
+            job.finished_at = datetime.now()
+            self._active.pop((job.year, job.month), None)
+            try:
+                await self._save(job)
+            except Exception as e:
+                logger.error(f"{job.year}년 {job.month}월 동기화 작업 상태 기록 실패: {e}")
+
+    async def _sync(self, job: SyncJob):
+        """휴장일/실적발표 일정 조회 후 새 일정만 배치 저장"""
+        holidays, earnings = await asyncio.gather(
+            kis_api_client.get_holidays(str(job.year)),
+            kis_api_client.get_earnings_calendar(f"{job.year}-{job.month:02d}")
+        )
+
+        candidates: List[models.CalendarEvent] = []
+        for holiday_date in holidays:
+            # 해당 월의 휴장일만 처리
+            date_obj = datetime.strptime(holiday_date, "%Y-%m-%d")
+            if date_obj.month == job.month:
+                candidates.append(models.CalendarEvent(
+                    event_date=date_obj,
+                    event_type=models.EventType.HOLIDAY,
+                    title="증시 휴장일",
+                    description="한국 증시 휴장일입니다.",
+                    importance="high",
+                    source="KRX"
+                ))
+
+        for earning in earnings:
+            candidates.append(models.CalendarEvent(
+                event_date=datetime.strptime(earning['date'], "%Y-%m-%d"),
+                event_type=models.EventType.EARNINGS,
+                title=f"{earning['company_name']} {earning['event_type']}",
+                description=earning.get('description', ''),
+                stock_code=earning.get('stock_code'),
+                stock_name=earning['company_name'],
+                importance="high",
+                source="KIS",
+                meta_data=earning
+            ))
+
+        job.total = len(candidates)
+        if not candidates:
+            return
+        await self._save(job)
+
+        async with AsyncSessionLocal() as db:
+            # 중복 체크용 기존 일정 키를 한 번에 조회
+            event = models.CalendarEvent
+            rows = await db.execute(
+                select(event.event_date, event.event_type, event.stock_code).where(
+                    event.event_date >= min(c.event_date for c in candidates),
+                    event.event_date <= max(c.event_date for c in candidates),
+                    event.event_type.in_([models.EventType.HOLIDAY, models.EventType.EARNINGS])
+                )
+            )
+            existing = {self._event_key(*row) for row in rows}
+
+            for i in range(0, len(candidates), self.batch_size):
+                batch = candidates[i:i + self.batch_size]
+                for candidate in batch:
+                    key = self._event_key(
+                        candidate.event_date, candidate.event_type, candidate.stock_code
+                    )
+                    if key not in existing:
+                        existing.add(key)
+                        db.add(candidate)
+                        job.created += 1
+
+                # 배치 단위 커밋으로 쓰기 잠금 시간을 짧게 유지 (진행 상황도 함께 기록)
+                job.processed += len(batch)
+                await self._save(job, db)
+                await db.commit()
+
+    @staticmethod
+    def _event_key(event_date: datetime, event_type, stock_code: Optional[str]):
+        """중복 판단 키 (휴장일은 날짜, 실적발표는 날짜 + 종목)"""
+        if event_type == models.EventType.HOLIDAY:
+            return (event_date, event_type, None)
+        return (event_date, event_type, stock_code)
+
+# 전역 동기화 작업 관리자 인스턴스
+calendar_sync_manager = CalendarSyncManager(
+    max_concurrent=settings.CALENDAR_SYNC_MAX_CONCURRENT,
+    batch_size=settings.CALENDAR_SYNC_BATCH_SIZE,
+    stale_after=settings.CALENDAR_SYNC_STALE_SECONDS
+)
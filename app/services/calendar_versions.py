@@ -0,0 +1,64 @@
+"""
+캘린더 데이터 버전
+공개 이벤트는 월 단위, 개인 이벤트/북마크는 사용자 단위 파티션으로 버전을 관리
+"""
+from typing import List, Optional
+from datetime import datetime
+
+from app.core.versioning import versions
+from app.db import models
+from app.db.listeners import ModelChange, subscribe
+
+# ORM을 거치지 않은 일괄 변경 시 전체 무효화용 키
+CALENDAR_EPOCH_KEY = "calendar"
+
+def month_key(value: datetime) -> str:
+    return f"calendar:{value.year:04d}-{value.month:02d}"
+
+def user_events_key(user_id: int) -> str:
+    return f"calendar:user:{user_id}"
+
+def bookmarks_key(user_id: int) -> str:
+    return f"bookmarks:{user_id}"
+
+def watchlist_key(user_id: int) -> str:
+    return f"watchlist:{user_id}"
+
+def range_keys(start: datetime, end: datetime, user_id: Optional[int] = None) -> List[str]:
+    """기간 조회 결과에 영향을 주는 버전 키 목록"""
+    keys = [CALENDAR_EPOCH_KEY]
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        keys.append(f"calendar:{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+    if user_id is not None:
+        keys.append(user_events_key(user_id))
+        keys.append(bookmarks_key(user_id))
+    return keys
+
+def _on_event_change(change: ModelChange) -> None:
+    for snapshot in (change.old, change.new):
+        if not snapshot:
+            continue
+        if snapshot.get("user_id") is None:
+            versions.bump(month_key(snapshot["event_date"]))
+        else:
+            versions.bump(user_events_key(snapshot["user_id"]))
+
+def _on_bookmark_change(change: ModelChange) -> None:
+    for snapshot in (change.old, change.new):
+        if snapshot:
+            versions.bump(bookmarks_key(snapshot["user_id"]))
+
+def _on_watchlist_change(change: ModelChange) -> None:
+    for snapshot in (change.old, change.new):
+        if snapshot:
+            versions.bump(watchlist_key(snapshot["user_id"]))
+
+def _on_reset() -> None:
+    versions.bump(CALENDAR_EPOCH_KEY)
+
+subscribe(models.CalendarEvent, _on_event_change, _on_reset)
+subscribe(models.Bookmark, _on_bookmark_change, _on_reset)
+subscribe(models.Watchlist, _on_watchlist_change, _on_reset)
@@ -14,6 +14,10 @@ import json
 from app.services.kis_api_refactored import kis_api_client_refactored
 from app.services.dart_api import dart_api_client
 from app.services.perplexity_api import perplexity_client
+from app.services.price_store import price_store
+from app.services.trading_calendar import trading_calendar
+from app.services.market_snapshot import market_snapshot
+from app.services.base_api import DataMapper
 from app.db.session import SessionLocal
 from app.db import models
 from sqlalchemy.orm import Session
@@ -224,13 +228,34 @@ class DataPipeline:
         try:
             if isinstance(data, dict) and 'stock_code' not in data:
                 # 다중 종목 데이터
-                for stock_code, price_data in data.items():
-                    self._update_stock_price(db, stock_code, price_data)
+                prices = data
             else:
                 # 단일 종목 데이터
                 stock_code = data.get('stock_code', '')
-                if stock_code:
-                    self._update_stock_price(db, stock_code, data)
+                prices = {stock_code: data} if stock_code else {}
+            
+            now = datetime.now()
+            trading_calendar.ensure_loaded(db)
+            # 장외 시간/휴장일 시세는 틱으로 기록하지 않음 (현재가만 갱신)
+            record_ticks = trading_calendar.is_market_open(now)
+            ts = int(now.timestamp())
+            ticks = []
+            for stock_code, price_data in prices.items():
+                if not price_data:
+                    continue
+                self._update_stock_price(db, stock_code, price_data)
+                
+                price = DataMapper.safe_int(price_data.get('current_price'))
+                if record_ticks and price > 0:
+                    ticks.append((
+                        stock_code,
+                        ts,
+                        price,
+                        DataMapper.safe_int(price_data.get('volume'))
+                    ))
+            
+            # 시계열 저장소에 틱 추가
+            price_store.append_ticks(db, ticks)
                     
             db.commit()
             
@@ -362,6 +387,9 @@ async def start_data_pipeline():
     """데이터 파이프라인 시작"""
     await data_pipeline.start()
     
+    # 인기 종목/섹터 시세 스냅샷 주기적 갱신
+    market_snapshot.start()
+    
     # 정기 수집 스케줄링 (예: 5분마다)
     async def periodic_collection():
         while True:
@@ -376,4 +404,5 @@ async def start_data_pipeline():
     
 async def stop_data_pipeline():
     """데이터 파이프라인 중지"""
+    await market_snapshot.stop()
     await data_pipeline.stop() 
\ No newline at end of file
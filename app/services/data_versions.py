@@ -0,0 +1,77 @@
+"""
+DB 데이터 버전 추적
+data_versions 테이블(행 변경마다 DB 트리거가 증가)과 이 프로세스에서 커밋한 ORM 변경 수를 비교하여
+다른 워커/CLI/raw SQL이 바꾼 테이블을 찾고, 해당 모델 구독자에게 재구성(notify_reset)을 요청
+"""
+from typing import Dict, List, Mapping, Optional
+import asyncio
+import logging
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import models
+from app.db.listeners import ModelChange, notify_reset, subscribe
+
+logger = logging.getLogger(__name__)
+
+class DataVersionTracker:
+    """테이블별 DB 버전과 로컬 커밋 수 대조"""
+
+    def __init__(self):
+        self._models: Dict[str, type] = {}
+        # 마지막으로 확인한 DB 버전
+        self._seen: Dict[str, int] = {}
+        # 마지막 확인 이후 이 프로세스에서 커밋된 행 변경 수
+        self._local: Dict[str, int] = {}
+        # 동시 확인 시 같은 로컬 커밋 수를 두 번 차감하지 않도록 직렬화
+        self._lock = asyncio.Lock()
+
+    def track(self, model: type) -> None:
+        table_name = model.__tablename__
+        self._models[table_name] = model
+        self._local[table_name] = 0
+
+        def on_change(change: ModelChange) -> None:
+            self._local[table_name] += 1
+
+        subscribe(model, on_change)
+
+    def pending(self) -> Dict[str, int]:
+        """DB 버전 조회 직전의 로컬 커밋 수 (조회 중 커밋된 변경은 다음 확인으로 넘김)"""
+        return dict(self._local)
+
+    def observe(self, db_versions: Mapping[str, int], pending: Optional[Mapping[str, int]] = None) -> List[type]:
+        """DB 버전이 로컬 커밋만으로 설명되지 않는 모델 목록 (최초 확인 시에는 모두 포함)"""
+        pending = self.pending() if pending is None else pending
+        stale = []
+        for table_name, version in db_versions.items():
+            model = self._models.get(table_name)
+            if model is None:
+                continue
+            local = pending.get(table_name, 0)
+            seen = self._seen.get(table_name)
+            if seen is None or version != seen + local:
+                stale.append(model)
+            self._seen[table_name] = version
+            self._local[table_name] -= local
+        return stale
+
+    async def sync(self, db: AsyncSession) -> None:
+        """외부 변경이 있으면 메모리 캐시/ETag 버전 재구성 요청"""
+        async with self._lock:
+            pending = self.pending()
+            first = not self._seen
+            rows = (await db.execute(
+                select(models.DataVersion.table_name, models.DataVersion.version)
+            )).all()
+            stale = self.observe(dict(rows), pending)
+        for model in stale:
+            if not first:
+                logger.info(f"{model.__tablename__} 외부 변경 감지, 캐시 재구성")
+            notify_reset(model)
+
+# 전역 데이터 버전 추적기 인스턴스
+data_version_tracker = DataVersionTracker()
+for _model in (models.CalendarEvent, models.Bookmark, models.Watchlist):
+    data_version_tracker.track(_model)
@@ -0,0 +1,179 @@
+"""
+기간별 시세 캐시
+(종목, 주기)별로 적재가 끝난 날짜 구간을 기록하고, 요청 기간 중 비어 있는 거래일 구간만 KIS에서 조회
+확정된 과거 일봉은 다시 조회하지 않으며 당일 일봉은 장 마감 후에만 확정으로 기록
+"""
+from typing import Any, Dict, List, Tuple
+from datetime import date, timedelta
+import asyncio
+import logging
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import models
+from app.services.base_api import FanOutResult, fan_out
+from app.services.kis_api_refactored import kis_api_client_refactored as kis_api_client
+from app.services.price_store import date_to_int, int_to_date, price_store
+from app.services.trading_calendar import trading_calendar
+
+logger = logging.getLogger(__name__)
+
+DateRange = Tuple[date, date]
+
+class HistoryCache:
+    """적재 구간 기반 일봉 캐시 (빈 구간만 조회)"""
+
+    def __init__(self, max_bars_per_fetch: int = 100):
+        # KIS 기간별 시세 1회 응답 최대 건수 (이보다 긴 구간은 나눠서 조회)
+        self.max_bars_per_fetch = max_bars_per_fetch
+        self._stats = {"requests": 0, "hits": 0, "fetches": 0, "failed_fetches": 0, "empty_fetches": 0}
+
+    def covered_ranges(self, db: Session, stock_code: str, period: str) -> List[DateRange]:
+        coverage = models.StockHistoryCoverage
+        rows = db.execute(
+            select(coverage.start_date, coverage.end_date)
+            .where(coverage.stock_code == stock_code, coverage.period == period)
+            .order_by(coverage.start_date)
+        ).all()
+        return [(int_to_date(start), int_to_date(end)) for start, end in rows]
+
+    def missing_ranges(
+        self,
+        db: Session,
+        stock_code: str,
+        period: str,
+        start: date,
+        end: date
+    ) -> List[DateRange]:
+        """요청 기간 중 적재되지 않은 거래일 구간 (구간 양 끝은 거래일)"""
+        trading_calendar.ensure_loaded(db)
+        end = min(end, date.today())
+
+        gaps: List[DateRange] = []
+        cursor = start
+        for covered_start, covered_end in self.covered_ranges(db, stock_code, period):
+            if cursor > end:
+                break
+            if covered_end < cursor:
+                continue
+            if covered_start > cursor:
+                gaps.append((cursor, min(covered_start - timedelta(days=1), end)))
+            cursor = max(cursor, covered_end + timedelta(days=1))
+        if cursor <= end:
+            gaps.append((cursor, end))
+
+        # 주말/휴장일만 있는 구간은 제외하고 양 끝을 거래일로 축소
+        missing = []
+        for gap_start, gap_end in gaps:
+            gap_start = trading_calendar.next_trading_day(gap_start)
+            gap_end = trading_calendar.previous_trading_day(gap_end)
+            if gap_start <= gap_end:
+                missing.extend(self._split(gap_start, gap_end))
+        return missing
+
+    def _split(self, start: date, end: date) -> List[DateRange]:
+        """1회 조회 최대 건수 단위로 구간 분할"""
+        chunks = []
+        chunk_start, count, day = start, 0, start
+        while day <= end:
+            if trading_calendar.is_trading_day(day):
+                count += 1
+                if count > self.max_bars_per_fetch:
+                    chunks.append((chunk_start, day - timedelta(days=1)))
+                    chunk_start, count = day, 1
+            day += timedelta(days=1)
+        chunks.append((chunk_start, end))
+        return chunks
+
+    @staticmethod
+    def _has_trading_day(start: date, end: date) -> bool:
+        return trading_calendar.next_trading_day(start) <= end
+
+    def mark_covered(self, db: Session, stock_code: str, period: str, start: date, end: date) -> None:
+        """구간 적재 완료 기록 (확정된 날짜까지만, 인접 구간은 병합)"""
+        # 휴장일 변경으로 달력이 초기화된 경우에도 휴장일을 사이에 둔 구간을 병합하도록 다시 로드
+        trading_calendar.ensure_loaded(db)
+        end = min(end, trading_calendar.last_closed_day())
+        if start > end:
+            return
+
+        ranges = sorted(self.covered_ranges(db, stock_code, period) + [(start, end)])
+        merged: List[DateRange] = [ranges[0]]
+        for range_start, range_end in ranges[1:]:
+            last_start, last_end = merged[-1]
+            # 사이에 거래일이 없으면 이어진 구간으로 처리
+            if trading_calendar.next_trading_day(last_end + timedelta(days=1)) >= range_start:
+                merged[-1] = (last_start, max(last_end, range_end))
+            else:
+                merged.append((range_start, range_end))
+
+        coverage = models.StockHistoryCoverage
+        db.execute(delete(coverage).where(
+            coverage.stock_code == stock_code, coverage.period == period
+        ))
+        db.add_all([
+            coverage(
+                stock_code=stock_code,
+                period=period,
+                start_date=date_to_int(range_start),
+                end_date=date_to_int(range_end)
+            )
+            for range_start, range_end in merged
+        ])
+        db.flush()
+
+    async def get_daily_bars(
+        self,
+        db: Session,
+        stock_code: str,
+        start: date,
+        end: date
+    ) -> List[models.StockDailyPrice]:
+        """일봉 조회 (빈 구간만 KIS에서 받아 저장 후 로컬 저장소에서 응답)
+
+        동기 세션 작업은 이벤트 루프를 막지 않도록 워커 스레드에서 실행한다.
+        """
+        self._stats["requests"] += 1
+        gaps = await asyncio.to_thread(self.missing_ranges, db, stock_code, "D", start, end)
+        if not gaps:
+            self._stats["hits"] += 1
+        else:
+            fetched = await fan_out(
+                gaps,
+                lambda gap: kis_api_client.get_stock_history(
+                    stock_code, gap[0].strftime("%Y-%m-%d"), gap[1].strftime("%Y-%m-%d"), "D"
+                ),
+                max_concurrent=settings.FAN_OUT_MAX_CONCURRENT,
+                timeout=settings.FAN_OUT_ITEM_TIMEOUT
+            )
+            await asyncio.to_thread(self._store, db, stock_code, fetched)
+
+        return await asyncio.to_thread(
+            price_store.get_daily_bars, db, stock_code, date_to_int(start), date_to_int(end)
+        )
+
+    def _store(self, db: Session, stock_code: str, fetched: List[FanOutResult]) -> None:
+        """조회한 구간의 일봉 저장 및 적재 구간 기록"""
+        for result in fetched:
+            self._stats["fetches"] += 1
+            if not result.ok or result.value is None:
+                # 실패한 구간은 기록하지 않아 다음 요청에서 다시 조회
+                # (KIS 클라이언트는 오류 시 예외 대신 None을 반환하기도 함)
+                self._stats["failed_fetches"] += 1
+                continue
+            bars = [price_store.map_kis_daily_bar(item) for item in result.value]
+            if not bars and self._has_trading_day(*result.item):
+                # 거래일이 있는데 빈 응답이면 적재 완료로 기록하지 않음
+                self._stats["empty_fetches"] += 1
+                continue
+            price_store.append_daily_bars(db, stock_code, bars)
+            self.mark_covered(db, stock_code, "D", *result.item)
+        db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self._stats)
+
+# 전역 기간별 시세 캐시 인스턴스
+history_cache = HistoryCache(max_bars_per_fetch=settings.HISTORY_FETCH_MAX_BARS)
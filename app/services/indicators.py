@@ -0,0 +1,354 @@
+"""
+기술적 지표 엔진
+로컬 일봉 종가로 이동평균/RSI/MACD/볼린저 밴드/변동성을 NumPy 배열 연산으로 계산하고
+(종목, 지표, 파라미터)별 결과를 마지막 확정 일봉 기준으로 캐시하여 새 일봉만 이어서 계산
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+import logging
+import math
+import threading
+
+try:
+    import numpy as np
+    from numpy.lib.stride_tricks import sliding_window_view
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+Series = Dict[str, "np.ndarray"]
+
+TRADING_DAYS_PER_YEAR = 252
+
+def _nan(size: int) -> "np.ndarray":
+    return np.full(size, np.nan)
+
+def _sma(values: "np.ndarray", window: int) -> "np.ndarray":
+    """단순 이동평균 (앞쪽 window-1개는 NaN)"""
+    result = _nan(len(values))
+    if len(values) >= window:
+        sums = np.cumsum(np.concatenate(([0.0], values)))
+        result[window - 1:] = (sums[window:] - sums[:-window]) / window
+    return result
+
+def _rolling_std(values: "np.ndarray", window: int, ddof: int = 0) -> "np.ndarray":
+    result = _nan(len(values))
+    if len(values) >= window:
+        result[window - 1:] = sliding_window_view(values, window).std(axis=1, ddof=ddof)
+    return result
+
+def _ema_continue(values: "np.ndarray", alpha: float, previous: float) -> "np.ndarray":
+    """직전 EMA 값에서 이어서 계산 (재귀식이므로 원소 단위 갱신)"""
+    result = np.empty(len(values))
+    for i, value in enumerate(values.tolist()):
+        previous = previous + alpha * (value - previous)
+        result[i] = previous
+    return result
+
+def _ema(values: "np.ndarray", window: int) -> "np.ndarray":
+    """지수 이동평균 (첫 값은 처음 window개의 단순 평균)"""
+    result = _nan(len(values))
+    if len(values) >= window:
+        seed = float(values[:window].mean())
+        result[window - 1] = seed
+        result[window:] = _ema_continue(values[window:], 2 / (window + 1), seed)
+    return result
+
+class Indicator(ABC):
+    """지표 기본 클래스
+
+    compute는 전체 구간을 계산하고, extend는 이전 상태에서 마지막 count개만 이어서 계산한다.
+    상태가 None이면(데이터 부족 등) 엔진이 전체를 다시 계산한다.
+    """
+    name = ""
+
+    @property
+    def key(self) -> Tuple:
+        return (self.name,) + tuple(sorted(vars(self).items()))
+
+    @abstractmethod
+    def compute(self, closes: "np.ndarray") -> Tuple[Series, Any]:
+        """전체 구간 계산 -> (지표별 값, 증분 계산용 상태)"""
+        pass
+
+    def extend(self, closes: "np.ndarray", state: Any, count: int) -> Tuple[Series, Any]:
+        """기본 구현: 창(window) 크기만큼의 꼬리 구간만 다시 계산"""
+        tail = closes[-(count + self.lookback):]
+        series, state = self.compute(tail)
+        return {name: values[-count:] for name, values in series.items()}, state
+
+    @property
+    def lookback(self) -> int:
+        return 0
+
+class SMA(Indicator):
+    name = "sma"
+
+    def __init__(self, window: int = 20):
+        self.window = window
+
+    @property
+    def lookback(self) -> int:
+        return self.window - 1
+
+    def compute(self, closes):
+        return {f"sma_{self.window}": _sma(closes, self.window)}, True
+
+class EMA(Indicator):
+    name = "ema"
+
+    def __init__(self, window: int = 20):
+        self.window = window
+
+    def compute(self, closes):
+        values = _ema(closes, self.window)
+        state = float(values[-1]) if len(values) and not math.isnan(values[-1]) else None
+        return {f"ema_{self.window}": values}, state
+
+    def extend(self, closes, state, count):
+        values = _ema_continue(closes[-count:], 2 / (self.window + 1), state)
+        return {f"ema_{self.window}": values}, float(values[-1])
+
+class RSI(Indicator):
+    """RSI (Wilder 평활)"""
+    name = "rsi"
+
+    def __init__(self, period: int = 14):
+        self.period = period
+
+    def _continue(self, deltas, avg_gain, avg_loss):
+        gains = np.clip(deltas, 0, None).tolist()
+        losses = np.clip(-deltas, 0, None).tolist()
+        period = self.period
+        result = np.empty(len(gains))
+        for i, (gain, loss) in enumerate(zip(gains, losses)):
+            avg_gain = (avg_gain * (period - 1) + gain) / period
+            avg_loss = (avg_loss * (period - 1) + loss) / period
+            result[i] = self._rsi(avg_gain, avg_loss)
+        return result, avg_gain, avg_loss
+
+    @staticmethod
+    def _rsi(avg_gain: float, avg_loss: float) -> float:
+        return 100.0 if avg_loss == 0 else 100 - 100 / (1 + avg_gain / avg_loss)
+
+    def compute(self, closes):
+        name = f"rsi_{self.period}"
+        result = _nan(len(closes))
+        if len(closes) <= self.period:
+            return {name: result}, None
+
+        deltas = np.diff(closes)
+        avg_gain = float(np.clip(deltas[:self.period], 0, None).mean())
+        avg_loss = float(np.clip(-deltas[:self.period], 0, None).mean())
+        result[self.period] = self._rsi(avg_gain, avg_loss)
+        values, avg_gain, avg_loss = self._continue(deltas[self.period:], avg_gain, avg_loss)
+        result[self.period + 1:] = values
+        return {name: result}, (avg_gain, avg_loss)
+
+    def extend(self, closes, state, count):
+        deltas = np.diff(closes[-(count + 1):])
+        values, avg_gain, avg_loss = self._continue(deltas, *state)
+        return {f"rsi_{self.period}": values}, (avg_gain, avg_loss)
+
+class MACD(Indicator):
+    name = "macd"
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = fast
+        self.slow = slow
+        self.signal = signal
+
+    def _names(self):
+        suffix = f"{self.fast}_{self.slow}_{self.signal}"
+        return f"macd_{suffix}", f"macd_signal_{suffix}", f"macd_hist_{suffix}"
+
+    def compute(self, closes):
+        macd_name, signal_name, hist_name = self._names()
+        fast = _ema(closes, self.fast)
+        slow = _ema(closes, self.slow)
+        macd = fast - slow
+        signal = _nan(len(closes))
+        valid = len(closes) - (self.slow - 1)
+        if valid > 0:
+            signal[self.slow - 1:] = _ema(macd[self.slow - 1:], self.signal)
+
+        state = None
+        if len(signal) and not math.isnan(signal[-1]):
+            state = (float(fast[-1]), float(slow[-1]), float(signal[-1]))
+        return {macd_name: macd, signal_name: signal, hist_name: macd - signal}, state
+
+    def extend(self, closes, state, count):
+        fast_prev, slow_prev, signal_prev = state
+        tail = closes[-count:]
+        fast = _ema_continue(tail, 2 / (self.fast + 1), fast_prev)
+        slow = _ema_continue(tail, 2 / (self.slow + 1), slow_prev)
+        macd = fast - slow
+        signal = _ema_continue(macd, 2 / (self.signal + 1), signal_prev)
+        macd_name, signal_name, hist_name = self._names()
+        return (
+            {macd_name: macd, signal_name: signal, hist_name: macd - signal},
+            (float(fast[-1]), float(slow[-1]), float(signal[-1]))
+        )
+
+class Bollinger(Indicator):
+    name = "bollinger"
+
+    def __init__(self, window: int = 20, k: float = 2.0):
+        self.window = window
+        self.k = k
+
+    @property
+    def lookback(self) -> int:
+        return self.window - 1
+
+    def compute(self, closes):
+        middle = _sma(closes, self.window)
+        band = self.k * _rolling_std(closes, self.window)
+        suffix = f"{self.window}_{self.k:g}"
+        return {
+            f"bb_middle_{suffix}": middle,
+            f"bb_upper_{suffix}": middle + band,
+            f"bb_lower_{suffix}": middle - band
+        }, True
+
+class Volatility(Indicator):
+    """연환산 변동성 (일간 로그수익률 표준편차, %)"""
+    name = "volatility"
+
+    def __init__(self, window: int = 20):
+        self.window = window
+
+    @property
+    def lookback(self) -> int:
+        return self.window
+
+    def compute(self, closes):
+        result = _nan(len(closes))
+        if len(closes) > self.window:
+            returns = np.diff(np.log(np.where(closes > 0, closes, np.nan)))
+            result[1:] = _rolling_std(returns, self.window, ddof=1) * math.sqrt(TRADING_DAYS_PER_YEAR) * 100
+        return {f"volatility_{self.window}": result}, True
+
+@dataclass
+class CacheEntry:
+    first_date: int
+    dates: "np.ndarray"
+    series: Series
+    state: Any
+
+    @property
+    def last_date(self) -> int:
+        return int(self.dates[-1])
+
+class IndicatorEngine:
+    """(종목, 지표, 파라미터)별 결과 캐시 + 새 일봉 증분 계산"""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[Tuple, CacheEntry]" = OrderedDict()
+        self._stats = {"hits": 0, "incremental": 0, "full": 0}
+        # 워커 스레드에서 동시에 계산할 때 캐시 갱신 보호
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return np is not None
+
+    def compute(
+        self,
+        stock_code: str,
+        indicator: Indicator,
+        dates: "np.ndarray",
+        closes: "np.ndarray",
+        confirmed: int
+    ) -> Series:
+        """지표 계산 (앞쪽 confirmed개는 확정 일봉으로 캐시, 나머지는 당일 임시 일봉)"""
+        if not len(closes):
+            return {}
+        key = (stock_code,) + indicator.key
+        entry = self._cache.get(key)
+        length = len(entry.dates) if entry else 0
+
+        if (
+            entry is None or length > confirmed
+            or entry.first_date != int(dates[0])
+            or int(dates[length - 1]) != entry.last_date
+        ):
+            entry = self._full(indicator, dates[:confirmed], closes[:confirmed])
+        elif length == confirmed:
+            self._stats["hits"] += 1
+        elif entry.state is None:
+            entry = self._full(indicator, dates[:confirmed], closes[:confirmed])
+        else:
+            # 새로 확정된 일봉만 이어서 계산
+            self._stats["incremental"] += 1
+            added, state = indicator.extend(closes[:confirmed], entry.state, confirmed - length)
+            entry = CacheEntry(
+                first_date=entry.first_date,
+                dates=dates[:confirmed],
+                series={name: np.concatenate((values, added[name])) for name, values in entry.series.items()},
+                state=state
+            )
+
+        self._cache[key] = entry
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+        if confirmed == len(closes):
+            return entry.series
+
+        # 임시 일봉은 캐시에 넣지 않고 응답에만 반영
+        if entry.state is None:
+            series, _ = indicator.compute(closes)
+            return series
+        added, _ = indicator.extend(closes, entry.state, len(closes) - confirmed)
+        return {name: np.concatenate((values, added[name])) for name, values in entry.series.items()}
+
+    def compute_bars(
+        self,
+        stock_code: str,
+        indicators: List[Indicator],
+        bars: List[Any],
+        last_closed_date: int
+    ) -> Tuple[List[int], Series]:
+        """trade_date 오름차순 일봉으로 여러 지표 계산 -> (날짜, 지표별 값)"""
+        size = len(bars)
+        dates = np.fromiter((bar.trade_date for bar in bars), dtype=np.int64, count=size)
+        closes = np.fromiter((bar.close_price for bar in bars), dtype=np.float64, count=size)
+        confirmed = int(np.searchsorted(dates, last_closed_date, side="right"))
+
+        series: Series = {}
+        with self._lock:
+            for indicator in indicators:
+                series.update(self.compute(stock_code, indicator, dates, closes, confirmed))
+        return dates.tolist(), series
+
+    def _full(self, indicator: Indicator, dates, closes) -> CacheEntry:
+        self._stats["full"] += 1
+        if not len(closes):
+            return CacheEntry(first_date=0, dates=dates, series={}, state=None)
+        series, state = indicator.compute(closes)
+        return CacheEntry(first_date=int(dates[0]), dates=dates, series=series, state=state)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "entries": len(self._cache)}
+
+INDICATORS = {
+    "sma": SMA,
+    "ema": EMA,
+    "rsi": RSI,
+    "macd": MACD,
+    "bollinger": Bollinger,
+    "volatility": Volatility,
+}
+
+def to_json_values(values: "np.ndarray", digits: int = 4) -> List[Optional[float]]:
+    """NaN -> None"""
+    return [None if math.isnan(v) else round(v, digits) for v in values.tolist()]
+
+# 전역 기술적 지표 엔진 인스턴스
+indicator_engine = IndicatorEngine()
@@ -0,0 +1,214 @@
+"""
+시장 스냅샷 서비스
+추적 대상 종목(korea_stocks_data 전체 + 인기 종목)의 최신 시세를 백그라운드에서 주기적으로 갱신하여 메모리에 보관
+인기 종목/섹터/급등락 이벤트 조회는 외부 API 호출 없이 스냅샷을 읽는다.
+"""
+import asyncio
+from typing import Dict, List, NamedTuple, Optional
+import logging
+import time
+
+from app.core.config import settings
+from app.services.base_api import fan_out
+from app.services.kis_api_refactored import kis_api_client_refactored as kis_api_client
+
+logger = logging.getLogger(__name__)
+
+# 섹터 성과 조회 대상 섹터
+SECTORS = ["전자", "반도체", "자동차", "화학", "바이오", "금융", "게임", "인터넷"]
+
+# 섹터별 대표 종목 수
+SECTOR_STOCK_COUNT = 5
+
+# korea_stocks_data를 불러올 수 없을 때 사용하는 인기 종목
+DEFAULT_TOP_STOCKS = [
+    {"code": "005930", "name": "삼성전자", "sector": "전자", "market": "KOSPI"},
+    {"code": "000660", "name": "SK하이닉스", "sector": "반도체", "market": "KOSPI"},
+    {"code": "035720", "name": "카카오", "sector": "인터넷", "market": "KOSPI"},
+    {"code": "051910", "name": "LG화학", "sector": "화학", "market": "KOSPI"},
+    {"code": "006400", "name": "삼성SDI", "sector": "배터리", "market": "KOSPI"},
+    {"code": "207940", "name": "삼성바이오로직스", "sector": "바이오", "market": "KOSPI"},
+    {"code": "068270", "name": "셀트리온", "sector": "바이오", "market": "KOSPI"},
+    {"code": "066570", "name": "LG전자", "sector": "전자", "market": "KOSPI"},
+    {"code": "005380", "name": "현대차", "sector": "자동차", "market": "KOSPI"},
+    {"code": "035420", "name": "NAVER", "sector": "인터넷", "market": "KOSPI"},
+    {"code": "373220", "name": "LG에너지솔루션", "sector": "배터리", "market": "KOSPI"},
+    {"code": "012330", "name": "현대모비스", "sector": "자동차부품", "market": "KOSPI"},
+    {"code": "000270", "name": "기아", "sector": "자동차", "market": "KOSPI"},
+    {"code": "105560", "name": "KB금융", "sector": "금융", "market": "KOSPI"},
+    {"code": "055550", "name": "신한지주", "sector": "금융", "market": "KOSPI"},
+    {"code": "196170", "name": "알테오젠", "sector": "바이오", "market": "KOSDAQ"},
+    {"code": "067630", "name": "HLB생명과학", "sector": "바이오", "market": "KOSDAQ"},
+    {"code": "112040", "name": "위메이드", "sector": "게임", "market": "KOSDAQ"},
+    {"code": "263750", "name": "펄어비스", "sector": "게임", "market": "KOSDAQ"},
+    {"code": "122870", "name": "와이지엔터테인먼트", "sector": "엔터", "market": "KOSDAQ"}
+]
+
+def get_top_stocks() -> List[dict]:
+    """인기 종목 (KOSPI 15개 + KOSDAQ 5개)"""
+    try:
+        from korea_stocks_data import KOSPI_STOCKS, KOSDAQ_STOCKS
+        return KOSPI_STOCKS[:15] + KOSDAQ_STOCKS[:5]
+    except ImportError:
+        return DEFAULT_TOP_STOCKS
+
+def get_sector_stocks() -> Dict[str, List[dict]]:
+    """섹터별 대표 종목"""
+    try:
+        from korea_stocks_data import get_stocks_by_sector
+    except ImportError:
+        return {
+            sector: [s for s in DEFAULT_TOP_STOCKS if s["sector"] == sector][:SECTOR_STOCK_COUNT]
+            for sector in SECTORS
+        }
+    return {sector: get_stocks_by_sector(sector)[:SECTOR_STOCK_COUNT] for sector in SECTORS}
+
+def get_universe() -> List[dict]:
+    """추적 대상 종목 (코드 기준 중복 제거)"""
+    try:
+        from korea_stocks_data import get_all_korean_stocks
+        all_stocks = get_all_korean_stocks()
+    except ImportError:
+        all_stocks = DEFAULT_TOP_STOCKS
+
+    stocks: Dict[str, dict] = {}
+    for stock in get_top_stocks() + all_stocks:
+        stocks.setdefault(stock["code"], stock)
+    return list(stocks.values())
+
+class Quote(NamedTuple):
+    """종목 시세 (KIS 응답 값을 그대로 보관)"""
+    current_price: str
+    change_value: str
+    change_rate: str
+    volume: str
+    market_cap: str  # HTS 시가총액 (억원)
+    updated_at: float  # 조회 시각 (epoch 초)
+
+    @classmethod
+    def from_kis(cls, price_data: dict, updated_at: float) -> "Quote":
+        return cls(
+            current_price=price_data.get('stck_prpr', '0'),
+            change_value=price_data.get('prdy_vrss', '0'),
+            change_rate=price_data.get('prdy_ctrt', '0'),
+            volume=price_data.get('acml_vol', '0'),
+            market_cap=price_data.get('hts_avls', '0'),
+            updated_at=updated_at
+        )
+
+    def age(self, now: Optional[float] = None) -> float:
+        return (now or time.time()) - self.updated_at
+
+class MarketSnapshot:
+    """추적 대상 종목의 최신 시세 스냅샷
+
+    갱신은 한 번에 하나만 실행되며(single-flight), 조회 실패한 종목은 이전 시세를 유지한다.
+    """
+
+    def __init__(self, interval: float = 60.0, max_age: float = 300.0, max_concurrent: int = 5):
+        self.interval = interval
+        self.max_age = max_age
+        self.max_concurrent = max_concurrent
+        self._quotes: Dict[str, Quote] = {}
+        self._refreshed_at: Optional[float] = None
+        self._attempted_at: Optional[float] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._loop_task: Optional[asyncio.Task] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._refreshed_at is not None
+
+    @property
+    def refreshed_at(self) -> Optional[float]:
+        """마지막 갱신 시각 (epoch 초)"""
+        return self._refreshed_at
+
+    @property
+    def age(self) -> Optional[float]:
+        """마지막 갱신 후 경과 시간 (초)"""
+        if self._refreshed_at is None:
+            return None
+        return round(time.time() - self._refreshed_at, 1)
+
+    def get(self, stock_code: str) -> Optional[Quote]:
+        return self._quotes.get(stock_code)
+
+    def update(self, quotes: Dict[str, Quote]) -> None:
+        """개별 조회한 시세 반영 (추적 대상이 아닌 종목도 보관하여 재사용)"""
+        if quotes:
+            self._quotes = {**self._quotes, **quotes}
+
+    async def refresh(self) -> int:
+        """스냅샷 갱신 (진행 중인 갱신이 있으면 그 결과를 기다림) -> 갱신된 종목 수"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh())
+        # 요청 취소/기한 초과가 공유 갱신 작업을 취소하지 않도록 보호
+        return await asyncio.shield(self._refresh_task)
+
+    def ensure_fresh(self) -> None:
+        """비어 있거나 오래되었으면 백그라운드 갱신 시작 (요청 경로에서는 기다리지 않음)"""
+        if self.loaded and self.age <= self.max_age:
+            return
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        # 직전 갱신이 실패했으면 갱신 주기가 지난 뒤에 다시 시도
+        if self._attempted_at is not None and time.time() - self._attempted_at < self.interval:
+            return
+        self._refresh_task = asyncio.create_task(self._refresh())
+
+    async def wait_loaded(self, timeout: float) -> bool:
+        """최초 갱신을 기한 내에서만 기다림 -> 시세 적재 여부"""
+        self.ensure_fresh()
+        task = self._refresh_task
+        if not self.loaded and task is not None and not task.done():
+            try:
+                await asyncio.wait_for(asyncio.shield(task), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.loaded
+
+    async def _refresh(self) -> int:
+        self._attempted_at = time.time()
+        codes = [stock["code"] for stock in get_universe()]
+        fetched = await fan_out(codes, kis_api_client.get_stock_price, max_concurrent=self.max_concurrent)
+        now = time.time()
+
+        # 조회 성공한 종목만 교체 (새 dict로 바꿔 조회 중인 요청에 영향 없음)
+        updated = {r.item: Quote.from_kis(r.value, now) for r in fetched if r.value}
+        if not updated:
+            # 전부 실패하면 이전 스냅샷과 갱신 시각을 그대로 유지 (빈/오래된 스냅샷을 최신으로 보지 않음)
+            logger.warning(f"시장 스냅샷 갱신 실패 (0/{len(codes)}개 종목), 이전 스냅샷 유지")
+            return 0
+        self._quotes = {**self._quotes, **updated}
+        self._refreshed_at = time.time()
+        logger.info(f"시장 스냅샷 갱신 완료 ({len(updated)}/{len(codes)}개 종목)")
+        return len(updated)
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"시장 스냅샷 갱신 오류: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """주기적 갱신 시작"""
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """주기적 갱신 중지"""
+        for task in (self._loop_task, self._refresh_task):
+            if task and not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        self._loop_task = None
+
+# 전역 시장 스냅샷 인스턴스
+market_snapshot = MarketSnapshot(
+    interval=settings.MARKET_SNAPSHOT_INTERVAL,
+    max_age=settings.MARKET_SNAPSHOT_MAX_AGE,
+    max_concurrent=settings.MARKET_SNAPSHOT_MAX_CONCURRENT
+)
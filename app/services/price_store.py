@@ -0,0 +1,227 @@
+"""
+주가 시계열 저장소
+일봉(OHLCV)과 장중 체결 틱을 정수 타임스탬프/고정폭 컬럼으로 저장하고 조회
+"""
+from typing import Any, Dict, Iterable, List, Tuple
+from datetime import date, datetime, time
+import logging
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.db import models
+from app.db.session import dialect_insert
+from app.services.base_api import DataMapper
+
+logger = logging.getLogger(__name__)
+
+DailyBar = Dict[str, Any]
+Tick = Tuple[str, int, int, int]  # (stock_code, ts, price, volume)
+
+def date_to_int(value: date) -> int:
+    """date -> YYYYMMDD 정수"""
+    return value.year * 10000 + value.month * 100 + value.day
+
+def int_to_date(value: int) -> date:
+    """YYYYMMDD 정수 -> date"""
+    return date(value // 10000, value // 100 % 100, value % 100)
+
+def format_trade_date(value: int) -> str:
+    """YYYYMMDD 정수 -> YYYY-MM-DD 문자열"""
+    return f"{value // 10000:04d}-{value // 100 % 100:02d}-{value % 100:02d}"
+
+class PriceStore:
+    """일봉/틱 시계열 저장소"""
+
+    def __init__(self, batch_size: int = 500):
+        self.batch_size = batch_size
+
+    @staticmethod
+    def map_kis_daily_bar(item: Dict[str, Any]) -> DailyBar:
+        """KIS 기간별 시세 응답 -> 일봉 레코드"""
+        return {
+            'trade_date': int(item['stck_bsop_date']),
+            'open_price': DataMapper.safe_int(item.get('stck_oprc')),
+            'high_price': DataMapper.safe_int(item.get('stck_hgpr')),
+            'low_price': DataMapper.safe_int(item.get('stck_lwpr')),
+            'close_price': DataMapper.safe_int(item.get('stck_clpr')),
+            'volume': DataMapper.safe_int(item.get('acml_vol')),
+            'change_rate_bp': round(DataMapper.safe_float(item.get('prdy_ctrt')) * 100)
+        }
+
+    def append_daily_bars(
+        self,
+        db: Session,
+        stock_code: str,
+        bars: Iterable[DailyBar],
+        overwrite: bool = True
+    ) -> int:
+        """일봉 일괄 저장 (같은 거래일은 덮어쓰기, overwrite=False이면 기존 일봉 유지)"""
+        rows = [{'stock_code': stock_code, **bar} for bar in bars]
+        if not rows:
+            return 0
+
+        table = models.StockDailyPrice.__table__
+        for i in range(0, len(rows), self.batch_size):
+            batch = rows[i:i + self.batch_size]
+            stmt = dialect_insert(db, table)
+            if stmt is None:
+                for row in batch:
+                    if overwrite or db.get(models.StockDailyPrice, (stock_code, row['trade_date'])) is None:
+                        db.merge(models.StockDailyPrice(**row))
+                continue
+
+            stmt = stmt.values(batch)
+            if not overwrite:
+                db.execute(stmt.on_conflict_do_nothing(index_elements=['stock_code', 'trade_date']))
+                continue
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['stock_code', 'trade_date'],
+                set_={
+                    column: stmt.excluded[column]
+                    for column in (
+                        'open_price', 'high_price', 'low_price',
+                        'close_price', 'volume', 'change_rate_bp'
+                    )
+                }
+            )
+            db.execute(stmt)
+
+        return len(rows)
+
+    def append_ticks(self, db: Session, ticks: Iterable[Tick]) -> int:
+        """체결 틱 일괄 추가 (같은 시각의 중복 틱은 무시)"""
+        rows = [
+            {'stock_code': code, 'ts': ts, 'price': price, 'volume': volume}
+            for code, ts, price, volume in ticks
+        ]
+        if not rows:
+            return 0
+
+        table = models.StockPriceTick.__table__
+        for i in range(0, len(rows), self.batch_size):
+            batch = rows[i:i + self.batch_size]
+            stmt = dialect_insert(db, table)
+            if stmt is None:
+                for row in batch:
+                    db.merge(models.StockPriceTick(**row))
+                continue
+
+            db.execute(stmt.values(batch).on_conflict_do_nothing(
+                index_elements=['stock_code', 'ts']
+            ))
+
+        return len(rows)
+
+    def get_daily_bars(
+        self,
+        db: Session,
+        stock_code: str,
+        start_date: int,
+        end_date: int
+    ) -> List[models.StockDailyPrice]:
+        """일봉 범위 조회 (trade_date 오름차순)"""
+        return db.scalars(
+            select(models.StockDailyPrice)
+            .where(
+                models.StockDailyPrice.stock_code == stock_code,
+                models.StockDailyPrice.trade_date >= start_date,
+                models.StockDailyPrice.trade_date <= end_date
+            )
+            .order_by(models.StockDailyPrice.trade_date)
+        ).all()
+
+    def get_ticks(
+        self,
+        db: Session,
+        stock_code: str,
+        start_ts: int,
+        end_ts: int
+    ) -> List[models.StockPriceTick]:
+        """틱 범위 조회 (ts 오름차순)"""
+        return db.scalars(
+            select(models.StockPriceTick)
+            .where(
+                models.StockPriceTick.stock_code == stock_code,
+                models.StockPriceTick.ts >= start_ts,
+                models.StockPriceTick.ts <= end_ts
+            )
+            .order_by(models.StockPriceTick.ts)
+        ).all()
+
+    def rollup_ticks(self, db: Session, trading_day: date) -> int:
+        """해당 일자 틱을 종목별 일봉으로 집계하여 저장
+
+        틱은 표본이라 시가/고가/저가가 근사값이므로 KIS에서 받은 일봉이 이미 있으면 덮어쓰지 않는다.
+        """
+        start_ts = int(datetime.combine(trading_day, time.min).timestamp())
+        end_ts = int(datetime.combine(trading_day, time.max).timestamp())
+        tick = models.StockPriceTick
+
+        summary = db.execute(
+            select(
+                tick.stock_code,
+                func.min(tick.ts),
+                func.max(tick.ts),
+                func.max(tick.price),
+                func.min(tick.price),
+                func.max(tick.volume)
+            )
+            .where(tick.ts >= start_ts, tick.ts <= end_ts)
+            .group_by(tick.stock_code)
+        ).all()
+
+        trade_date = date_to_int(trading_day)
+        existing = set(db.scalars(
+            select(models.StockDailyPrice.stock_code)
+            .where(models.StockDailyPrice.trade_date == trade_date)
+        ))
+        rolled = 0
+        for stock_code, first_ts, last_ts, high, low, volume in summary:
+            if stock_code in existing:
+                continue
+            open_price = db.scalar(select(tick.price).where(
+                tick.stock_code == stock_code, tick.ts == first_ts
+            ))
+            close_price = db.scalar(select(tick.price).where(
+                tick.stock_code == stock_code, tick.ts == last_ts
+            ))
+
+            # 등락률은 직전 일봉 종가 기준
+            previous_close = db.scalar(
+                select(models.StockDailyPrice.close_price)
+                .where(
+                    models.StockDailyPrice.stock_code == stock_code,
+                    models.StockDailyPrice.trade_date < trade_date
+                )
+                .order_by(models.StockDailyPrice.trade_date.desc())
+                .limit(1)
+            )
+            change_rate_bp = 0
+            if previous_close:
+                change_rate_bp = round((close_price - previous_close) / previous_close * 10000)
+
+            self.append_daily_bars(db, stock_code, [{
+                'trade_date': trade_date,
+                'open_price': open_price,
+                'high_price': high,
+                'low_price': low,
+                'close_price': close_price,
+                'volume': volume,
+                'change_rate_bp': change_rate_bp
+            }], overwrite=False)
+            rolled += 1
+
+        return rolled
+
+    def prune_ticks(self, db: Session, before: datetime) -> int:
+        """보관 기간이 지난 틱 삭제"""
+        result = db.execute(
+            delete(models.StockPriceTick).where(
+                models.StockPriceTick.ts < int(before.timestamp())
+            )
+        )
+        return result.rowcount or 0
+
+# 전역 시계열 저장소 인스턴스
+price_store = PriceStore()
@@ -0,0 +1,183 @@
+"""
+현재가 지연 저장 (write-behind)
+시세 조회 요청에서 stocks 테이블을 바로 갱신하지 않고 종목별 최신 가격만 메모리에 모아
+일정 주기 또는 일정 건수마다 한 번의 일괄 upsert로 저장
+"""
+import asyncio
+from typing import Any, Dict, NamedTuple, Optional
+from datetime import datetime
+import logging
+import time
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db import models
+from app.db.session import SessionLocal, dialect_insert
+
+logger = logging.getLogger(__name__)
+
+class PendingPrice(NamedTuple):
+    stock_name: str
+    current_price: float
+    price_updated_at: datetime
+
+class PriceWriteBehind:
+    """종목별 최신 가격 버퍼 + 주기적 일괄 저장
+
+    같은 종목의 가격이 저장 전에 여러 번 들어오면 마지막 값만 저장된다(병합).
+    """
+
+    def __init__(self, interval_ms: int = 500, max_batch: int = 200):
+        self.interval_ms = interval_ms
+        self.max_batch = max_batch
+        self._pending: Dict[str, PendingPrice] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        # 지표
+        self._recorded = 0
+        self._written = 0
+        self._flushes = 0
+        self._errors = 0
+        self._last_flush_ms = 0.0
+        self._max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    def record(self, stock_code: str, stock_name: str, current_price: float) -> None:
+        """가격 기록 (저장은 백그라운드에서)"""
+        self._pending[stock_code] = PendingPrice(stock_name, current_price, datetime.now())
+        self._recorded += 1
+        self._ensure_started()
+        if len(self._pending) >= self.max_batch:
+            self._wakeup.set()
+
+    def _ensure_started(self) -> None:
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._flush_lock = asyncio.Lock()
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval_ms / 1000)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> int:
+        """버퍼에 모인 가격 일괄 저장 -> 저장한 종목 수"""
+        if not self._pending:
+            return 0
+
+        lock = self._flush_lock or asyncio.Lock()
+        async with lock:
+            batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+
+            # 이미 꺼낸 배치는 취소되어도 저장을 끝내도록 보호 (종료 중 flush 취소 시 유실 방지)
+            write = asyncio.ensure_future(self._write_batch(batch))
+            try:
+                return await asyncio.shield(write)
+            except asyncio.CancelledError:
+                await asyncio.gather(write, return_exceptions=True)
+                raise
+
+    async def _write_batch(self, batch: Dict[str, PendingPrice]) -> int:
+        started = time.perf_counter()
+        try:
+            # 동기 DB 작업은 스레드에서 실행하여 이벤트 루프를 막지 않음
+            await asyncio.to_thread(self._write, batch)
+        except Exception as e:
+            self._errors += 1
+            logger.error(f"현재가 일괄 저장 실패 ({len(batch)}개): {str(e)}")
+            # 실패한 값은 그 사이 들어온 최신 값을 덮어쓰지 않도록 되돌림
+            for stock_code, price in batch.items():
+                self._pending.setdefault(stock_code, price)
+            return 0
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self._flushes += 1
+        self._written += len(batch)
+        self._last_flush_ms = elapsed_ms
+        self._max_flush_ms = max(self._max_flush_ms, elapsed_ms)
+        self._total_flush_ms += elapsed_ms
+        return len(batch)
+
+    @staticmethod
+    def _write(batch: Dict[str, PendingPrice]) -> None:
+        table = models.Stock.__table__
+        db = SessionLocal()
+        try:
+            stmt = dialect_insert(db, table)
+            if stmt is None:
+                # ON CONFLICT 미지원 DB는 조회 후 갱신/추가
+                existing = {
+                    stock.stock_code: stock
+                    for stock in db.scalars(
+                        select(models.Stock).where(models.Stock.stock_code.in_(list(batch)))
+                    )
+                }
+                for stock_code, price in batch.items():
+                    stock = existing.get(stock_code)
+                    if stock:
+                        stock.current_price = price.current_price
+                        stock.price_updated_at = price.price_updated_at
+                    else:
+                        db.add(models.Stock(stock_code=stock_code, **price._asdict()))
+            else:
+                now = datetime.utcnow()
+                stmt = stmt.values([
+                    {
+                        "stock_code": stock_code,
+                        **price._asdict(),
+                        "created_at": now,
+                        "updated_at": now
+                    }
+                    for stock_code, price in batch.items()
+                ])
+                db.execute(stmt.on_conflict_do_update(
+                    index_elements=["stock_code"],
+                    set_={
+                        "current_price": stmt.excluded.current_price,
+                        "price_updated_at": stmt.excluded.price_updated_at,
+                        "updated_at": now
+                    }
+                ))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    async def shutdown(self) -> None:
+        """주기 작업 중지 후 남은 가격 저장"""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        await self.flush()
+
+    def metrics(self) -> Dict[str, Any]:
+        """병합 비율/저장 지연 지표"""
+        return {
+            "pending": len(self._pending),
+            "recorded": self._recorded,
+            "written": self._written,
+            "coalescing_ratio": round(self._recorded / self._written, 2) if self._written else None,
+            "flushes": self._flushes,
+            "errors": self._errors,
+            "last_flush_ms": round(self._last_flush_ms, 2),
+            "avg_flush_ms": round(self._total_flush_ms / self._flushes, 2) if self._flushes else None,
+            "max_flush_ms": round(self._max_flush_ms, 2)
+        }
+
+# 전역 현재가 지연 저장 인스턴스
+price_writer = PriceWriteBehind(
+    interval_ms=settings.PRICE_WRITE_BEHIND_INTERVAL_MS,
+    max_batch=settings.PRICE_WRITE_BEHIND_MAX_BATCH
+)
@@ -0,0 +1,98 @@
+"""
+일봉 -> 주봉/월봉/연봉 변환
+캐시된 일봉을 NumPy 배열로 바꿔 기간 경계별 group-by(reduceat)로 OHLCV를 집계
+"""
+from typing import Any, Dict, List, Sequence
+from datetime import date, timedelta
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from app.db import models
+
+RESAMPLE_PERIODS = ("W", "M", "Y")
+
+def is_enabled() -> bool:
+    return np is not None
+
+def period_start(day: date, period: str) -> date:
+    """해당 날짜가 속한 기간의 첫날 (주: 월요일, 월: 1일, 연: 1월 1일)"""
+    if period == "W":
+        return day - timedelta(days=day.weekday())
+    if period == "M":
+        return day.replace(day=1)
+    if period == "Y":
+        return day.replace(month=1, day=1)
+    return day
+
+def _period_keys(trade_dates: "np.ndarray", period: str) -> "np.ndarray":
+    """YYYYMMDD 배열 -> 기간 키 배열"""
+    years = trade_dates // 10000
+    months = trade_dates // 100 % 100
+    if period == "Y":
+        return years
+    if period == "M":
+        return years * 100 + months
+
+    # 주: 해당 주 월요일의 epoch 일수 (1970-01-01은 목요일)
+    days = (
+        ((years - 1970) * 12 + months - 1).astype("datetime64[M]")
+        + (trade_dates % 100 - 1).astype("timedelta64[D]")
+    ).astype(np.int64)
+    return days - (days + 3) % 7
+
+def resample_daily_bars(bars: Sequence[models.StockDailyPrice], period: str) -> List[Dict[str, Any]]:
+    """trade_date 오름차순 일봉 -> 기간봉 (거래일 기준 첫 날짜로 표시)
+
+    시가는 첫 거래일 시가, 종가는 마지막 거래일 종가, 고가/저가는 기간 최고/최저, 거래량은 합계.
+    등락률은 직전 기간 종가 대비이며, 첫 기간은 첫 일봉의 등락률로 역산한 전일 종가를 기준으로 한다.
+    """
+    size = len(bars)
+    if not size:
+        return []
+
+    trade_dates = np.fromiter((b.trade_date for b in bars), dtype=np.int64, count=size)
+    opens = np.fromiter((b.open_price for b in bars), dtype=np.int64, count=size)
+    highs = np.fromiter((b.high_price for b in bars), dtype=np.int64, count=size)
+    lows = np.fromiter((b.low_price for b in bars), dtype=np.int64, count=size)
+    closes = np.fromiter((b.close_price for b in bars), dtype=np.int64, count=size)
+    volumes = np.fromiter((b.volume for b in bars), dtype=np.int64, count=size)
+
+    # 기간 경계 (키가 바뀌는 위치)
+    keys = _period_keys(trade_dates, period)
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    ends = np.concatenate((starts[1:], [size])) - 1
+
+    period_closes = closes[ends]
+    previous_closes = np.empty(len(starts), dtype=np.float64)
+    previous_closes[1:] = period_closes[:-1]
+    previous_closes[0] = bars[0].close_price / (1 + bars[0].change_rate_bp / 10000)
+    change_rates = np.where(
+        previous_closes > 0,
+        (period_closes - previous_closes) / np.where(previous_closes > 0, previous_closes, 1) * 100,
+        0.0
+    )
+
+    columns = zip(
+        trade_dates[starts].tolist(),
+        opens[starts].tolist(),
+        np.maximum.reduceat(highs, starts).tolist(),
+        np.minimum.reduceat(lows, starts).tolist(),
+        period_closes.tolist(),
+        np.add.reduceat(volumes, starts).tolist(),
+        np.round(change_rates, 2).tolist()
+    )
+    return [
+        {
+            "trade_date": trade_date,
+            "open_price": open_price,
+            "high_price": high_price,
+            "low_price": low_price,
+            "close_price": close_price,
+            "volume": volume,
+            "change_rate": change_rate
+        }
+        for trade_date, open_price, high_price, low_price, close_price, volume, change_rate in columns
+    ]
@@ -0,0 +1,127 @@
+"""
+섹터 성과 분석 엔진
+시장 스냅샷의 시세를 종목별 NumPy 배열(등락률/거래량/시가총액/섹터 ID)로 변환하고
+섹터별 수익률(시가총액 가중/단순 평균), 상승/하락 종목 수, 상위 변동 종목을 한 번에 계산
+"""
+from typing import Any, Dict, List, Optional
+import logging
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from app.services.base_api import DataMapper
+from app.services.market_snapshot import MarketSnapshot, get_universe
+
+logger = logging.getLogger(__name__)
+
+class SectorAnalytics:
+    """스냅샷 갱신 시점마다 한 번만 계산하여 결과를 재사용하는 섹터 분석기"""
+
+    def __init__(self, top_movers: int = 3):
+        self.top_movers = top_movers
+        self._snapshot_version: Optional[float] = None
+        self._result: Optional[Dict[str, Any]] = None
+
+    @property
+    def enabled(self) -> bool:
+        return np is not None
+
+    def compute(self, snapshot: MarketSnapshot) -> Dict[str, Any]:
+        """섹터별 성과 + 전체 상위 변동 종목"""
+        if self._result is None or self._snapshot_version != snapshot.refreshed_at:
+            self._result = self._compute(snapshot)
+            self._snapshot_version = snapshot.refreshed_at
+        return self._result
+
+    def _compute(self, snapshot: MarketSnapshot) -> Dict[str, Any]:
+        # 1. 시세가 있는 종목만 컬럼 배열로 변환
+        stocks, quotes = [], []
+        for stock in get_universe():
+            quote = snapshot.get(stock["code"])
+            if quote:
+                stocks.append(stock)
+                quotes.append(quote)
+
+        sector_names = sorted({stock.get("sector") or "기타" for stock in stocks})
+        sector_index = {name: i for i, name in enumerate(sector_names)}
+        size = len(stocks)
+
+        sector_ids = np.fromiter(
+            (sector_index[stock.get("sector") or "기타"] for stock in stocks),
+            dtype=np.int32, count=size
+        )
+        rates = np.fromiter(
+            (DataMapper.safe_float(q.change_rate) for q in quotes), dtype=np.float64, count=size
+        )
+        volumes = np.fromiter(
+            (DataMapper.safe_float(q.volume) for q in quotes), dtype=np.float64, count=size
+        )
+        caps = np.fromiter(
+            (DataMapper.safe_float(q.market_cap) for q in quotes), dtype=np.float64, count=size
+        )
+
+        # 2. 섹터별 집계 (bincount)
+        length = len(sector_names)
+        counts = np.bincount(sector_ids, minlength=length)
+        equal = np.bincount(sector_ids, weights=rates, minlength=length) / np.maximum(counts, 1)
+
+        # 시가총액 정보가 없는 섹터는 단순 평균 사용
+        cap_sums = np.bincount(sector_ids, weights=caps, minlength=length)
+        cap_weighted = np.bincount(sector_ids, weights=caps * rates, minlength=length)
+        weighted = np.where(cap_sums > 0, cap_weighted / np.where(cap_sums > 0, cap_sums, 1), equal)
+
+        advancers = np.bincount(sector_ids, weights=rates > 0, minlength=length)
+        decliners = np.bincount(sector_ids, weights=rates < 0, minlength=length)
+        total_volumes = np.bincount(sector_ids, weights=volumes, minlength=length)
+
+        # 3. 섹터 내 변동폭 순 정렬 (섹터 ID, |등락률| 내림차순)
+        order = np.lexsort((-np.abs(rates), sector_ids))
+        starts = np.searchsorted(sector_ids[order], np.arange(length), side="left")
+
+        def stock_entry(i: int) -> Dict[str, Any]:
+            stock = stocks[i]
+            return {
+                "code": stock["code"],
+                "name": stock["name"],
+                "market": stock["market"],
+                "current_price": quotes[i].current_price,
+                "change_rate": quotes[i].change_rate
+            }
+
+        sectors = {}
+        for sector_id, name in enumerate(sector_names):
+            members = order[starts[sector_id]:starts[sector_id] + counts[sector_id]]
+            sectors[name] = {
+                "stocks": [stock_entry(i) for i in sorted(members)],
+                "avg_change_rate": round(float(equal[sector_id]), 2),
+                "weighted_change_rate": round(float(weighted[sector_id]), 2),
+                "advancers": int(advancers[sector_id]),
+                "decliners": int(decliners[sector_id]),
+                "unchanged": int(counts[sector_id] - advancers[sector_id] - decliners[sector_id]),
+                "total_volume": int(total_volumes[sector_id]),
+                "top_movers": [stock_entry(i) for i in members[:self.top_movers]],
+                "stock_count": int(counts[sector_id])
+            }
+
+        # 4. 전체 상승/하락 상위 종목
+        ranked = np.argsort(-rates, kind="stable")
+        gainers = [i for i in ranked[:self.top_movers] if rates[i] > 0]
+        losers = [i for i in ranked[::-1][:self.top_movers] if rates[i] < 0]
+
+        return {
+            "sectors": sectors,
+            "market": {
+                "stock_count": size,
+                "advancers": int((rates > 0).sum()),
+                "decliners": int((rates < 0).sum()),
+                "avg_change_rate": round(float(rates.mean()), 2) if size else 0.0,
+                "total_volume": int(volumes.sum())
+            },
+            "top_gainers": [stock_entry(i) for i in gainers],
+            "top_losers": [stock_entry(i) for i in losers]
+        }
+
+# 전역 섹터 분석 엔진 인스턴스
+sector_analytics = SectorAnalytics()
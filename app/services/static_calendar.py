@@ -0,0 +1,133 @@
+"""
+기본 캘린더 이벤트 저장소
+calendar_events.json을 한 번만 파싱하여 날짜/타입별로 색인하고, 파일 변경 시 자동으로 다시 로드
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from bisect import bisect_left, bisect_right
+import json
+import logging
+import os
+import threading
+import time
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+Event = Dict[str, Any]
+
+def find_calendar_events_file() -> Optional[str]:
+    """기본 캘린더 이벤트 파일 경로 (설정 -> 프로젝트 루트 -> 현재 작업 디렉토리 순)"""
+    candidates = [
+        settings.CALENDAR_EVENTS_FILE,
+        os.path.join(PROJECT_ROOT, "calendar_events.json"),
+        "calendar_events.json",
+    ]
+    for path in candidates:
+        if path and os.path.exists(path):
+            return path
+    return None
+
+class StaticCalendarStore:
+    """날짜순 정렬 배열 + 타입별 배열로 색인된 기본 이벤트"""
+
+    def __init__(self, reload_interval: float = 1.0):
+        # 파일 변경 확인 주기 (초)
+        self.reload_interval = reload_interval
+        self.path: Optional[str] = None
+        self._file_version: Tuple[int, int] = (0, 0)  # (mtime_ns, size)
+        self._checked_at = 0.0
+        self._loaded = False
+        self._starts: List[str] = []
+        self._events: List[Event] = []
+        self._by_type: Dict[str, Tuple[List[str], List[Event]]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> Tuple[int, int]:
+        """로드된 파일 버전 (ETag 생성용)"""
+        self._refresh_if_changed()
+        return self._file_version
+
+    def load(self) -> int:
+        """파일 파싱 및 색인 구성"""
+        with self._lock:
+            path = find_calendar_events_file()
+            self.path = path
+            self._checked_at = time.monotonic()
+            self._loaded = True
+            if not path:
+                logger.warning("캘린더 이벤트 파일을 찾을 수 없습니다.")
+                self._set_events([], (0, 0))
+                return 0
+
+            stat = os.stat(path)
+            with open(path, "r", encoding="utf-8") as f:
+                events = json.load(f)
+
+            self._set_events(events, (stat.st_mtime_ns, stat.st_size))
+            logger.info(f"기본 캘린더 이벤트 {len(events)}개 로드 완료 ({path})")
+            return len(events)
+
+    def _set_events(self, events: List[Event], file_version: Tuple[int, int]) -> None:
+        events = sorted(events, key=lambda e: e.get("start", ""))
+
+        grouped: Dict[str, List[Event]] = {}
+        for event in events:
+            event_type = event.get("extendedProps", {}).get("eventType")
+            grouped.setdefault(event_type, []).append(event)
+
+        # 조회 중인 요청이 일관된 상태를 보도록 한 번에 교체
+        self._starts = [e.get("start", "") for e in events]
+        self._events = events
+        self._by_type = {
+            event_type: ([e.get("start", "") for e in items], items)
+            for event_type, items in grouped.items()
+        }
+        self._file_version = file_version
+
+    def _refresh_if_changed(self) -> None:
+        """확인 주기마다 파일 mtime/크기를 비교하여 변경 시 다시 로드"""
+        now = time.monotonic()
+        if self._loaded and now - self._checked_at < self.reload_interval:
+            return
+        self._checked_at = now
+
+        path = find_calendar_events_file()
+        try:
+            stat = os.stat(path) if path else None
+        except OSError:
+            stat = None
+
+        current = (stat.st_mtime_ns, stat.st_size) if stat else (0, 0)
+        if not self._loaded or current != self._file_version or path != self.path:
+            try:
+                self.load()
+            except (OSError, ValueError) as e:
+                # 파일을 쓰는 도중이면 기존 데이터를 유지하고 다음 확인 때 재시도
+                logger.error(f"캘린더 이벤트 파일 로드 실패: {e}")
+
+    def get_events(
+        self,
+        start_date: str,
+        end_date: str,
+        event_types: Optional[List[str]] = None
+    ) -> List[Event]:
+        """기간(YYYY-MM-DD 문자열 비교) 내 이벤트, 날짜순"""
+        self._refresh_if_changed()
+
+        if not event_types:
+            starts, events = self._starts, self._events
+            return events[bisect_left(starts, start_date):bisect_right(starts, end_date)]
+
+        results: List[Event] = []
+        for event_type in event_types:
+            starts, events = self._by_type.get(event_type, ([], []))
+            results.extend(events[bisect_left(starts, start_date):bisect_right(starts, end_date)])
+        results.sort(key=lambda e: e.get("start", ""))
+        return results
+
+# 전역 기본 캘린더 이벤트 저장소 인스턴스
+static_calendar = StaticCalendarStore()
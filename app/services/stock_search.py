@@ -0,0 +1,199 @@
+"""
+종목 검색 인덱스
+korea_stocks_data + stocks 테이블 종목을 메모리에 색인하여 LIKE 전체 스캔 없이 자동완성 검색
+코드 접두어, 종목명 접두어, 2-gram 기반 부분 문자열, 한글 초성(예: "ㅅㅅㅈㅈ") 검색 지원
+"""
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+from bisect import bisect_left, insort
+import logging
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import models
+from app.db.listeners import ModelChange, subscribe
+from app.services.market_snapshot import get_universe
+
+logger = logging.getLogger(__name__)
+
+CHOSUNG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_HANGUL_START, _HANGUL_END = 0xAC00, 0xD7A3
+_CHOSUNG_SPAN = 21 * 28
+_CHOSUNG_SET = set(CHOSUNG)
+
+# 검색 결과 정렬 순서 (작을수록 먼저)
+RANK_EXACT_CODE = 0
+RANK_EXACT_NAME = 1
+RANK_CODE_PREFIX = 2
+RANK_NAME_PREFIX = 3
+RANK_CHOSUNG_PREFIX = 4
+RANK_SUBSTRING = 5
+
+def normalize(text: str) -> str:
+    """소문자 + 공백 제거"""
+    return "".join(text.lower().split())
+
+def to_chosung(text: str) -> str:
+    """한글 음절은 초성으로, 나머지 문자는 그대로"""
+    return "".join(
+        CHOSUNG[(ord(char) - _HANGUL_START) // _CHOSUNG_SPAN]
+        if _HANGUL_START <= ord(char) <= _HANGUL_END else char
+        for char in text
+    )
+
+def _grams(text: str) -> Set[str]:
+    """1-gram + 2-gram"""
+    return set(text) | {text[i:i + 2] for i in range(len(text) - 1)}
+
+class SearchEntry(NamedTuple):
+    stock_code: str
+    stock_name: str
+    market: Optional[str]
+    # 색인용 (정규화된 종목명, 초성 문자열)
+    name_key: str
+    chosung_key: str
+
+class StockSearchIndex:
+    """코드/종목명/초성 정렬 목록(접두어) + n-gram 역색인(부분 문자열)"""
+
+    def __init__(self):
+        self._entries: Dict[str, SearchEntry] = {}
+        # (키, 종목코드) 정렬 목록 (접두어 검색용)
+        self._codes: List[Tuple[str, str]] = []
+        self._names: List[Tuple[str, str]] = []
+        self._chosungs: List[Tuple[str, str]] = []
+        self._grams: Dict[str, Set[str]] = {}
+        self._loaded = False
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def load(self, db: AsyncSession) -> None:
+        """korea_stocks_data + stocks 테이블로 인덱스 구성"""
+        rows = (await db.execute(
+            select(models.Stock.stock_code, models.Stock.stock_name, models.Stock.market_type)
+        )).all()
+
+        self._entries.clear()
+        self._codes.clear()
+        self._names.clear()
+        self._chosungs.clear()
+        self._grams.clear()
+
+        for stock in get_universe():
+            self.add(stock["code"], stock["name"], stock.get("market"))
+        for stock_code, stock_name, market_type in rows:
+            self.add(stock_code, stock_name, market_type)
+
+        self._loaded = True
+        logger.info(f"종목 검색 인덱스 {len(self._entries)}개 종목 구성 완료")
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        if not self._loaded:
+            await self.load(db)
+
+    def reset(self) -> None:
+        self._loaded = False
+
+    def get(self, stock_code: str) -> Optional[SearchEntry]:
+        return self._entries.get(stock_code)
+
+    def add(self, stock_code: str, stock_name: str, market: Optional[str] = None) -> None:
+        """종목 추가/갱신 (이름이 같으면 무시, 시장 정보가 없으면 기존 값 유지)"""
+        if not stock_code or not stock_name:
+            return
+        existing = self._entries.get(stock_code)
+        if existing:
+            if existing.stock_name == stock_name and (market is None or existing.market == market):
+                return
+            market = market or existing.market
+            self.remove(stock_code)
+
+        name_key = normalize(stock_name)
+        entry = SearchEntry(stock_code, stock_name, market, name_key, to_chosung(name_key))
+        self._entries[stock_code] = entry
+        insort(self._codes, (stock_code.lower(), stock_code))
+        insort(self._names, (entry.name_key, stock_code))
+        insort(self._chosungs, (entry.chosung_key, stock_code))
+        for gram in _grams(entry.name_key) | _grams(entry.chosung_key):
+            self._grams.setdefault(gram, set()).add(stock_code)
+
+    def remove(self, stock_code: str) -> None:
+        entry = self._entries.pop(stock_code, None)
+        if entry is None:
+            return
+        self._codes.remove((stock_code.lower(), stock_code))
+        self._names.remove((entry.name_key, stock_code))
+        self._chosungs.remove((entry.chosung_key, stock_code))
+        for gram in _grams(entry.name_key) | _grams(entry.chosung_key):
+            postings = self._grams.get(gram)
+            if postings is not None:
+                postings.discard(stock_code)
+                if not postings:
+                    del self._grams[gram]
+
+    def on_change(self, change: ModelChange) -> None:
+        """stocks 테이블 변경 반영"""
+        if change.new is None:
+            # 기본 종목 목록에 있는 종목은 DB에서 지워져도 검색 대상으로 유지
+            if change.old and not any(s["code"] == change.old["stock_code"] for s in get_universe()):
+                self.remove(change.old["stock_code"])
+            return
+        if change.old and change.old["stock_code"] != change.new["stock_code"]:
+            self.remove(change.old["stock_code"])
+        self.add(change.new["stock_code"], change.new["stock_name"], change.new["market_type"])
+
+    @staticmethod
+    def _prefix(sorted_keys: List[Tuple[str, str]], prefix: str) -> List[str]:
+        """(키, 종목코드) 정렬 목록에서 키가 접두어로 시작하는 종목코드"""
+        codes = []
+        for key, code in sorted_keys[bisect_left(sorted_keys, (prefix,)):]:
+            if not key.startswith(prefix):
+                break
+            codes.append(code)
+        return codes
+
+    def search(self, keyword: str, limit: int = 20) -> List[SearchEntry]:
+        """코드/종목명/초성 검색 (정확히 일치 > 접두어 > 부분 문자열, 같은 순위는 짧은 이름 우선)"""
+        query = normalize(keyword)
+        if not query or limit <= 0:
+            return []
+
+        ranks: Dict[str, int] = {}
+
+        def collect(codes, rank):
+            for code in codes:
+                if code not in ranks:
+                    ranks[code] = rank
+
+        code_matches = self._prefix(self._codes, query)
+        collect((code for code in code_matches if code.lower() == query), RANK_EXACT_CODE)
+        collect(code_matches, RANK_CODE_PREFIX)
+        name_matches = self._prefix(self._names, query)
+        collect((code for code in name_matches if self._entries[code].name_key == query), RANK_EXACT_NAME)
+        collect(name_matches, RANK_NAME_PREFIX)
+        if any(char in _CHOSUNG_SET for char in query):
+            collect(self._prefix(self._chosungs, query), RANK_CHOSUNG_PREFIX)
+
+        # 부분 문자열: 질의어의 n-gram 역색인 교집합 후보만 확인
+        postings = sorted((self._grams.get(gram, set()) for gram in _grams(query)), key=len)
+        if postings and postings[0]:
+            candidates = set.intersection(*postings)
+            for code in candidates - ranks.keys():
+                entry = self._entries[code]
+                if query in entry.name_key or query in entry.chosung_key:
+                    ranks[code] = RANK_SUBSTRING
+
+        ordered = sorted(
+            ranks.items(),
+            key=lambda item: (item[1], len(self._entries[item[0]].stock_name), self._entries[item[0]].stock_name)
+        )
+        return [self._entries[code] for code, _ in ordered[:limit]]
+
+# 전역 종목 검색 인덱스 인스턴스
+stock_search_index = StockSearchIndex()
+subscribe(models.Stock, stock_search_index.on_change, stock_search_index.reset)
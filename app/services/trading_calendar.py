@@ -0,0 +1,98 @@
+"""
+KRX 거래일 달력
+주말, 캘린더 휴장일 이벤트(DB + 기본 이벤트 파일), 연말 휴장일(12/31)을 제외한 거래일 계산
+"""
+from typing import Optional, Set, Tuple
+from datetime import date, datetime, time, timedelta
+import logging
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db import models
+from app.db.listeners import ModelChange, subscribe
+from app.services.static_calendar import static_calendar
+
+logger = logging.getLogger(__name__)
+
+# 정규장 시작 시각
+MARKET_OPEN = time(9, 0)
+# 장 마감 후 당일 일봉이 확정되는 시각
+MARKET_CLOSE = time(15, 40)
+
+class TradingCalendar:
+    """휴장일 집합을 캐시하고 휴장일 이벤트가 바뀌면 다시 구성"""
+
+    def __init__(self):
+        self._holidays: Optional[Set[date]] = None
+        self._static_version: Optional[Tuple[int, int]] = None
+
+    def load(self, db: Session) -> None:
+        """DB 휴장일 이벤트 + 기본 이벤트 파일의 한국 휴장일 로드"""
+        holidays = {
+            event_date.date()
+            for event_date in db.scalars(
+                select(models.CalendarEvent.event_date).where(
+                    models.CalendarEvent.event_type == models.EventType.HOLIDAY,
+                    models.CalendarEvent.user_id.is_(None)
+                )
+            )
+        }
+
+        self._static_version = static_calendar.version
+        for event in static_calendar.get_events("0000-00-00", "9999-99-99", ["holiday"]):
+            if event.get("extendedProps", {}).get("market", "Korea") == "Korea":
+                try:
+                    holidays.add(date.fromisoformat(event["start"][:10]))
+                except (KeyError, ValueError):
+                    continue
+
+        self._holidays = holidays
+        logger.info(f"KRX 휴장일 {len(holidays)}개 로드 완료")
+
+    def reset(self) -> None:
+        self._holidays = None
+
+    def on_change(self, change: ModelChange) -> None:
+        """휴장일 이벤트 변경 시 다시 구성"""
+        for snapshot in (change.old, change.new):
+            if snapshot and snapshot["event_type"] == models.EventType.HOLIDAY:
+                self.reset()
+
+    def ensure_loaded(self, db: Session) -> None:
+        if self._holidays is None or self._static_version != static_calendar.version:
+            self.load(db)
+
+    def is_trading_day(self, day: date) -> bool:
+        if day.weekday() >= 5:
+            return False
+        if day.month == 12 and day.day == 31:
+            return False
+        return day not in (self._holidays or set())
+
+    def is_market_open(self, now: Optional[datetime] = None) -> bool:
+        """거래일 장중 여부 (장 마감 직후 종가 확정 시각까지 포함)"""
+        now = now or datetime.now()
+        return self.is_trading_day(now.date()) and MARKET_OPEN <= now.time() <= MARKET_CLOSE
+
+    def next_trading_day(self, day: date) -> date:
+        """day 이후(포함) 첫 거래일"""
+        while not self.is_trading_day(day):
+            day += timedelta(days=1)
+        return day
+
+    def previous_trading_day(self, day: date) -> date:
+        """day 이전(포함) 마지막 거래일"""
+        while not self.is_trading_day(day):
+            day -= timedelta(days=1)
+        return day
+
+    def last_closed_day(self, now: Optional[datetime] = None) -> date:
+        """일봉이 확정된 마지막 날짜 (장 마감 전이면 어제)"""
+        now = now or datetime.now()
+        today = now.date()
+        return today if now.time() >= MARKET_CLOSE else today - timedelta(days=1)
+
+# 전역 거래일 달력 인스턴스
+trading_calendar = TradingCalendar()
+subscribe(models.CalendarEvent, trading_calendar.on_change, trading_calendar.reset)
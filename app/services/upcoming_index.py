@@ -0,0 +1,210 @@
+"""
+다가오는 이벤트 인덱스
+오늘부터 다음 주 일요일까지의 이벤트를 시간 구간(오늘/내일/이번 주/다음 주)별로 메모리에 유지
+"""
+from typing import Any, Dict, List, Optional, Set
+from datetime import date, datetime, time, timedelta
+import logging
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import models
+from app.db.listeners import ModelChange, subscribe
+
+logger = logging.getLogger(__name__)
+
+BUCKETS = ("today", "tomorrow", "this_week", "next_week")
+
+IMPORTANCE_RANK = {"high": 0, "medium": 1, "low": 2}
+
+UPCOMING_COLUMNS = (
+    models.CalendarEvent.id,
+    models.CalendarEvent.title,
+    models.CalendarEvent.event_date,
+    models.CalendarEvent.event_type,
+    models.CalendarEvent.importance,
+    models.CalendarEvent.stock_code,
+    models.CalendarEvent.stock_name,
+    models.CalendarEvent.user_id,
+)
+
+def bucket_of(day: date, today: date) -> Optional[str]:
+    """날짜 -> 시간 구간 (범위 밖이면 None)"""
+    offset = (day - today).days
+    if offset < 0:
+        return None
+    if offset == 0:
+        return "today"
+    if offset == 1:
+        return "tomorrow"
+
+    week_end = today + timedelta(days=6 - today.weekday())
+    if day <= week_end:
+        return "this_week"
+    if day <= week_end + timedelta(days=7):
+        return "next_week"
+    return None
+
+def _sort_key(event: Dict[str, Any]):
+    return (event["event_date"], IMPORTANCE_RANK.get(event["importance"], 1), event["id"])
+
+class UpcomingIndex:
+    """시간 구간별 이벤트 인덱스 (공개 이벤트 + 사용자별 개인 일정/관심종목 오버레이)"""
+
+    def __init__(self):
+        self._today: Optional[date] = None
+        self._version = 0
+        # event_id -> 이벤트 (공개)
+        self._public: Dict[int, Dict[str, Any]] = {}
+        # user_id -> event_id -> 이벤트 (개인)
+        self._personal: Dict[int, Dict[int, Dict[str, Any]]] = {}
+        # 정렬된 공개 이벤트 구간 (변경 시 다시 계산)
+        self._public_buckets: Optional[Dict[str, List[Dict[str, Any]]]] = None
+        # user_id -> 관심종목 코드
+        self._watchlists: Dict[int, Set[str]] = {}
+
+    @property
+    def loaded(self) -> bool:
+        """오늘 날짜 기준으로 구성되어 있는지"""
+        return self._today == date.today()
+
+    def horizon(self, today: date):
+        """인덱스 대상 기간 (오늘 0시 ~ 다음 주 일요일 끝)"""
+        week_end = today + timedelta(days=6 - today.weekday())
+        return datetime.combine(today, time.min), datetime.combine(week_end + timedelta(days=7), time.max)
+
+    async def load(self, db: AsyncSession) -> None:
+        """DB에서 인덱스 재구성 (자정 갱신 및 최초 조회 시)"""
+        today = date.today()
+        start, end = self.horizon(today)
+        query = (
+            select(*UPCOMING_COLUMNS)
+            .where(
+                models.CalendarEvent.event_date >= start,
+                models.CalendarEvent.event_date <= end
+            )
+        )
+
+        # 조회 중 들어온 변경은 결과에 반영되었는지 알 수 없으므로 다시 조회
+        for _ in range(3):
+            version = self._version
+            rows = (await db.execute(query)).all()
+            if version == self._version:
+                break
+
+        public: Dict[int, Dict[str, Any]] = {}
+        personal: Dict[int, Dict[int, Dict[str, Any]]] = {}
+        for row in rows:
+            event = self._to_event(row._mapping)
+            if row.user_id is None:
+                public[row.id] = event
+            else:
+                personal.setdefault(row.user_id, {})[row.id] = event
+
+        self._public = public
+        self._personal = personal
+        self._public_buckets = None
+        self._today = today
+        logger.info(f"다가오는 이벤트 인덱스 구성 완료 (공개 {len(public)}개, 개인 {sum(len(v) for v in personal.values())}개)")
+
+    def reset(self) -> None:
+        """다음 조회 시 다시 구성"""
+        self._today = None
+        self._version += 1
+
+    async def get_watchlist(self, db: AsyncSession, user_id: int) -> Set[str]:
+        """사용자 관심종목 코드 (변경 시까지 캐시)"""
+        codes = self._watchlists.get(user_id)
+        if codes is None:
+            result = await db.scalars(
+                select(models.Watchlist.stock_code).where(models.Watchlist.user_id == user_id)
+            )
+            codes = set(result.all())
+            self._watchlists[user_id] = codes
+        return codes
+
+    def get_upcoming(
+        self,
+        user_id: Optional[int] = None,
+        watchlist: Optional[Set[str]] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """구간별 이벤트 (개인 일정과 관심종목 이벤트를 각 구간 앞쪽에 배치)"""
+        public_buckets = self._get_public_buckets()
+        personal = self._personal.get(user_id, {}) if user_id is not None else {}
+        if not personal and not watchlist:
+            return public_buckets
+
+        personal_buckets: Dict[str, List[Dict[str, Any]]] = {bucket: [] for bucket in BUCKETS}
+        for event in personal.values():
+            bucket = bucket_of(event["event_date"].date(), self._today)
+            if bucket:
+                personal_buckets[bucket].append(event)
+
+        result = {}
+        for bucket in BUCKETS:
+            events = personal_buckets[bucket]
+            others = []
+            for event in public_buckets[bucket]:
+                if watchlist and event["stock_code"] in watchlist:
+                    events.append(event)
+                else:
+                    others.append(event)
+            events.sort(key=_sort_key)
+            result[bucket] = events + others
+        return result
+
+    def _get_public_buckets(self) -> Dict[str, List[Dict[str, Any]]]:
+        if self._public_buckets is None:
+            buckets: Dict[str, List[Dict[str, Any]]] = {bucket: [] for bucket in BUCKETS}
+            for event in sorted(self._public.values(), key=_sort_key):
+                bucket = bucket_of(event["event_date"].date(), self._today)
+                if bucket:
+                    buckets[bucket].append(event)
+            self._public_buckets = buckets
+        return self._public_buckets
+
+    @staticmethod
+    def _to_event(values) -> Dict[str, Any]:
+        return {
+            "id": values["id"],
+            "title": values["title"],
+            "event_date": values["event_date"],
+            "event_type": getattr(values["event_type"], "value", values["event_type"]),
+            "importance": values["importance"] or "medium",
+            "stock_code": values["stock_code"],
+            "stock_name": values["stock_name"],
+        }
+
+    def _partition(self, user_id: Optional[int]) -> Dict[int, Dict[str, Any]]:
+        if user_id is None:
+            self._public_buckets = None
+            return self._public
+        return self._personal.setdefault(user_id, {})
+
+    def on_event_change(self, change: ModelChange) -> None:
+        """이벤트 추가/수정/삭제 반영"""
+        self._version += 1
+        if not self.loaded:
+            return
+
+        if change.old:
+            self._partition(change.old["user_id"]).pop(change.old["id"], None)
+        if change.new:
+            start, end = self.horizon(self._today)
+            if start <= change.new["event_date"] <= end:
+                self._partition(change.new["user_id"])[change.new["id"]] = self._to_event(change.new)
+
+    def on_watchlist_change(self, change: ModelChange) -> None:
+        """관심종목 변경 시 해당 사용자 캐시 제거"""
+        for snapshot in (change.old, change.new):
+            if snapshot:
+                self._watchlists.pop(snapshot["user_id"], None)
+
+    def reset_watchlists(self) -> None:
+        self._watchlists.clear()
+
+# 전역 다가오는 이벤트 인덱스 인스턴스
+upcoming_index = UpcomingIndex()
+subscribe(models.CalendarEvent, upcoming_index.on_event_change, upcoming_index.reset)
+subscribe(models.Watchlist, upcoming_index.on_watchlist_change, upcoming_index.reset_watchlists)
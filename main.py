@@ -7,18 +7,48 @@ import uvicorn
 
 from app.core.config import settings
 from app.api.v1.api import api_router
-from app.db.session import engine
+from app.db.session import AsyncSessionLocal, engine, async_engine
 from app.db import models
+from app.db.migrations import run_migrations
 from app.core.scheduler import start_scheduler
 from app.services.data_pipeline import start_data_pipeline, stop_data_pipeline
+from app.services.calendar_sync import calendar_sync_manager
+from app.services.static_calendar import static_calendar
+from app.services.calendar_import import import_calendar_events
+from app.services.price_writer import price_writer
+from app.services.history_cache import history_cache
+from app.services.stock_search import stock_search_index
+from app.services.market_snapshot import market_snapshot
+import logging
+
+logger = logging.getLogger(__name__)
 
 # 데이터베이스 테이블 생성
 models.Base.metadata.create_all(bind=engine)
+run_migrations(engine)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # 시작 시 실행
     start_scheduler()
+    static_calendar.load()
+    
+    # 기본 캘린더 이벤트 DB 적재 (환경변수로 제어, 변경된 행만 갱신)
+    if settings.IMPORT_CALENDAR_EVENTS_ON_STARTUP:
+        try:
+            import_calendar_events()
+        except Exception as e:
+            logger.error(f"기본 캘린더 이벤트 적재 실패: {e}")
+    
+    # 종목 검색 인덱스 구성 (실패 시 첫 검색 요청에서 다시 구성)
+    try:
+        async with AsyncSessionLocal() as db:
+            await stock_search_index.load(db)
+    except Exception as e:
+        logger.error(f"종목 검색 인덱스 구성 실패: {e}")
+    
+    # 시장 스냅샷 최초 갱신을 백그라운드로 시작 (첫 요청이 전 종목 조회를 기다리지 않도록)
+    market_snapshot.ensure_fresh()
     
     # 데이터 파이프라인 시작 (환경변수로 제어)
     if settings.ENABLE_DATA_PIPELINE:
@@ -29,6 +59,11 @@ async def lifespan(app: FastAPI):
     # 종료 시 실행
     if settings.ENABLE_DATA_PIPELINE:
         await stop_data_pipeline()
+    
+    await market_snapshot.stop()
+    await calendar_sync_manager.shutdown()
+    await price_writer.shutdown()
+    await async_engine.dispose()
 
 app = FastAPI(
     title="투자캘린더 - InvestCalendar",
@@ -66,7 +101,13 @@ async def root(request: Request):
 # 헬스 체크
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "service": "InvestCalendar"}
+    return {
+        "status": "healthy",
+        "service": "InvestCalendar",
+        "price_writer": price_writer.metrics(),
+        "history_cache": history_cache.stats(),
+        "stock_search_index": len(stock_search_index)
+    }
 
 if __name__ == "__main__":
     uvicorn.run(
@@ -0,0 +1,95 @@
+"""
+캘린더 키셋 커서 페이지네이션 테스트
+같은 event_date의 이벤트가 페이지 경계에 걸려도 누락/중복 없이 (event_date, id) 순으로 조회되는지 확인
+"""
+from datetime import datetime
+
+import pytest
+
+# 캘린더 엔드포인트 모듈이 KIS 클라이언트를 함께 가져옴
+pytest.importorskip("app.services.kis_api_refactored")
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.api.v1.endpoints.calendar import after_cursor, build_event_query, decode_cursor, encode_cursor
+from app.db import models
+
+START = datetime(2025, 3, 1)
+END = datetime(2025, 3, 31, 23, 59, 59)
+USER_ID = 7
+
+# id 순서와 날짜 순서가 다르도록 섞어서 추가 (같은 날짜 여러 건 포함)
+EVENTS = [
+    (datetime(2025, 3, 12), None),
+    (datetime(2025, 3, 10), None),
+    (datetime(2025, 3, 12), USER_ID),
+    (datetime(2025, 3, 10), None),
+    (datetime(2025, 3, 12), None),
+    (datetime(2025, 3, 10, 9, 30), None),
+    (datetime(2025, 3, 10), USER_ID),
+    (datetime(2025, 3, 12), 8),
+]
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    models.Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        for i, (event_date, user_id) in enumerate(EVENTS):
+            session.add(models.CalendarEvent(
+                event_date=event_date,
+                event_type=models.EventType.PERSONAL if user_id else models.EventType.EARNINGS,
+                title=f"event {i}",
+                user_id=user_id
+            ))
+        session.commit()
+        yield session
+    engine.dispose()
+
+def paginate(db, limit, user_id=None):
+    """엔드포인트와 같은 방식으로 limit + 1건 조회 후 다음 커서를 따라가며 모든 페이지 수집"""
+    pages, cursor = [], None
+    while True:
+        query = build_event_query(START, END, user_id=user_id)
+        if cursor:
+            query = after_cursor(query, *decode_cursor(cursor))
+        rows = db.execute(query.limit(limit + 1)).all()
+        cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            cursor = encode_cursor(rows[-1].event_date, rows[-1].id)
+        pages.append([(row.event_date, row.id) for row in rows])
+        if cursor is None:
+            return pages
+
+def expected_keys(db, user_id=None):
+    return sorted(
+        (event.event_date, event.id)
+        for event in db.query(models.CalendarEvent)
+        if event.user_id is None or event.user_id == user_id
+    )
+
+def test_cursor_round_trip():
+    value = datetime(2025, 3, 10, 9, 30, 15, 123456)
+    assert decode_cursor(encode_cursor(value, 42)) == (value, 42)
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor(datetime(2025, 3, 1), 1)[:-3]])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 400
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 4, 100])
+def test_pages_follow_date_then_id_across_ties(db, limit):
+    pages = paginate(db, limit)
+    keys = [key for page in pages for key in page]
+
+    assert keys == expected_keys(db)
+    assert all(len(page) == limit for page in pages[:-1])
+
+@pytest.mark.parametrize("limit", [1, 2, 3])
+def test_logged_in_pages_include_own_events_only(db, limit):
+    keys = [key for page in paginate(db, limit, USER_ID) for key in page]
+    assert keys == expected_keys(db, USER_ID)
@@ -0,0 +1,99 @@
+"""
+DB 데이터 버전 추적 테스트
+트리거가 다른 커넥션의 raw SQL 변경까지 data_versions에 반영하고,
+추적기가 로컬 ORM 커밋과 외부 변경을 구분하는지 확인
+"""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import Session
+
+from app.db import models
+from app.db.migrations import run_migrations
+from app.services.data_versions import DataVersionTracker
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'versions.db'}")
+    models.Base.metadata.create_all(engine)
+    run_migrations(engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def tracker():
+    tracker = DataVersionTracker()
+    for model in (models.CalendarEvent, models.Bookmark, models.Watchlist):
+        tracker.track(model)
+    return tracker
+
+def db_versions(engine) -> dict:
+    with engine.connect() as conn:
+        return dict(conn.execute(
+            select(models.DataVersion.table_name, models.DataVersion.version)
+        ).all())
+
+def add_event(engine, title: str = "실적 발표") -> int:
+    with Session(engine) as db:
+        event = models.CalendarEvent(
+            event_date=datetime(2025, 1, 15),
+            event_type=models.EventType.EARNINGS,
+            title=title
+        )
+        db.add(event)
+        db.commit()
+        return event.id
+
+def test_triggers_count_row_changes(engine):
+    event_id = add_event(engine)
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE calendar_events SET title = 'x' WHERE id = :id"), {"id": event_id})
+        conn.execute(text("DELETE FROM calendar_events WHERE id = :id"), {"id": event_id})
+
+    assert db_versions(engine) == {"calendar_events": 3, "bookmarks": 0, "watchlist": 0}
+
+def test_first_observation_resets_everything(engine, tracker):
+    stale = tracker.observe(db_versions(engine))
+    assert set(stale) == {models.CalendarEvent, models.Bookmark, models.Watchlist}
+
+def test_local_orm_commits_are_not_stale(engine, tracker):
+    tracker.observe(db_versions(engine))
+    add_event(engine)
+    add_event(engine)
+
+    assert tracker.observe(db_versions(engine)) == []
+
+def test_raw_sql_from_other_connection_is_detected(engine, tracker):
+    event_id = add_event(engine)
+    tracker.observe(db_versions(engine))
+
+    # 다른 프로세스(CLI, 다른 워커)의 변경
+    other = create_engine(engine.url)
+    with other.begin() as conn:
+        conn.execute(text("UPDATE calendar_events SET title = '변경' WHERE id = :id"), {"id": event_id})
+    assert tracker.observe(db_versions(engine)) == [models.CalendarEvent]
+    assert tracker.observe(db_versions(engine)) == []
+
+    with other.begin() as conn:
+        conn.execute(text("DELETE FROM calendar_events WHERE id = :id"), {"id": event_id})
+    other.dispose()
+    assert tracker.observe(db_versions(engine)) == [models.CalendarEvent]
+
+def test_external_change_mixed_with_local_commits_is_detected(engine, tracker):
+    tracker.observe(db_versions(engine))
+    add_event(engine)
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE calendar_events SET title = '변경'"))
+
+    assert tracker.observe(db_versions(engine)) == [models.CalendarEvent]
+
+def test_commit_during_probe_is_left_for_next_observation(engine, tracker):
+    tracker.observe(db_versions(engine))
+    pending = tracker.pending()
+    versions = db_versions(engine)
+    # DB 조회 이후 커밋된 로컬 변경
+    add_event(engine)
+
+    assert tracker.observe(versions, pending) == []
+    assert tracker.observe(db_versions(engine)) == []
@@ -0,0 +1,114 @@
+"""
+기간별 시세 캐시 적재 구간 테스트
+주말/휴장일을 사이에 둔 구간 병합, 빈 거래일 구간 계산, 당일(장 마감 전/후) 처리 확인
+"""
+from datetime import date, datetime
+
+import pytest
+
+# history_cache 모듈이 KIS 클라이언트를 가져옴
+pytest.importorskip("app.services.kis_api_refactored")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db import models
+from app.services import history_cache as history_cache_module
+from app.services.history_cache import HistoryCache
+from app.services.trading_calendar import trading_calendar
+
+STOCK_CODE = "005930"
+
+# 2024-05-06(월) 대체공휴일 -> 05-04(토) ~ 05-06(월) 휴장
+HOLIDAY = date(2024, 5, 6)
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    models.Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(models.CalendarEvent(
+            event_date=datetime(HOLIDAY.year, HOLIDAY.month, HOLIDAY.day),
+            event_type=models.EventType.HOLIDAY,
+            title="대체공휴일"
+        ))
+        session.commit()
+        trading_calendar.reset()
+        yield session
+    trading_calendar.reset()
+    engine.dispose()
+
+@pytest.fixture
+def today(monkeypatch):
+    """오늘 날짜와 일봉이 확정된 마지막 날짜 고정"""
+    def set_today(value: date, closed: date):
+        class FixedDate(date):
+            @classmethod
+            def today(cls):
+                return value
+        monkeypatch.setattr(history_cache_module, "date", FixedDate)
+        monkeypatch.setattr(trading_calendar, "last_closed_day", lambda now=None: closed)
+    set_today(date(2024, 6, 28), date(2024, 6, 28))
+    return set_today
+
+@pytest.fixture
+def cache():
+    return HistoryCache(max_bars_per_fetch=100)
+
+def test_uncovered_range_is_trimmed_to_trading_days(db, cache, today):
+    assert cache.missing_ranges(db, STOCK_CODE, "D", date(2024, 5, 4), date(2024, 5, 6)) == []
+    assert cache.missing_ranges(db, STOCK_CODE, "D", date(2024, 5, 4), date(2024, 5, 10)) == [
+        (date(2024, 5, 7), date(2024, 5, 10))
+    ]
+
+def test_ranges_separated_only_by_holidays_are_merged(db, cache, today):
+    cache.mark_covered(db, STOCK_CODE, "D", date(2024, 5, 1), date(2024, 5, 3))
+    cache.mark_covered(db, STOCK_CODE, "D", date(2024, 5, 7), date(2024, 5, 10))
+
+    assert cache.covered_ranges(db, STOCK_CODE, "D") == [(date(2024, 5, 1), date(2024, 5, 10))]
+    assert cache.missing_ranges(db, STOCK_CODE, "D", date(2024, 5, 1), date(2024, 5, 10)) == []
+
+def test_gap_between_covered_ranges_is_missing(db, cache, today):
+    cache.mark_covered(db, STOCK_CODE, "D", date(2024, 5, 1), date(2024, 5, 3))
+    cache.mark_covered(db, STOCK_CODE, "D", date(2024, 5, 9), date(2024, 5, 10))
+
+    assert len(cache.covered_ranges(db, STOCK_CODE, "D")) == 2
+    assert cache.missing_ranges(db, STOCK_CODE, "D", date(2024, 4, 29), date(2024, 5, 12)) == [
+        (date(2024, 4, 29), date(2024, 4, 30)),
+        (date(2024, 5, 7), date(2024, 5, 8)),
+    ]
+
+def test_periods_are_tracked_separately(db, cache, today):
+    cache.mark_covered(db, STOCK_CODE, "D", date(2024, 5, 1), date(2024, 5, 3))
+    assert cache.covered_ranges(db, STOCK_CODE, "W") == []
+    assert cache.covered_ranges(db, "000660", "D") == []
+
+def test_today_is_not_covered_before_close(db, cache, today):
+    today(date(2024, 5, 8), closed=date(2024, 5, 7))
+    cache.mark_covered(db, STOCK_CODE, "D", date(2024, 5, 1), date(2024, 5, 8))
+
+    assert cache.covered_ranges(db, STOCK_CODE, "D") == [(date(2024, 5, 1), date(2024, 5, 7))]
+    # 미래 날짜는 조회 대상이 아니고 당일만 다시 조회
+    assert cache.missing_ranges(db, STOCK_CODE, "D", date(2024, 5, 1), date(2024, 5, 31)) == [
+        (date(2024, 5, 8), date(2024, 5, 8))
+    ]
+
+def test_today_is_covered_after_close(db, cache, today):
+    today(date(2024, 5, 8), closed=date(2024, 5, 8))
+    cache.mark_covered(db, STOCK_CODE, "D", date(2024, 5, 1), date(2024, 5, 8))
+
+    assert cache.missing_ranges(db, STOCK_CODE, "D", date(2024, 5, 1), date(2024, 5, 31)) == []
+
+def test_range_ending_before_first_closed_day_is_ignored(db, cache, today):
+    today(date(2024, 5, 8), closed=date(2024, 5, 7))
+    cache.mark_covered(db, STOCK_CODE, "D", date(2024, 5, 8), date(2024, 5, 8))
+    assert cache.covered_ranges(db, STOCK_CODE, "D") == []
+
+def test_long_gap_is_split_by_trading_day_count(db, today):
+    cache = HistoryCache(max_bars_per_fetch=2)
+    assert cache.missing_ranges(db, STOCK_CODE, "D", date(2024, 5, 1), date(2024, 5, 10)) == [
+        (date(2024, 5, 1), date(2024, 5, 2)),
+        (date(2024, 5, 3), date(2024, 5, 7)),
+        (date(2024, 5, 8), date(2024, 5, 9)),
+        (date(2024, 5, 10), date(2024, 5, 10)),
+    ]
@@ -0,0 +1,105 @@
+"""
+기술적 지표 증분 계산 테스트
+캐시된 결과에 새 일봉만 이어서 계산한 값이 전체 재계산 값과 같은지 확인
+"""
+from collections import namedtuple
+from datetime import date, timedelta
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.services.indicators import INDICATORS, IndicatorEngine, to_json_values
+
+Bar = namedtuple("Bar", "trade_date close_price")
+
+PARAMS = [
+    ("sma", {"window": 20}),
+    ("sma", {"window": 5}),
+    ("ema", {"window": 20}),
+    ("rsi", {"period": 14}),
+    ("macd", {"fast": 12, "slow": 26, "signal": 9}),
+    ("bollinger", {"window": 20, "k": 2.0}),
+    ("volatility", {"window": 20}),
+]
+
+def make_bars(count: int, seed: int = 7):
+    """평일 기준 일봉 (종가는 랜덤 워크)"""
+    rng = np.random.default_rng(seed)
+    closes = np.round(10000 * np.exp(np.cumsum(rng.normal(0, 0.02, count))))
+    bars, day = [], date(2023, 1, 2)
+    while len(bars) < count:
+        if day.weekday() < 5:
+            bars.append(Bar(int(day.strftime("%Y%m%d")), float(closes[len(bars)])))
+        day += timedelta(days=1)
+    return bars
+
+def full(name, params, bars, last_closed):
+    """새 엔진(캐시 없음)으로 전체 계산"""
+    return IndicatorEngine().compute_bars("TEST", [INDICATORS[name](**params)], bars, last_closed)
+
+def assert_series_equal(actual, expected):
+    assert actual.keys() == expected.keys()
+    for key in expected:
+        np.testing.assert_allclose(actual[key], expected[key], rtol=1e-9, atol=1e-9, equal_nan=True)
+
+@pytest.mark.parametrize("name,params", PARAMS)
+def test_incremental_matches_full_recompute(name, params):
+    bars = make_bars(300)
+    engine = IndicatorEngine()
+    indicator = INDICATORS[name](**params)
+
+    # 일부 구간으로 캐시를 만든 뒤 1건, 여러 건씩 새 일봉 추가
+    for size in (120, 121, 135, 200, 300):
+        window = bars[:size]
+        dates, series = engine.compute_bars("TEST", [indicator], window, window[-1].trade_date)
+        expected_dates, expected = full(name, params, window, window[-1].trade_date)
+        assert dates == expected_dates
+        assert_series_equal(series, expected)
+
+    stats = engine.stats()
+    assert stats["full"] == 1
+    assert stats["incremental"] == 4
+
+@pytest.mark.parametrize("name,params", PARAMS)
+def test_provisional_bar_matches_full_recompute(name, params):
+    """장중 임시 일봉은 캐시에 넣지 않고 응답에만 반영"""
+    bars = make_bars(150)
+    engine = IndicatorEngine()
+    indicator = INDICATORS[name](**params)
+    last_closed = bars[-2].trade_date
+
+    engine.compute_bars("TEST", [indicator], bars[:-1], last_closed)
+    _, series = engine.compute_bars("TEST", [indicator], bars, last_closed)
+    _, expected = full(name, params, bars, bars[-1].trade_date)
+    assert_series_equal(series, expected)
+
+    # 임시 일봉 값이 바뀌어도 확정 구간 캐시는 그대로
+    changed = bars[:-1] + [Bar(bars[-1].trade_date, bars[-1].close_price * 1.05)]
+    _, series = engine.compute_bars("TEST", [indicator], changed, last_closed)
+    _, expected = full(name, params, changed, changed[-1].trade_date)
+    assert_series_equal(series, expected)
+    assert engine.stats()["full"] == 1
+
+def test_history_rewrite_triggers_full_recompute():
+    """확정 구간의 첫 날짜가 달라지면 캐시를 버리고 다시 계산"""
+    bars = make_bars(200)
+    engine = IndicatorEngine()
+    indicator = INDICATORS["ema"](window=20)
+
+    engine.compute_bars("TEST", [indicator], bars[10:], bars[-1].trade_date)
+    _, series = engine.compute_bars("TEST", [indicator], bars, bars[-1].trade_date)
+    _, expected = full("ema", {"window": 20}, bars, bars[-1].trade_date)
+
+    assert_series_equal(series, expected)
+    assert engine.stats()["full"] == 2
+
+def test_cache_is_bounded():
+    engine = IndicatorEngine(max_entries=2)
+    bars = make_bars(60)
+    for window in (5, 10, 20):
+        engine.compute_bars("TEST", [INDICATORS["sma"](window=window)], bars, bars[-1].trade_date)
+    assert engine.stats()["entries"] == 2
+
+def test_json_values_replace_nan_with_none():
+    assert to_json_values(np.array([np.nan, 1.23456, 2.0])) == [None, 1.2346, 2.0]
@@ -0,0 +1,112 @@
+"""
+캘린더/북마크/관심종목 조회 쿼리 실행 계획 테스트
+SQLite에 스키마를 만들고 EXPLAIN QUERY PLAN으로 접근 경로 인덱스(ix_/ux_)를 사용하는지 확인
+"""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import and_, create_engine, inspect, select, text
+
+from app.db import models
+from app.db.migrations import run_migrations
+
+Event = models.CalendarEvent
+Bookmark = models.Bookmark
+Watchlist = models.Watchlist
+
+START = datetime(2025, 1, 1)
+END = datetime(2025, 1, 31, 23, 59, 59)
+USER_ID = 7
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    models.Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+def query_plan(engine, query) -> str:
+    """EXPLAIN QUERY PLAN 결과 (값은 계획에 영향이 없으므로 NULL로 바인딩)"""
+    compiled = query.compile(dialect=engine.dialect, compile_kwargs={"render_postcompile": True})
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {compiled}", tuple([None] * len(compiled.positiontup))
+        ).all()
+    return "\n".join(row[3] for row in rows)
+
+def in_range(query):
+    return query.where(Event.event_date >= START, Event.event_date <= END)
+
+def test_public_range_uses_public_date_index(engine):
+    query = in_range(select(Event.id, Event.title)).where(Event.user_id == None)
+    plan = query_plan(engine, query.order_by(Event.event_date, Event.id))
+    assert "USING INDEX ix_calendar_events_public_date" in plan
+
+def test_public_range_with_type_uses_public_type_date_index(engine):
+    query = in_range(select(Event.id, Event.title)).where(
+        Event.event_type.in_([models.EventType.EARNINGS, models.EventType.DIVIDEND]),
+        Event.user_id == None
+    )
+    plan = query_plan(engine, query.order_by(Event.event_date, Event.id))
+    assert "USING INDEX ix_calendar_events_public_type_date" in plan
+
+def test_stock_filter_uses_stock_date_index(engine):
+    query = in_range(select(Event.id, Event.title)).where(
+        Event.stock_code.in_(["005930", "000660"]),
+        Event.user_id == None
+    )
+    plan = query_plan(engine, query)
+    assert "USING INDEX ix_calendar_events_stock_date" in plan
+
+def test_personal_events_use_user_date_index(engine):
+    query = in_range(select(Event.id, Event.title)).where(Event.user_id == USER_ID)
+    plan = query_plan(engine, query.order_by(Event.event_date))
+    assert "ix_calendar_events_user_date" in plan
+
+def test_logged_in_range_joins_bookmarks_by_index(engine):
+    """공개 + 개인 이벤트 조회와 사용자 북마크 LEFT JOIN"""
+    query = in_range(
+        select(Event.id, Event.title, Bookmark.id.isnot(None).label("is_bookmarked"))
+        .outerjoin(Bookmark, and_(Bookmark.event_id == Event.id, Bookmark.user_id == USER_ID))
+    ).where((Event.user_id == None) | (Event.user_id == USER_ID))
+    plan = query_plan(engine, query.order_by(Event.event_date, Event.id))
+    assert "SCAN calendar_events" not in plan
+    assert "ux_bookmarks_user_event (user_id=? AND event_id=?)" in plan
+
+def test_bookmark_lookups_use_user_event_index(engine):
+    by_user = query_plan(engine, select(Bookmark.event_id).where(Bookmark.user_id == USER_ID))
+    existing = query_plan(engine, select(Bookmark).where(
+        Bookmark.user_id == USER_ID, Bookmark.event_id == 1
+    ))
+    assert "ux_bookmarks_user_event (user_id=?)" in by_user
+    assert "ux_bookmarks_user_event (user_id=? AND event_id=?)" in existing
+
+def test_watchlist_lookup_uses_user_stock_index(engine):
+    plan = query_plan(engine, select(Watchlist).where(Watchlist.user_id == USER_ID))
+    assert "USING INDEX ix_watchlist_user_stock" in plan
+
+def test_migrations_add_missing_indexes(engine):
+    """인덱스 없이 만들어진 기존 테이블에 마이그레이션이 인덱스를 추가"""
+    expected = {
+        "ix_calendar_events_public_type_date",
+        "ix_calendar_events_public_date",
+        "ix_calendar_events_user_date",
+        "ix_calendar_events_stock_date",
+        "ux_bookmarks_user_event",
+        "ix_bookmarks_event_id",
+        "ix_watchlist_user_stock",
+        "ix_watchlist_stock_code",
+    }
+    with engine.begin() as conn:
+        for name in expected:
+            conn.execute(text(f"DROP INDEX {name}"))
+
+    run_migrations(engine)
+
+    inspector = inspect(engine)
+    created = {
+        index["name"]
+        for table in ("calendar_events", "bookmarks", "watchlist")
+        for index in inspector.get_indexes(table)
+    }
+    assert expected <= created